@@ -7,6 +7,7 @@ import os, json
 
 best_result_dir = "./data/output/topt/"
 best_gf_mult_results = os.path.join(best_result_dir, "gf_mult_results.json")
+cache = qcs.CircuitCache()
 
 
 if __name__ == "__main__":
@@ -21,7 +22,7 @@ if __name__ == "__main__":
     datas = []
     for n in range(2, 10):
 
-        circuit: QuantumCircuit = qcs.QuantumCircuit.from_file(f"./data/input/qc/gf_mult{n}.qc")
+        circuit: QuantumCircuit = cache.load(f"./data/input/qc/gf_mult{n}.qc")
         
         circuit_baseline = circuit.fast_todd_optimize()
         data = {
@@ -31,9 +32,14 @@ if __name__ == "__main__":
             "num_t_baseline": circuit_baseline.num_t,
         }
         
-        circuit: QuantumCircuit = qcs.QuantumCircuit.from_file(f"./data/input/qc/gf_mult{n}.qc")
+        circuit: QuantumCircuit = cache.load(f"./data/input/qc/gf_mult{n}.qc")
         circuit_ours = qcs.iterative_toffoli_gadgetization(circuit)
-        circuit_ours = circuit_ours.fast_todd_optimize()
+        # seeded in-process restarts only replace the external pipeline when they do better
+        circuit_ours = min(
+            circuit_ours.fast_todd_optimize(),
+            circuit_ours.multi_start_optimize(n_starts=8, time_budget=600),
+            key=lambda c: c.num_t,
+        )
         circuit_ours = circuit_ours.optimize_cnot_regions()
         data.update({
             "num_qubits_ours": circuit_ours.n_qubits,
@@ -59,7 +65,8 @@ if __name__ == "__main__":
             }
             
             # Save the best circuit
-            open(os.path.join(best_result_dir, f"gf_mult{n}_ours.qc"), "w").write(circuit_ours.to_qc())
+            with open(os.path.join(best_result_dir, f"gf_mult{n}_ours.qc"), "w") as f:
+                circuit_ours.write_qc(f)
         
         pd.DataFrame(datas).to_csv("exp.csv", index=False)
         open(best_gf_mult_results, "w").write(json.dumps(best_results, indent=4))
\ No newline at end of file
@@ -5,7 +5,7 @@ qcfile = (PROJ_DIR / "data" / "input" / "qc" / "toy.qc").resolve()
 
 import qcs
 
-circuit = qcs.QuantumCircuit.from_file(qcfile)
+circuit = qcs.CircuitCache(PROJ_DIR / ".qcs_cache").load(qcfile)
 
 py_circuit_opt = qcs.t_count_optimization(circuit, method="TOHPE")
 
@@ -1,6 +1,7 @@
 from .quantumCircuit        import *   # noqa: F401,F403
 from .logicNetwork          import *   # noqa: F401,F403
 from .bitVector             import *   # noqa: F401,F403
+from .gf2Matrix             import *   # noqa: F401,F403
 from .pauliProduct          import *   # noqa: F401,F403
 from .phasePolynomial       import *   # noqa: F401,F403
 from .rowMajorTableau       import *   # noqa: F401,F403
@@ -0,0 +1,109 @@
+from .netlistReader import NetlistReader
+
+
+def _decode(data: bytes, pos: int) -> tuple[int, int]:
+    """Read one 7-bit varint of the binary AIGER format."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _encode(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+class AigerReader(NetlistReader):
+    """
+    Reader of combinational AIGER, ASCII (aag) or binary (aig), from a
+    binary file handle.
+
+    The and gates and outputs are read in one pass, the symbol table names
+    the inputs (i0, i1, ... by default). Latches and the sections of
+    AIGER 1.9 are not supported. See NetlistReader for the nodes and gates.
+    """
+
+    def __init__(self, f):
+        super().__init__()
+        self._f = f
+        header = self._line().split()
+        if len(header) < 6 or header[0] not in ("aag", "aig"):
+            raise ValueError("Not an AIGER file, expected an 'aag' or 'aig' header")
+        n_vars, n_inputs, n_latches, n_outputs, n_ands = map(int, header[1:6])
+        if n_latches or any(int(n) for n in header[6:]):
+            raise ValueError("Latches and AIGER 1.9 sections are not supported")
+
+        # the node of every variable, variable 0 is the constant false
+        self._var: list[int] = [self._fresh() for _ in range(n_vars + 1)]
+        self._constants[self._var[0]] = False
+        binary = header[0] == "aig"
+        for k in range(n_inputs):
+            node = self._var[k + 1] if binary else self._node(int(self._line()), even=True)
+            self.names[node] = f"i{k}"
+            self.inputs.append(node)
+        outputs = [int(self._line()) for _ in range(n_outputs)]
+        if binary:
+            symbols = self._read_binary_ands(n_inputs, n_ands)
+        else:
+            for _ in range(n_ands):
+                lhs, rhs0, rhs1 = map(int, self._line().split())
+                self._drive(self._node(lhs, even=True), ("&", self._literal(rhs0), self._literal(rhs1), False))
+            symbols = (line.decode() for line in self._f)
+        for k, literal in enumerate(outputs):
+            node = self._fresh()
+            self.names[node] = f"o{k}"
+            self.outputs.append(node)
+            self._drive(node, self._literal(literal))
+        self._read_symbols(symbols)
+
+    def _line(self) -> str:
+        self.line_number += 1
+        line = self._f.readline()
+        if not line:
+            raise ValueError("Truncated AIGER file")
+        return line.decode().strip()
+
+    def _node(self, literal: int, even: bool = False) -> int:
+        if even and literal & 1:
+            raise ValueError(f"Line {self.line_number}: expected an even literal, got {literal}")
+        if literal >> 1 >= len(self._var):
+            raise ValueError(f"Line {self.line_number}: literal {literal} exceeds the maximum variable")
+        return self._var[literal >> 1]
+
+    def _literal(self, literal: int) -> tuple[int, bool]:
+        return self._node(literal), bool(literal & 1)
+
+    def _read_binary_ands(self, n_inputs: int, n_ands: int) -> list[str]:
+        """Read the delta-encoded and gates, return the lines of the symbol table that follows."""
+        data, pos = self._f.read(), 0
+        var, drive = self._var, self._drive
+        try:
+            for k in range(n_ands):
+                lhs = 2 * (n_inputs + k + 1)
+                delta0, pos = _decode(data, pos)
+                delta1, pos = _decode(data, pos)
+                rhs0 = lhs - delta0
+                rhs1 = rhs0 - delta1
+                drive(var[lhs >> 1], ("&", (var[rhs0 >> 1], bool(rhs0 & 1)), (var[rhs1 >> 1], bool(rhs1 & 1)), False))
+        except IndexError:
+            raise ValueError("Truncated or malformed binary AIGER and gates") from None
+        return data[pos:].decode().splitlines()
+
+    def _read_symbols(self, lines) -> None:
+        for line in lines:
+            if line.startswith("c"):
+                return
+            kind, _, name = line.partition(" ")
+            if kind[:1] == "i" and kind[1:].isdigit():
+                self.names[self.inputs[int(kind[1:])]] = name.strip()
+            elif kind[:1] == "o" and kind[1:].isdigit():
+                self.names[self.outputs[int(kind[1:])]] = name.strip()
@@ -1,62 +1,131 @@
 class BitVector:
+    """
+    Fixed-size vector of bits packed into a Python int, entry i is bit i of
+    the word. Bitwise operations run on the whole word at once.
+    """
+
+    __slots__ = ("_word", "_size")
+
     def __init__(self, size=0):
-        self.bits = [False] * size
+        self._word = 0
+        self._size = size
 
     def __len__(self):
-        return len(self.bits)
+        return self._size
 
     @classmethod
     def from_integer_vec(cls, int_vec):
         bv = cls(len(int_vec))
-        bv.bits = [bool(v) for v in int_vec]
+        bv.bits = int_vec
+        return bv
+
+    @classmethod
+    def from_int(cls, word, size):
+        """The vector of the size low bits of word."""
+        bv = cls(size)
+        bv._word = word & ((1 << size) - 1)
         return bv
 
+    def to_int(self):
+        return self._word
+
+    @property
+    def bits(self):
+        return [bool(self._word >> i & 1) for i in range(self._size)]
+
+    @bits.setter
+    def bits(self, values):
+        self._size = len(values)
+        self._word = int("".join("1" if v else "0" for v in reversed(values)) or "0", 2)
+
+    def copy(self):
+        bv = BitVector.__new__(BitVector)
+        bv._word = self._word
+        bv._size = self._size
+        return bv
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
     def size(self):
-        return len(self.bits)
+        return self._size
 
     def get(self, index):
-        return self.bits[index] if 0 <= index < len(self.bits) else False
+        return 0 <= index < self._size and bool(self._word >> index & 1)
 
     def xor_bit(self, index):
-        if 0 <= index < len(self.bits):
-            self.bits[index] ^= True
+        if 0 <= index < self._size:
+            self._word ^= 1 << index
 
     def xor(self, other):
-        for i in range(min(len(self.bits), len(other.bits))):
-            self.bits[i] ^= other.bits[i]
+        if other._size > self._size:
+            self._word ^= other._word & ((1 << self._size) - 1)
+        else:
+            self._word ^= other._word
 
     def and_(self, other):
-        for i in range(min(len(self.bits), len(other.bits))):
-            self.bits[i] &= other.bits[i]
+        if other._size >= self._size:
+            self._word &= other._word
+        else:
+            # the bits past the end of other are kept
+            self._word &= other._word | (((1 << self._size) - 1) ^ ((1 << other._size) - 1))
 
     def negate(self):
-        self.bits = [not b for b in self.bits]
+        self._word ^= (1 << self._size) - 1
 
     def get_boolean_vec(self):
-        return self.bits[:]
+        return self.bits
 
     def get_integer_vec(self):
-        return [int(b) for b in self.bits]
+        return [self._word >> i & 1 for i in range(self._size)]
 
     def extend_vec(self, vec, n_qubits):
         """Append additional vector data (bit-wise) to self.bits"""
-        self.bits += vec[:]
+        self._word |= BitVector.from_integer_vec(vec)._word << self._size
+        self._size += len(vec)
+
+    def extend_int(self, word, size):
+        """Append the size low bits of word."""
+        self._word |= (word & ((1 << size) - 1)) << self._size
+        self._size += size
+
+    def append(self, bit):
+        if bit:
+            self._word |= 1 << self._size
+        self._size += 1
+
+    def pop(self):
+        """Remove and return the last bit."""
+        self._size -= 1
+        bit = bool(self._word >> self._size & 1)
+        self._word &= (1 << self._size) - 1
+        return bit
+
+    def truncate(self, size):
+        """Keep the first size bits."""
+        if size < self._size:
+            self._size = size
+            self._word &= (1 << size) - 1
 
     def popcount(self):
-        return sum(self.bits)
+        return self._word.bit_count()
 
     def get_first_one(self):
-        try:
-            return self.bits.index(True)
-        except ValueError:
+        word = self._word
+        if not word:
             return 0 # Return 0 if no '1' is found, as a default behavior
-    
+        return (word & -word).bit_length() - 1
+
     def get_all_ones(self, nb_bits: int) -> list[int]:
         result = []
-        for i in range(min(nb_bits, len(self.bits))):
-            if self.bits[i]:
-                result.append(i)
+        word = self._word & ((1 << min(nb_bits, self._size)) - 1) if nb_bits > 0 else 0
+        while word:
+            low = word & -word
+            result.append(low.bit_length() - 1)
+            word ^= low
         return result
 
     def __repr__(self):
-        return ''.join(['1' if b else '0' for b in self.bits])
\ No newline at end of file
+        return format(self._word, f"0{self._size}b")[::-1] if self._size else ""
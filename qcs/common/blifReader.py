@@ -0,0 +1,79 @@
+from .netlistReader import NetlistReader
+
+
+class BlifReader(NetlistReader):
+    """
+    Streaming reader of combinational BLIF (.model, .inputs, .outputs,
+    .names, .end).
+
+    Every .names cover is split into two-input gates as it is read: the
+    two-input XOR and XNOR covers become one ^ gate, any other cover a sum
+    of products of & gates. Covers of the off-set are negated. See
+    NetlistReader for the nodes and gates.
+    """
+
+    def __init__(self, lines):
+        super().__init__()
+        self._lines = iter(lines)
+        self._read()
+
+    def _logical_lines(self):
+        """Yield the token lists of the lines, comments removed and continuations joined."""
+        tokens = []
+        for line in self._lines:
+            self.line_number += 1
+            line = line.split("#", 1)[0]
+            continued = line.rstrip().endswith("\\")
+            tokens += (line.rstrip()[:-1] if continued else line).split()
+            if not continued and tokens:
+                yield tokens
+                tokens = []
+        if tokens:
+            yield tokens
+
+    def _read(self) -> None:
+        cover: list[list[str]] | None = None
+        signals: list[int] = []
+        for tokens in self._logical_lines():
+            if not tokens[0].startswith("."):
+                if cover is None:
+                    raise ValueError(f"Line {self.line_number}: cube outside of .names")
+                cover.append(tokens)
+                continue
+            if cover is not None:
+                self._names(signals, cover)
+                cover = None
+            keyword = tokens[0]
+            if keyword == ".inputs":
+                self.inputs += [self._id(name) for name in tokens[1:]]
+            elif keyword == ".outputs":
+                self.outputs += [self._id(name) for name in tokens[1:]]
+            elif keyword == ".names":
+                signals, cover = [self._id(name) for name in tokens[1:]], []
+            elif keyword == ".end":
+                return
+            elif keyword != ".model":
+                raise ValueError(f"Line {self.line_number}: unsupported BLIF construct '{keyword}'")
+        if cover is not None:
+            self._names(signals, cover)
+
+    def _names(self, signals: list[int], cover: list[list[str]]) -> None:
+        *fanins, node = signals
+        if not cover:
+            self._drive(node, (None, False))
+            return
+        cubes = [row[0] if fanins else "" for row in cover]
+        values = {row[-1] for row in cover}
+        if len(values) != 1 or not values <= {"0", "1"} or any(len(cube) != len(fanins) for cube in cubes):
+            raise ValueError(f"Line {self.line_number}: malformed cover of '{self.names[node]}'")
+        if len(fanins) == 2 and sorted(cubes) in (["01", "10"], ["00", "11"]):
+            expr = "^", (fanins[0], False), (fanins[1], False), cubes[0] in ("00", "11")
+        else:
+            expr = (None, False)
+            for cube in cubes:
+                term = (None, True)
+                for fanin, bit in zip(fanins, cube):
+                    if bit != "-":
+                        term = self._binary("&", term, (fanin, bit == "0"))
+                expr = self._disjunction(expr, term)
+        self._drive(node, expr if values == {"1"} else self._negate(expr))
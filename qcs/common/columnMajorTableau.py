@@ -1,62 +1,53 @@
-import copy
-
 from .quantumCircuit import QuantumCircuit
 from .pauliProduct import PauliProduct
 from .bitVector import BitVector
 from .rowMajorTableau import RowMajorTableau
 
 class ColumnMajorTableau:
+    """
+    Tableau stored as one PauliProduct per column, stabilisers then
+    destabilisers, with the column operations of RowMajorTableau.prepend_*
+    in O(n) per gate.
+    """
     def __init__(self, n_qubits):
         self.n_qubits = n_qubits
         self.stabs = []
+        self.destabs = []
         for i in range(n_qubits):
             z = BitVector(n_qubits)
             z.xor_bit(i)
+            self.stabs.append(PauliProduct(z, BitVector(n_qubits), False))
             x = BitVector(n_qubits)
-            self.stabs.append(PauliProduct(z, x, False))
+            x.xor_bit(i)
+            self.destabs.append(PauliProduct(BitVector(n_qubits), x, False))
 
     def prepend_x(self, qubit):
-        for stabilizer in self.stabs:
-            if stabilizer.z.get(qubit):
-                stabilizer.sign ^= True
+        self.stabs[qubit].sign ^= True
 
     def prepend_z(self, qubit):
-        for stabilizer in self.stabs:
-            if stabilizer.x.get(qubit):
-                stabilizer.sign ^= True
+        self.destabs[qubit].sign ^= True
 
     def prepend_s(self, qubit):
-        for stabilizer in self.stabs:
-            if stabilizer.z.get(qubit) and stabilizer.x.get(qubit):
-                stabilizer.sign ^= True
-            if stabilizer.x.get(qubit):
-                stabilizer.z.xor_bit(qubit)
+        self.destabs[qubit].pauli_product_mult(self.stabs[qubit])
 
     def prepend_h(self, qubit):
-        for stabilizer in self.stabs:
-            zq, xq = stabilizer.z.get(qubit), stabilizer.x.get(qubit)
-            if zq and xq:
-                stabilizer.sign ^= True
-            # Swap z and x at qubit
-            if zq != xq:
-                stabilizer.z.xor_bit(qubit)
-                stabilizer.x.xor_bit(qubit)
+        self.stabs[qubit], self.destabs[qubit] = self.destabs[qubit], self.stabs[qubit]
 
     def prepend_cx(self, qubits):
         ctrl, targ = qubits
-        for stabilizer in self.stabs:
-            if stabilizer.z.get(ctrl) and stabilizer.x.get(targ):
-                stabilizer.sign ^= True
-            if stabilizer.z.get(targ):
-                stabilizer.z.xor_bit(ctrl)
-            if stabilizer.x.get(ctrl):
-                stabilizer.x.xor_bit(targ)
+        self.stabs[targ].pauli_product_mult(self.stabs[ctrl])
+        self.destabs[ctrl].pauli_product_mult(self.destabs[targ])
 
     def to_circ(self, inverse=False) -> QuantumCircuit:
         tab = RowMajorTableau(self.n_qubits)
         for i, stabilizer in enumerate(self.stabs):
             tab.insert_pauli_product(
-                PauliProduct(copy.deepcopy(stabilizer.z), copy.deepcopy(stabilizer.x), stabilizer.sign),
+                PauliProduct(stabilizer.z.copy(), stabilizer.x.copy(), stabilizer.sign),
                 i
             )
+        for i, destabilizer in enumerate(self.destabs):
+            tab.insert_pauli_product(
+                PauliProduct(destabilizer.z.copy(), destabilizer.x.copy(), destabilizer.sign),
+                i + self.n_qubits
+            )
         return tab.to_circ(inverse)
\ No newline at end of file
@@ -0,0 +1,106 @@
+from .bitVector import BitVector
+
+
+class GF2Matrix:
+    """
+    Matrix over GF(2) with every row packed into a Python int, entry (i, j)
+    is bit j of row i, so row operations XOR whole rows at once.
+
+    Rows are plain ints: matrix[i] reads and writes them, and rows may carry
+    bits past n_cols, e.g. an augmented identity.
+    """
+
+    __slots__ = ("rows", "n_cols")
+
+    def __init__(self, n_rows: int = 0, n_cols: int = 0):
+        self.rows: list[int] = [0] * n_rows
+        self.n_cols: int = n_cols
+
+    @classmethod
+    def from_rows(cls, rows, n_cols: int) -> "GF2Matrix":
+        matrix = cls(0, n_cols)
+        matrix.rows = list(rows)
+        return matrix
+
+    @classmethod
+    def from_bit_vectors(cls, vectors, n_cols: int | None = None) -> "GF2Matrix":
+        vectors = list(vectors)
+        if n_cols is None:
+            n_cols = len(vectors[0]) if vectors else 0
+        return cls.from_rows((v.to_int() for v in vectors), n_cols)
+
+    @classmethod
+    def identity(cls, n: int) -> "GF2Matrix":
+        return cls.from_rows((1 << i for i in range(n)), n)
+
+    def to_bit_vectors(self) -> list[BitVector]:
+        return [BitVector.from_int(row, self.n_cols) for row in self.rows]
+
+    def row(self, i: int) -> BitVector:
+        return BitVector.from_int(self.rows[i], self.n_cols)
+
+    def copy(self) -> "GF2Matrix":
+        return GF2Matrix.from_rows(self.rows, self.n_cols)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, i: int) -> int:
+        return self.rows[i]
+
+    def __setitem__(self, i: int, row: int) -> None:
+        self.rows[i] = row
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def get(self, i: int, j: int) -> bool:
+        return bool(self.rows[i] >> j & 1)
+
+    def append(self, row: int = 0) -> None:
+        self.rows.append(row)
+
+    def pop(self, i: int = -1) -> int:
+        return self.rows.pop(i)
+
+    def swap_rows(self, i: int, j: int) -> None:
+        self.rows[i], self.rows[j] = self.rows[j], self.rows[i]
+
+    def xor_rows(self, dst: int, src: int) -> None:
+        self.rows[dst] ^= self.rows[src]
+
+    def add_columns(self, count: int = 1) -> None:
+        """Append count zero columns."""
+        self.n_cols += count
+
+    def swap_columns(self, i: int, j: int) -> None:
+        if i == j:
+            return
+        flip = 1 << i | 1 << j
+        rows = self.rows
+        for r, row in enumerate(rows):
+            if (row >> i ^ row >> j) & 1:
+                rows[r] = row ^ flip
+
+    def truncate_columns(self, n_cols: int) -> None:
+        """Keep the first n_cols columns."""
+        mask = (1 << n_cols) - 1
+        rows = self.rows
+        for r, row in enumerate(rows):
+            rows[r] = row & mask
+        self.n_cols = n_cols
+
+    def transpose(self) -> "GF2Matrix":
+        columns = [0] * self.n_cols
+        for i, row in enumerate(self.rows):
+            while row:
+                low = row & -row
+                j = low.bit_length() - 1
+                if j >= self.n_cols:
+                    break
+                columns[j] |= 1 << i
+                row ^= low
+        return GF2Matrix.from_rows(columns, len(self.rows))
+
+    def __repr__(self) -> str:
+        return "\n".join(repr(BitVector.from_int(row, self.n_cols)) for row in self.rows)
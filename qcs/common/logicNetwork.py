@@ -1,4 +1,8 @@
-import queue, random
+import io, itertools, os, queue, random
+
+from .verilogReader import VerilogReader
+from .blifReader import BlifReader
+from .aigerReader import AigerReader, _encode
 
 class LogicGate:
     def __init__(self, gate_type: str, inputs: list[str], output: str, data={}):
@@ -73,33 +77,131 @@ class LogicNetwork:
         self._node_fanouts: dict[str, set[str]] = {}
         self._name: dict[str, str] = {}
         self._node_patterns: dict[str, int] = {}
+        self._pi_set: set[str] = set()
+        self._po_set: set[str] = set()
+        # integer ids of the nodes in order of creation
+        self._node_ids: dict[str, int] = {}
+        self.nodes: list[str] = []
 
     @staticmethod
     def from_verilog(verilog_str: str) -> "LogicNetwork":
-        lines = verilog_str.splitlines()
-        i, ntk = 0, LogicNetwork()
-        while i < len(lines):
-            line = lines[i].strip()
-            i += 1
-            if line.startswith("//") or line == "":
-                continue
-            if line.startswith("endmodule"):
-                break
-            while not line.endswith(";"):
-                line += lines[i].strip()
-                i += 1
-            line = line.rstrip(";")
-            for keyword, lst in [("input", ntk.inputs), ("output", ntk.outputs)]:
-                if line.startswith(keyword):
-                    lst.extend(_get_list(line, keyword))
-                    break
-            if line.startswith("assign"):
-                gate = LogicGate.from_assignment(_get_list(line, "assign")[0])
-                ntk.gates[gate.output] = gate
-        ntk._rename()
+        return LogicNetwork.from_reader(VerilogReader(verilog_str.splitlines()))
+
+    @staticmethod
+    def from_verilog_file(filename: str) -> "LogicNetwork":
+        with open(filename) as f:
+            return LogicNetwork.from_reader(VerilogReader(f))
+
+    @staticmethod
+    def from_blif(blif_str: str) -> "LogicNetwork":
+        return LogicNetwork.from_reader(BlifReader(blif_str.splitlines()))
+
+    @staticmethod
+    def from_aiger(aiger: bytes | str) -> "LogicNetwork":
+        if isinstance(aiger, str):
+            aiger = aiger.encode()
+        return LogicNetwork.from_reader(AigerReader(io.BytesIO(aiger)))
+
+    @staticmethod
+    def from_file(filename: str) -> "LogicNetwork":
+        """Read a .v, .blif, .aag or .aig file, .v files holding BLIF (as some ABC dumps) are detected."""
+        ext = os.path.splitext(filename)[1].lower()
+        if ext in (".aag", ".aig"):
+            with open(filename, "rb") as f:
+                return LogicNetwork.from_reader(AigerReader(f))
+        with open(filename) as f:
+            if ext == ".blif":
+                return LogicNetwork.from_reader(BlifReader(f))
+            lines = iter(f)
+            first = next((line for line in lines if line.strip() and not line.lstrip().startswith("#")), "")
+            reader = BlifReader if first.lstrip().startswith(".") else VerilogReader
+            return LogicNetwork.from_reader(reader(itertools.chain([first], lines)))
+
+    @staticmethod
+    def from_reader(reader) -> "LogicNetwork":
+        """Build the network of a netlist reader, gates are named n0, n1, ... in topological order."""
+        ntk = LogicNetwork()
+        name_of: list[str | None] = reader.names[:]
+        for node in reader.inputs:
+            ntk.create_pi(name_of[node])
+        for node, gate_type, fanins, data in reader:
+            name_of[node] = f"n{len(ntk.gates)}"
+            if reader.names[node] is not None:
+                ntk._name[reader.names[node]] = name_of[node]
+            ntk._add_gate(LogicGate(gate_type, [name_of[f] for f in fanins], name_of[node], data))
+        for node in reader.outputs:
+            ntk.create_po(name_of[node])
         ntk._compute_fanouts()
         return ntk
 
+    def write_blif(self, f, model: str = "top") -> None:
+        """Write the network as BLIF, one .names cover per gate."""
+        f.write(f".model {model}\n.inputs {' '.join(self.inputs)}\n.outputs {' '.join(self.outputs)}\n")
+        for node, gate in self.gates.items():
+            f.write(f".names {' '.join(gate.inputs)} {node}\n")
+            p1, p2, p3 = (gate.data.get(p, False) for p in ("p1", "p2", "p3"))
+            if gate.is_buf:
+                f.write("0 1\n" if p1 else "1 1\n")
+            elif gate.is_and:
+                f.write(f"{int(not p1)}{int(not p2)} {int(not p3)}\n")
+            else:
+                f.write("01 1\n10 1\n" if p1 ^ p2 ^ p3 == 0 else "00 1\n11 1\n")
+        f.write(".end\n")
+
+    def to_blif(self) -> str:
+        f = io.StringIO()
+        self.write_blif(f)
+        return f.getvalue()
+
+    def write_aiger(self, f, binary: bool = True) -> None:
+        """
+        Write the network as AIGER to a binary file handle, an XOR gate is
+        expanded into three and gates.
+        """
+        literal = {pi: 2 * (k + 1) for k, pi in enumerate(self.inputs)}
+        ands: list[tuple[int, int]] = []
+
+        def _and(rhs0: int, rhs1: int) -> int:
+            ands.append((max(rhs0, rhs1), min(rhs0, rhs1)))
+            return 2 * (len(self.inputs) + len(ands))
+
+        for node, gate in self.gates.items():
+            p1, p2, p3 = (gate.data.get(p, False) for p in ("p1", "p2", "p3"))
+            a = literal[gate.inputs[0]] ^ p1
+            if gate.is_buf:
+                literal[node] = a
+                continue
+            b = literal[gate.inputs[1]] ^ p2
+            if gate.is_and:
+                literal[node] = _and(a, b) ^ p3
+            else:
+                literal[node] = _and(_and(a, b ^ 1) ^ 1, _and(a ^ 1, b) ^ 1) ^ 1 ^ p3
+
+        n_inputs = len(self.inputs)
+        header = f"{'aig' if binary else 'aag'} {n_inputs + len(ands)} {n_inputs} 0 {len(self.outputs)} {len(ands)}\n"
+        lines = [header]
+        if not binary:
+            lines += [f"{literal[pi]}\n" for pi in self.inputs]
+        lines += [f"{literal[po]}\n" for po in self.outputs]
+        f.write("".join(lines).encode())
+        if binary:
+            f.write(b"".join(
+                _encode(lhs - rhs0) + _encode(rhs0 - rhs1)
+                for lhs, (rhs0, rhs1) in zip(range(2 * n_inputs + 2, 2 * (n_inputs + len(ands)) + 2, 2), ands)
+            ))
+        else:
+            f.write("".join(
+                f"{2 * (n_inputs + k + 1)} {rhs0} {rhs1}\n" for k, (rhs0, rhs1) in enumerate(ands)
+            ).encode())
+        symbols = [f"i{k} {pi}\n" for k, pi in enumerate(self.inputs)]
+        symbols += [f"o{k} {po}\n" for k, po in enumerate(self.outputs)]
+        f.write("".join(symbols).encode())
+
+    def to_aiger(self, binary: bool = True) -> bytes:
+        f = io.BytesIO()
+        self.write_aiger(f, binary)
+        return f.getvalue()
+
     def to_verilog(self) -> str:
         verilog_str = "module top(\n"
         verilog_str += ", ".join(self.inputs + self.outputs) + "\n"
@@ -133,8 +235,23 @@ class LogicNetwork:
     def get_gate(self, node: str) -> LogicGate:
         return self.gates.get(node, None)
 
-    def is_pi(self, node: str) -> bool:  # TODO: O(1)
-        return node in self.inputs
+    def is_pi(self, node: str) -> bool:
+        return node in self._pi_set
+
+    def is_po(self, node: str) -> bool:
+        return node in self._po_set
+
+    def node_id(self, node: str) -> int:
+        return self._node_ids[node]
+
+    def _add_node(self, node: str) -> None:
+        if node not in self._node_ids:
+            self._node_ids[node] = len(self.nodes)
+            self.nodes.append(node)
+
+    def _add_gate(self, gate: LogicGate) -> None:
+        self.gates[gate.output] = gate
+        self._add_node(gate.output)
 
     def _compute_fanouts(self):
         for node, gate in self.gates.items():
@@ -143,17 +260,6 @@ class LogicNetwork:
                     self._node_fanouts[input] = set()
                 self._node_fanouts[input].add(node)
 
-    def _rename(self):
-        _gates: dict[str, LogicGate] = {}
-        for node, gate in self.gates.items():
-            _name = f"n{len(_gates)}"
-            self._name[node] = _name
-            _inputs = [self._name.get(i, i) for i in gate.inputs]
-            _gates[_name] = LogicGate(gate.gate_type, _inputs, _name, gate.data)
-        _outputs: list[str] = [self._name.get(o, o) for o in self.outputs]
-        self.outputs = _outputs
-        self.gates = _gates
-
     def num_fanouts(self, node: str) -> int:
         return len(self._node_fanouts.get(node, 0))
 
@@ -161,33 +267,36 @@ class LogicNetwork:
         return list(self._node_fanouts.get(node, []))
 
     def fanins(self, node: str) -> list[str]:
-        return [] if node in self.inputs else self.gates[node].inputs
+        return [] if self.is_pi(node) else self.gates[node].inputs
 
     def create_pi(self, node: str) -> None:
         self.inputs.append(node)
+        self._pi_set.add(node)
+        self._add_node(node)
 
     def create_po(self, node: str) -> None:
         self.outputs.append(node)
+        self._po_set.add(node)
 
     def create_and(self, n: str, f1: str, f2: str) -> None:
-        self.gates[n] = LogicGate(
+        self._add_gate(LogicGate(
             "&", [f1, f2], n, {"p1": False, "p2": False, "p3": False}
-        )
+        ))
 
     def create_xor(self, n: str, f1: str, f2: str) -> None:
-        self.gates[n] = LogicGate(
+        self._add_gate(LogicGate(
             "^", [f1, f2], n, {"p1": False, "p2": False, "p3": False}
-        )
+        ))
 
     def has(self, node: str) -> bool:
-        return node in self.gates or node in self.inputs
+        return node in self.gates or self.is_pi(node)
 
     def is_gate(self, node: str) -> bool:
         return node in self.gates
 
     def clone_gate(self, gate: LogicGate) -> None:
         _gate = LogicGate(gate.gate_type, gate.inputs[:], gate.output, gate.data.copy())
-        self.gates[_gate.output] = _gate
+        self._add_gate(_gate)
 
     def simulate(self) -> int:
         if self.num_pis >= 5:
@@ -0,0 +1,134 @@
+class NetlistReader:
+    """
+    Shared state of the netlist readers: integer nodes, two-input gates
+    and constants.
+
+    A node is an index into names, fresh gates have no name. Gates are
+    (gate_type, fanins, data) with the polarity flags p1, p2, p3 of
+    LogicGate. Expressions are built from literals (node, negated),
+    constants (None, value) and pending gates
+    (gate_type, literal, literal, negated), which are only created once it
+    is known whether they drive a named node. Iterating yields the gates in
+    topological order as (node, gate_type, fanins, data), with the nodes
+    driven by constants folded away, except constant outputs, which become
+    the xor of the first input with itself.
+    """
+
+    def __init__(self):
+        self.line_number: int = 0
+        self.names: list[str | None] = []
+        self._ids: dict[str, int] = {}
+        self.inputs: list[int] = []
+        self.outputs: list[int] = []
+        self._gates: dict[int, tuple[str, list[int], dict]] = {}
+        self._constants: dict[int, bool] = {}
+
+    def _id(self, name: str) -> int:
+        node = self._ids.get(name)
+        if node is None:
+            node = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return node
+
+    def _fresh(self) -> int:
+        self.names.append(None)
+        return len(self.names) - 1
+
+    def _drive(self, node: int, expr: tuple) -> None:
+        if node in self._gates or node in self._constants:
+            raise ValueError(f"Line {self.line_number}: '{self.names[node]}' is assigned twice")
+        if len(expr) == 4:
+            self._create(expr, node)
+        elif expr[0] is None:
+            self._constants[node] = expr[1]
+        else:
+            self._gates[node] = ("=", [expr[0]], {"p1": expr[1]})
+
+    def _create(self, expr: tuple, node: int | None = None) -> tuple[int, bool]:
+        """The literal of expr, a pending gate is created first."""
+        if len(expr) == 2:
+            return expr
+        if node is None:
+            node = self._fresh()
+        gate_type, (f1, p1), (f2, p2), p3 = expr
+        self._gates[node] = (gate_type, [f1, f2], {"p1": p1, "p2": p2, "p3": p3})
+        return node, False
+
+    @staticmethod
+    def _negate(expr: tuple) -> tuple:
+        if len(expr) == 2:
+            return expr[0], not expr[1]
+        return (*expr[:3], not expr[3])
+
+    def _binary(self, gate_type: str, lhs: tuple, rhs: tuple) -> tuple:
+        for const, other in ((lhs, rhs), (rhs, lhs)):
+            if len(const) == 2 and const[0] is None:
+                if gate_type == "^":
+                    return self._negate(other) if const[1] else other
+                return other if const[1] else (None, False)
+        return gate_type, self._create(lhs), self._create(rhs), False
+
+    def _disjunction(self, lhs: tuple, rhs: tuple) -> tuple:
+        # De Morgan, as LogicGate.from_assignment
+        return self._negate(self._binary("&", self._negate(lhs), self._negate(rhs)))
+
+    def _fold(self, gate: tuple) -> tuple | bool:
+        """Simplify a gate with constant fanins into a buffer or a constant."""
+        gate_type, fanins, data = gate
+        literals = [(f, data[f"p{i + 1}"]) for i, f in enumerate(fanins)]
+        values = [self._constants[f] ^ p for f, p in literals if f in self._constants]
+        others = [(f, p) for f, p in literals if f not in self._constants]
+        if gate_type == "=":
+            return values[0]
+        if gate_type == "&" and not all(values):
+            return data["p3"]
+        # the remaining constants are neutral for &, flip the output for ^
+        negated = data["p3"] ^ (gate_type == "^" and sum(values) % 2 == 1)
+        if not others:
+            return (gate_type == "&") ^ negated
+        f, p = others[0]
+        return "=", [f], {"p1": p ^ negated}
+
+    def __iter__(self):
+        """Yield (node, gate_type, fanins, data) in topological order."""
+        done, visiting = set(self.inputs) | set(self._constants), set()
+        for root in self._gates:
+            stack = [root]
+            while stack:
+                node = stack[-1]
+                if node in done:
+                    stack.pop()
+                    continue
+                gate = self._gates.get(node)
+                if gate is None:
+                    raise ValueError(f"Node '{self.names[node]}' is never assigned")
+                pending = [f for f in gate[1] if f not in done]
+                if pending:
+                    # nodes above a visiting node on the stack are in its fanin cone
+                    if node in visiting or not visiting.isdisjoint(pending):
+                        raise ValueError(f"Combinational loop through '{self.names[node]}'")
+                    visiting.add(node)
+                    stack.extend(pending)
+                    continue
+                stack.pop()
+                visiting.discard(node)
+                done.add(node)
+                if any(f in self._constants for f in gate[1]):
+                    gate = self._fold(gate)
+                    if isinstance(gate, bool):
+                        self._constants[node] = gate
+                        continue
+                yield node, *gate
+        constant_outputs = set()
+        for node in self.outputs:
+            if node in self._constants:
+                if node in constant_outputs:
+                    continue
+                # LogicNetwork has no constant nodes, a constant output is an input xor itself
+                if not self.inputs:
+                    raise ValueError(f"Output '{self.names[node]}' is constant and there is no input to build it")
+                constant_outputs.add(node)
+                pi = self.inputs[0]
+                yield node, "^", [pi, pi], {"p1": False, "p2": False, "p3": self._constants[node]}
+            elif node not in done:
+                raise ValueError(f"Output '{self.names[node]}' is never assigned")
@@ -1,4 +1,3 @@
-import copy
 from .bitVector import BitVector
 
 class PauliProduct:
@@ -8,9 +7,9 @@ class PauliProduct:
         self.sign = sign  # bool
 
     def is_commuting(self, other):
-        x1z2 = copy.deepcopy(self.z)
+        x1z2 = self.z.copy()
         x1z2.and_(other.x)
-        ac = copy.deepcopy(self.x)
+        ac = self.x.copy()
         ac.and_(other.z)
         ac.xor(x1z2)
         return ac.popcount() % 2 == 0
@@ -21,18 +20,18 @@ class PauliProduct:
         return vec_z + vec_x
 
     def pauli_product_mult(self, other):
-        x1z2 = copy.deepcopy(self.z)
+        x1z2 = self.z.copy()
         x1z2.and_(other.x)
-        ac = copy.deepcopy(self.x)
+        ac = self.x.copy()
         ac.and_(other.z)
         ac.xor(x1z2)
 
         self.x.xor(other.x)
         self.z.xor(other.z)
 
-        x1z2 = copy.deepcopy(self.z)
-        x1z2.xor(self.x)
-        x1z2.xor(other.z)
+        y = self.z.copy()
+        y.and_(self.x)
+        x1z2.xor(y)
         x1z2.and_(ac)
 
         self.sign ^= other.sign ^ (((ac.popcount() + 2 * x1z2.popcount()) % 4) > 1)
\ No newline at end of file
@@ -1,3 +1,5 @@
+from hashlib import blake2b
+
 from .quantumCircuit import QuantumCircuit
 from .rowMajorTableau import RowMajorTableau
 
@@ -20,6 +22,13 @@ class PhasePolynomial:
             for _ in range(diff // 2):
                 tab.append_s(i)
         return tab
+    def fingerprint(self) -> str:
+        """Hash of the set of parities, independent of the order of the table."""
+        digest = blake2b(digest_size=16)
+        digest.update(self.n_qubits.to_bytes(4, "little"))
+        for row in sorted(bytes(z.get_integer_vec()) for z in self.table):
+            digest.update(len(row).to_bytes(4, "little") + row)
+        return digest.hexdigest()
     def to_circ(self):
         qc = QuantumCircuit()
         qc.request_qubits(self.n_qubits)
@@ -1,3 +1,10 @@
+import os
+from itertools import chain
+
+from .gateArray import *
+from .metrics import MetricsCache
+from .qubitMap import QubitMap, relabel_gates
+
 ALL_AVAILABLE_GATES = [
     # CNOT: Controlled-NOT gate (2-qubit)
     "CNOT",
@@ -23,9 +30,129 @@ ALL_AVAILABLE_GATES = [
 
 
 class QuantumCircuit:
-    def __init__(self):
+    def __init__(self, compact: bool = False):
         self.n_qubits: int = 0
-        self.gates: list = []
+        # gates are either a list of dicts or, in compact mode, a columnar GateArray
+        self._gates: list | GateArray = GateArray() if compact else []
+        # frozen gate chunks shared with snapshots, they precede self._gates
+        self._chunks: tuple = ()
+        # gate counters kept up to date on append, None until first requested
+        self._metrics: MetricsCache | None = None
+        # pending relabelling by map_qubit / swap_qubits, None until first used
+        self._qubit_map: QubitMap | None = None
+
+    @property
+    def gates(self) -> list | GateArray:
+        if self._chunks:
+            if self.is_compact:
+                self._gates = self._concat(*self._chunks, self._gates)
+            else:
+                # the dicts of the chunks are shared with snapshots, edits through .gates get private copies
+                gates = [{**gate} for gate in chain.from_iterable(self._chunks)]
+                gates.extend(self._gates)
+                self._gates = gates
+            self._chunks = ()
+        if self._qubit_map is not None and self._qubit_map.is_pending:
+            relabel_gates(self._gates, self._qubit_map.take_labels())
+        # the caller may edit the gates in place, the metrics are rebuilt on next use
+        self._metrics = None
+        return self._gates
+
+    @gates.setter
+    def gates(self, gates) -> None:
+        self._chunks = ()
+        self._metrics = None
+        self._qubit_map = None
+        if self.is_compact:
+            self._gates = gates if isinstance(gates, GateArray) else GateArray(gates)
+        elif isinstance(gates, GateArray):
+            self._gates = gates.to_list()
+        elif isinstance(gates, list):
+            self._gates = gates
+        else:
+            self._gates = [gate if isinstance(gate, dict) else gate.copy() for gate in gates]
+
+    @property
+    def is_compact(self) -> bool:
+        return isinstance(self._gates, GateArray)
+
+    def to_compact(self) -> "QuantumCircuit":
+        new_circuit = QuantumCircuit(compact=True)
+        new_circuit.n_qubits = self.n_qubits
+        for part in self._parts():
+            new_circuit._gates.extend(part)
+        return new_circuit
+
+    def to_expanded(self) -> "QuantumCircuit":
+        new_circuit = QuantumCircuit()
+        new_circuit.n_qubits = self.n_qubits
+        new_circuit._gates = [gate_dict(*row) for row in self.iter_ops()]
+        return new_circuit
+
+    def _cached_metrics(self) -> MetricsCache:
+        # gates appended through a list kept from .gates are caught by the length check
+        if self._metrics is None or self._metrics.n_gates != self.num_gates:
+            self._metrics = MetricsCache.from_ops(self.iter_ops())
+        return self._metrics
+
+    def invalidate_metrics(self) -> None:
+        """Drop the cached metrics after editing a gates list kept from before the last metric read."""
+        self._metrics = None
+
+    def iter_ops(self):
+        """Iterate over the gates as (opcode, ctrl1, ctrl2, target) tuples."""
+        if self.is_compact:
+            ops = chain.from_iterable(part.iter_ops() for part in self._stored_parts())
+        else:
+            ops = map(gate_ops, chain.from_iterable(self._stored_parts()))
+        if self._qubit_map is not None and self._qubit_map.is_pending:
+            # relabel on the fly rather than folding the pending map
+            label_of = self._qubit_map.label_of
+            return (
+                (op, label_of.get(c1, c1), label_of.get(c2, c2), label_of.get(t, t)) for op, c1, c2, t in ops
+            )
+        return ops
+
+    def _stored_parts(self) -> tuple:
+        return (*self._chunks, self._gates)
+
+    def _parts(self) -> tuple:
+        if self._qubit_map is not None and self._qubit_map.is_pending:
+            return (self.gates,)
+        return (*self._chunks, self._gates)
+
+    def _concat(self, *parts) -> list | GateArray:
+        if self.is_compact:
+            merged = GateArray()
+            for part in parts:
+                merged.extend(part)
+            return merged
+        return list(chain.from_iterable(parts))
+
+    def snapshot(self) -> "QuantumCircuit":
+        """
+        Copy-on-write copy of the circuit in O(log G) amortized time.
+
+        The gates added so far are frozen into a chunk shared by both circuits,
+        later additions go to a private tail. Reading .gates unshares the
+        chunk, so gates edited through it do not leak into the other circuit.
+        The qubit map of map_qubit / swap_qubits is copied and folded lazily.
+        """
+        if len(self._gates) > 0:
+            chunks = self._chunks + (self._gates,)
+            # keep chunk sizes geometric so that there are O(log G) of them
+            while len(chunks) > 1 and len(chunks[-2]) < 2 * len(chunks[-1]):
+                chunks = chunks[:-2] + (self._concat(chunks[-2], chunks[-1]),)
+            self._chunks = chunks
+            self._gates = self._gates[:0]
+        new_circuit = QuantumCircuit(compact=self.is_compact)
+        new_circuit.n_qubits = self.n_qubits
+        new_circuit._chunks = self._chunks
+        if self._metrics is not None:
+            new_circuit._metrics = self._metrics.copy()
+        if self._qubit_map is not None:
+            new_circuit._qubit_map = self._qubit_map.copy()
+        return new_circuit
 
     def request_qubit(self) -> int:
         self.n_qubits += 1
@@ -39,7 +166,17 @@ class QuantumCircuit:
             other, QuantumCircuit
         ), "Can only append another QuantumCircuit"
         self.n_qubits = max(self.n_qubits, other.n_qubits)
-        self.gates.extend(other.gates)
+        if self._metrics is not None:
+            self._metrics.merge(other._cached_metrics())
+        if self._qubit_map is not None:
+            for row in other.iter_ops():
+                self._store(*row)
+            return
+        for part in other._parts():
+            if not self.is_compact and isinstance(part, GateArray):
+                self._gates.extend(part.to_list())
+            else:
+                self._gates.extend(part)
 
     def extend(self, gates: list[dict]) -> None:
         for gate in gates:
@@ -48,11 +185,50 @@ class QuantumCircuit:
     def copy(self) -> "QuantumCircuit":
         new_circuit = QuantumCircuit()
         new_circuit.n_qubits = self.n_qubits
-        new_circuit.gates = [{**gate} for gate in self.gates]
+        if self.is_compact:
+            new_circuit._gates = self._concat(*self._parts())
+        else:
+            new_circuit._gates = [{**gate} for gate in chain.from_iterable(self._parts())]
+        if self._metrics is not None:
+            new_circuit._metrics = self._metrics.copy()
+        if self._qubit_map is not None:
+            new_circuit._qubit_map = self._qubit_map.copy()
         return new_circuit
 
     def add_gate(self, gate: dict) -> None:
-        self.gates.append(gate.copy())
+        if self._qubit_map is not None:
+            self._add(*gate_ops(gate))
+            return
+        if self._metrics is not None:
+            op, _, _, target = gate_ops(gate)
+            self._metrics.push(op, target)
+        if self.is_compact:
+            self._gates.append(gate)
+        else:
+            self._gates.append(gate.copy())
+
+    def _add(self, op: int, ctrl1: int, ctrl2: int, target: int) -> None:
+        if self._qubit_map is not None:
+            alias = self._qubit_map.alias
+            if alias:
+                ctrl1, ctrl2, target = alias.get(ctrl1, ctrl1), alias.get(ctrl2, ctrl2), alias.get(target, target)
+        if self._metrics is not None:
+            self._metrics.push(op, target)
+        self._store(op, ctrl1, ctrl2, target)
+
+    def _store(self, op: int, ctrl1: int, ctrl2: int, target: int) -> None:
+        qubit_map = self._qubit_map
+        if qubit_map is not None and qubit_map.is_pending:
+            slots = qubit_map.slot(ctrl1), qubit_map.slot(ctrl2), qubit_map.slot(target)
+            if None in slots:
+                # a qubit merged away by map_qubit gets a fresh wire, fold the map first
+                self.gates
+            else:
+                ctrl1, ctrl2, target = slots
+        if self.is_compact:
+            self._gates.append_op(op, ctrl1, ctrl2, target)
+        else:
+            self._gates.append(gate_dict(op, ctrl1, ctrl2, target))
 
     @staticmethod
     def deps_of(gate: dict) -> set[int]:
@@ -63,7 +239,7 @@ class QuantumCircuit:
         elif gate["name"] == "CZ":
             deps.add(gate["ctrl"])
             deps.add(gate["target"])
-        elif gate["name"] == "Tof":
+        elif gate["name"] in ("Tof", "CCZ"):
             deps.add(gate["ctrl1"])
             deps.add(gate["ctrl2"])
             deps.add(gate["target"])
@@ -72,31 +248,31 @@ class QuantumCircuit:
         return deps
 
     def add_cnot(self, ctrl: int, target: int) -> None:
-        self.gates.append({"name": "CNOT", "ctrl": ctrl, "target": target})
+        self._add(OP_CNOT, ctrl, NO_QUBIT, target)
 
     def add_cz(self, ctrl: int, target: int) -> None:
-        self.gates.append({"name": "CZ", "ctrl": ctrl, "target": target})
+        self._add(OP_CZ, ctrl, NO_QUBIT, target)
 
     def add_z(self, target: int) -> None:
-        self.gates.append({"name": "Z", "target": target})
+        self._add(OP_Z, NO_QUBIT, NO_QUBIT, target)
 
     def add_x(self, target: int) -> None:
-        self.gates.append({"name": "X", "target": target})
+        self._add(OP_X, NO_QUBIT, NO_QUBIT, target)
 
     def add_h(self, target: int) -> None:
-        self.gates.append({"name": "HAD", "target": target})
+        self._add(OP_HAD, NO_QUBIT, NO_QUBIT, target)
 
     def add_s(self, target: int) -> None:
-        self.gates.append({"name": "S", "target": target})
+        self._add(OP_S, NO_QUBIT, NO_QUBIT, target)
 
     def add_t(self, target: int) -> None:
-        self.gates.append({"name": "T", "target": target})
+        self._add(OP_T, NO_QUBIT, NO_QUBIT, target)
 
     def add_tdg(self, target: int) -> None:
-        self.gates.append({"name": "Tdg", "target": target})
+        self._add(OP_TDG, NO_QUBIT, NO_QUBIT, target)
 
     def add_toffoli(self, c1: int, c2: int, target: int) -> None:
-        self.gates.append({"name": "Tof", "ctrl1": c1, "ctrl2": c2, "target": target})
+        self._add(OP_TOF, c1, c2, target)
 
     def add_clean_toffoli(self, c1: int, c2: int, target: int) -> None: ...
 
@@ -110,6 +286,12 @@ class QuantumCircuit:
 
     def t_depth(self) -> int: ...
 
+    def depth(self) -> int: ...
+
+    def cnot_depth(self) -> int: ...
+
+    def layering(self, record_layers: bool = False) -> "Layering": ...
+
     def t_depth_of(self, qubit: int) -> int: ...
 
     def num_gates(self) -> int: ...
@@ -122,7 +304,7 @@ class QuantumCircuit:
 
     def toffoli_gadgetization(self) -> "QuantumCircuit": ...
 
-    def iterative_toffoli_gadgetization(self) -> "QuantumCircuit": ...
+    def iterative_toffoli_gadgetization(self, cache=None) -> "QuantumCircuit": ...
 
     def hadamard_gadgetization(
         self, allow_mapping: bool = False
@@ -136,27 +318,60 @@ class QuantumCircuit:
 
     def cleanup(self) -> "QuantumCircuit": ...
 
+    def to_dag(self) -> "CircuitDag": ...
+
+    def view(self, start: int = 0, stop: int | None = None, qubits=None) -> "CircuitView": ...
+
+    def fingerprint(self, relabel: bool = False, commute: bool = False) -> str: ...
+
+    def gate_hashes(self) -> "GateHashes": ...
+
     def to_qasm(self) -> str: ...
 
+    def write_qasm(self, f) -> None: ...
+
     def to_qc(self, **kwargs) -> str: ...
 
+    def write_qc(self, f, **kwargs) -> None: ...
+
     def to_json(self) -> dict: ...
 
+    def save_binary(self, filename: str) -> None: ...
+
+    @staticmethod
+    def load_binary(filename: str) -> "QuantumCircuit": ...
+
     @staticmethod
     def from_truth_table(
         truth_table: list[str], n: int, m: int, use_gray_code: bool = True
     ) -> "QuantumCircuit": ...
 
     @staticmethod
-    def from_qasm(qasm: str) -> "QuantumCircuit": ...
+    def from_qasm(qasm: str, compact: bool = False) -> "QuantumCircuit": ...
+
+    @staticmethod
+    def from_qc(qc: str, compact: bool = False) -> "QuantumCircuit": ...
 
     @staticmethod
-    def from_file(filename: str) -> "QuantumCircuit": ...
+    def from_file(filename: str | os.PathLike, compact: bool = False) -> "QuantumCircuit": ...
 
     def run_zx(self) -> "QuantumCircuit": ...
 
-    def fast_todd_optimize(self) -> "QuantumCircuit": ...
+    def fast_todd_optimize(self, engine: str = "external", max_workers: int = 1, seed: int | None = None) -> "QuantumCircuit": ...
+
+    def t_count_optimize(self, optimizer: str = "FastTODD", max_workers: int = 1, seed: int | None = None) -> "QuantumCircuit": ...
+
+    def multi_start_optimize(
+        self,
+        n_starts: int = 8,
+        seed: int = 0,
+        time_budget: float | None = None,
+        max_workers: int | None = None,
+        optimizer: str = "FastTODD",
+    ) -> "QuantumCircuit": ...
 
     def map_qubit(self, q1: int, q2: int): ...
 
     def swap_qubits(self, q1: int, q2: int): ...
+
+    def redirect_qubit(self, qubit: int, to: int): ...
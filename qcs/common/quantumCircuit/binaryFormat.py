@@ -0,0 +1,90 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from .base import QuantumCircuit
+from .gateArray import GateArray
+
+BINARY_MAGIC: bytes = b"QCSB"
+BINARY_VERSION: int = 1
+
+# magic, version, flags, n_qubits, n_gates, padded to 32 bytes
+_HEADER = struct.Struct("<4sHHIQ12x")
+_ALIGN: int = 8
+
+
+def _padding(size: int) -> int:
+    return -size % _ALIGN
+
+
+def _column_layout(n_gates: int) -> list[tuple[str, int, int]]:
+    """(typecode, offset, length in bytes) of the ops, ctrl1, ctrl2 and target columns."""
+    layout = []
+    offset = _HEADER.size
+    for typecode, itemsize in (("B", 1), ("i", 4), ("i", 4), ("i", 4)):
+        layout.append((typecode, offset, n_gates * itemsize))
+        offset += n_gates * itemsize
+        offset += _padding(offset)
+    return layout
+
+
+def save_binary(self, filename: str) -> None:
+    """
+    Save the circuit in the QCSB binary format.
+
+    A 32-byte header (magic, version, flags, n_qubits, n_gates) is followed
+    by the opcode column as bytes and the ctrl1, ctrl2 and target columns as
+    little-endian int32, each padded to 8 bytes. Unused operands are NO_QUBIT.
+    """
+    parts = self._parts()
+    if not self.is_compact:
+        parts = (GateArray(gate for part in parts for gate in part),)
+    n_gates = sum(len(part) for part in parts)
+    with open(filename, "wb") as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, self.n_qubits, n_gates))
+        for column, (_, offset, size) in zip(("ops", "ctrl1", "ctrl2", "target"), _column_layout(n_gates)):
+            for part in parts:
+                values = getattr(part, column)
+                if sys.byteorder != "little" and values.itemsize > 1:
+                    values = array(values.typecode, values)
+                    values.byteswap()
+                f.write(values)
+            f.write(bytes(_padding(offset + size)))
+
+
+@staticmethod
+def load_binary(filename: str) -> "QuantumCircuit":
+    """
+    Load a QCSB file as a compact circuit backed by a read-only memory map.
+
+    The gate columns are not copied: processes loading the same file share
+    its pages. Editing the circuit copies the columns on the first write.
+    """
+    with open(filename, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < _HEADER.size:
+        raise ValueError(f"{filename} is not a QCSB file")
+    magic, version, _, n_qubits, n_gates = _HEADER.unpack_from(buffer)
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"{filename} is not a QCSB file")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported QCSB version {version} in {filename}")
+    layout = _column_layout(n_gates)
+    _, offset, size = layout[-1]
+    if len(buffer) < offset + size:
+        raise ValueError(f"Truncated QCSB file {filename}")
+
+    memory = memoryview(buffer)
+    columns = []
+    for typecode, offset, size in layout:
+        column = memory[offset : offset + size].cast(typecode)
+        if sys.byteorder != "little" and typecode != "B":
+            column = array(typecode, column)
+            column.byteswap()
+        columns.append(column)
+
+    circuit = QuantumCircuit(compact=True)
+    circuit.n_qubits = n_qubits
+    circuit._gates = GateArray.from_columns(*columns)
+    return circuit
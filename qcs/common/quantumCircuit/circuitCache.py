@@ -0,0 +1,150 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+
+from .base import QuantumCircuit
+from .binaryFormat import BINARY_VERSION, load_binary, save_binary
+from .io import from_file
+
+CACHED_SUFFIXES: tuple[str, ...] = (".qc", ".qasm")
+
+
+def _digest(*parts) -> str:
+    digest = blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _evict_lru(directory: str, max_bytes: int, suffix: str = ".qcsb") -> None:
+    """Remove the least recently touched files of directory until they fit in max_bytes."""
+    entries = []
+    for dir_entry in os.scandir(directory):
+        if dir_entry.name.endswith(suffix):
+            try:
+                stat = dir_entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, dir_entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def _write_atomic(path: str, write) -> None:
+    """Call write on a fresh temporary path next to path, then rename it over path."""
+    # concurrent threads and processes may store the same entry, the last rename wins
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _write_text(path: str, text: str) -> None:
+    with open(path, "w") as f:
+        f.write(text)
+
+
+class CircuitCache:
+    """
+    On-disk cache of parsed circuits in the QCSB binary format.
+
+    A circuit is stored once per file content as <content hash>.qcsb. A
+    small <stamp>.ref file maps the path, mtime and size of a source file to
+    its content hash, so a hit costs two stats and a memory map, and touching
+    or moving a file only costs one hash. When a miss stores a new entry,
+    entries are evicted least recently used first, with their refs, until
+    they take at most max_bytes.
+    """
+
+    def __init__(self, directory: str = ".qcs_cache", max_bytes: int = 1 << 30):
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _ref(self, filename: str) -> str:
+        stat = os.stat(filename)
+        return self._path(_digest(os.path.abspath(filename), stat.st_mtime_ns, stat.st_size) + ".ref")
+
+    def entry(self, filename: str) -> str:
+        """The path of the cached QCSB file of filename, parsed and stored on a miss."""
+        return self._lookup(filename)[0]
+
+    def _lookup(self, filename: str) -> tuple[str, bool]:
+        """The entry of filename and whether a new entry was stored for it."""
+        ref = self._ref(filename)
+        if os.path.exists(ref):
+            with open(ref) as f:
+                entry = self._path(f.read().strip())
+            if os.path.exists(entry):
+                os.utime(entry)
+                return entry, False
+
+        with open(filename, "rb") as f:
+            content = _digest(BINARY_VERSION, os.path.splitext(filename)[1], f.read())
+        entry = self._path(content + ".qcsb")
+        stored = not os.path.exists(entry)
+        if stored:
+            circuit = from_file(str(filename), compact=True)
+            _write_atomic(entry, lambda tmp: save_binary(circuit, tmp))
+        else:
+            os.utime(entry)
+        _write_atomic(ref, lambda tmp: _write_text(tmp, os.path.basename(entry)))
+        return entry, stored
+
+    def load(self, filename: str, compact: bool = False) -> QuantumCircuit:
+        """Drop-in for QuantumCircuit.from_file, compact circuits are memory-mapped."""
+        entry, stored = self._lookup(filename)
+        circuit = load_binary(entry)
+        if stored:
+            # the memory map outlives the removal of its file
+            self.evict()
+        return circuit if compact else circuit.to_expanded()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until they fit in max_bytes,
+        and the refs of entries that are gone.
+        """
+        _evict_lru(self.directory, self.max_bytes)
+        for dir_entry in os.scandir(self.directory):
+            if not dir_entry.name.endswith(".ref"):
+                continue
+            try:
+                with open(dir_entry.path) as f:
+                    if not os.path.exists(self._path(f.read().strip())):
+                        os.remove(dir_entry.path)
+            except FileNotFoundError:
+                pass
+
+    def warm(self, paths, max_workers: int | None = None) -> int:
+        """
+        Parse and store the given files, or the circuit files of a directory,
+        in a pool of processes. Returns the number of files cached.
+        """
+        if isinstance(paths, (str, os.PathLike)) and os.path.isdir(paths):
+            paths = sorted(
+                entry.path for entry in os.scandir(paths) if entry.name.endswith(CACHED_SUFFIXES)
+            )
+        paths = [str(path) for path in paths]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            # larger files first, so that the pool is not left waiting on one
+            for _ in pool.map(self.entry, sorted(paths, key=os.path.getsize, reverse=True)):
+                pass
+        self.evict()
+        return len(paths)
@@ -0,0 +1,166 @@
+from itertools import chain
+
+from .base import QuantumCircuit
+
+NO_NODE: int = -1
+
+
+class CircuitDag:
+    """
+    Gate dependency graph of a circuit.
+
+    Every node is linked to the previous and next node on each of its qubits,
+    and all nodes are threaded on a list in a topological order (initially
+    the gate order). Removing a node or inserting one next to an existing
+    node is O(arity), so rewriting passes can follow the wires directly.
+    """
+
+    def __init__(self, n_qubits: int = 0, compact: bool = False):
+        self.n_qubits: int = n_qubits
+        # storage kind of the circuit built by to_circuit
+        self.compact: bool = compact
+        self.gates: list[dict | None] = []
+        self.qubits: list[tuple[int, ...]] = []
+        self.prev: list[dict[int, int]] = []
+        self.next: list[dict[int, int]] = []
+        self.head: list[int] = [NO_NODE] * n_qubits
+        self.tail: list[int] = [NO_NODE] * n_qubits
+        # the topological order as a doubly linked list over node ids
+        self.order_prev: list[int] = []
+        self.order_next: list[int] = []
+        self.first: int = NO_NODE
+        self.last: int = NO_NODE
+        self._n_nodes: int = 0
+
+    @staticmethod
+    def from_circuit(circ: QuantumCircuit) -> "CircuitDag":
+        dag = CircuitDag(circ.n_qubits, circ.is_compact)
+        for gate in chain.from_iterable(circ._parts()):
+            dag.push(gate)
+        return dag
+
+    def to_circuit(self) -> QuantumCircuit:
+        circuit = QuantumCircuit(compact=self.compact)
+        circuit.n_qubits = self.n_qubits
+        circuit.gates = [self.gates[node] for node in self]
+        return circuit
+
+    def __len__(self) -> int:
+        return self._n_nodes
+
+    def __iter__(self):
+        """Iterate over the live nodes in topological order."""
+        node = self.first
+        while node != NO_NODE:
+            yield node
+            node = self.order_next[node]
+
+    def _new_node(self, gate: dict) -> int:
+        node = len(self.gates)
+        qubits = tuple(QuantumCircuit.deps_of(gate))
+        for q in qubits:
+            if q >= self.n_qubits:
+                self.head += [NO_NODE] * (q + 1 - self.n_qubits)
+                self.tail += [NO_NODE] * (q + 1 - self.n_qubits)
+                self.n_qubits = q + 1
+        self.gates.append({**gate})
+        self.qubits.append(qubits)
+        self.prev.append({})
+        self.next.append({})
+        self.order_prev.append(NO_NODE)
+        self.order_next.append(NO_NODE)
+        self._n_nodes += 1
+        return node
+
+    def push(self, gate: dict) -> int:
+        """Append a gate at the end of the circuit."""
+        node = self._new_node(gate)
+        for q in self.qubits[node]:
+            last = self.tail[q]
+            self.prev[node][q] = last
+            self.next[node][q] = NO_NODE
+            if last == NO_NODE:
+                self.head[q] = node
+            else:
+                self.next[last][q] = node
+            self.tail[q] = node
+        self.order_prev[node] = self.last
+        if self.last == NO_NODE:
+            self.first = node
+        else:
+            self.order_next[self.last] = node
+        self.last = node
+        return node
+
+    def insert_before(self, anchor: int, gate: dict) -> int:
+        """Insert a gate right before anchor; it may only act on qubits of anchor."""
+        node = self._new_node(gate)
+        for q in self.qubits[node]:
+            assert q in self.next[anchor], f"Qubit {q} is not used by node {anchor}"
+            before = self.prev[anchor][q]
+            self.prev[node][q], self.next[node][q] = before, anchor
+            self.prev[anchor][q] = node
+            if before == NO_NODE:
+                self.head[q] = node
+            else:
+                self.next[before][q] = node
+        before = self.order_prev[anchor]
+        self.order_prev[node], self.order_next[node] = before, anchor
+        self.order_prev[anchor] = node
+        if before == NO_NODE:
+            self.first = node
+        else:
+            self.order_next[before] = node
+        return node
+
+    def remove(self, node: int) -> None:
+        for q in self.qubits[node]:
+            before, after = self.prev[node][q], self.next[node][q]
+            if before == NO_NODE:
+                self.head[q] = after
+            else:
+                self.next[before][q] = after
+            if after == NO_NODE:
+                self.tail[q] = before
+            else:
+                self.prev[after][q] = before
+        before, after = self.order_prev[node], self.order_next[node]
+        if before == NO_NODE:
+            self.first = after
+        else:
+            self.order_next[before] = after
+        if after == NO_NODE:
+            self.last = before
+        else:
+            self.order_prev[after] = before
+        self.gates[node] = None
+        self._n_nodes -= 1
+
+    def is_alive(self, node: int) -> bool:
+        return self.gates[node] is not None
+
+    def gate(self, node: int) -> dict:
+        return self.gates[node]
+
+    def next_on(self, node: int, qubit: int) -> int:
+        return self.next[node].get(qubit, NO_NODE)
+
+    def prev_on(self, node: int, qubit: int) -> int:
+        return self.prev[node].get(qubit, NO_NODE)
+
+    def successors(self, node: int) -> set[int]:
+        return {n for n in self.next[node].values() if n != NO_NODE}
+
+    def predecessors(self, node: int) -> set[int]:
+        return {n for n in self.prev[node].values() if n != NO_NODE}
+
+    def wire(self, qubit: int):
+        """Iterate over the nodes acting on a qubit, in circuit order."""
+        node = self.head[qubit] if qubit < self.n_qubits else NO_NODE
+        while node != NO_NODE:
+            yield node
+            node = self.next[node][qubit]
+
+
+def to_dag(self) -> CircuitDag:
+    return CircuitDag.from_circuit(self)
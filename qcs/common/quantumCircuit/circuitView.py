@@ -0,0 +1,105 @@
+from itertools import chain
+
+from .base import QuantumCircuit
+from .gateArray import gate_ops, NO_QUBIT
+from .metrics import MetricsCache
+
+
+class CircuitView:
+    """
+    Read-only window on a contiguous gate range of a circuit.
+
+    The view walks the storage of the circuit in place, nothing is copied.
+    With qubits set, only the gates acting on these qubits alone are seen.
+    The metrics, layering and writers of QuantumCircuit are shared (see
+    patch.py), indices such as first_t are relative to the view. The circuit
+    must not be edited while the view is in use.
+    """
+
+    def __init__(self, circuit: QuantumCircuit, start: int = 0, stop: int | None = None, qubits=None):
+        self.circuit: QuantumCircuit = circuit
+        # fold a pending qubit map once so that the stored gates carry their labels
+        self._stored: tuple = circuit._parts()
+        self.start, self.stop, _ = slice(start, stop).indices(sum(len(part) for part in self._stored))
+        self.stop = max(self.start, self.stop)
+        self.qubits: frozenset[int] | None = None if qubits is None else frozenset(qubits)
+        self.n_qubits: int = circuit.n_qubits
+        self._metrics: MetricsCache | None = None
+
+    @property
+    def is_compact(self) -> bool:
+        return self.circuit.is_compact
+
+    def _ranges(self):
+        """Yield (part, lo, hi) for the stored parts overlapping the view."""
+        offset = 0
+        for part in self._stored:
+            lo, hi = max(self.start - offset, 0), min(self.stop - offset, len(part))
+            if lo < hi:
+                yield part, lo, hi
+            offset += len(part)
+            if offset >= self.stop:
+                break
+
+    def _in_qubits(self, gate) -> bool:
+        return QuantumCircuit.deps_of(gate) <= self.qubits
+
+    def _parts(self) -> tuple:
+        parts = tuple(map(part.__getitem__, range(lo, hi)) for part, lo, hi in self._ranges())
+        if self.qubits is None:
+            return parts
+        return tuple(filter(self._in_qubits, part) for part in parts)
+
+    def iter_gates(self):
+        """Iterate over the stored gates (dicts or GateViews) of the view."""
+        return chain.from_iterable(self._parts())
+
+    def __iter__(self):
+        return self.iter_gates()
+
+    @property
+    def gates(self) -> list:
+        return list(self.iter_gates())
+
+    def iter_ops(self):
+        """Iterate over the gates as (opcode, ctrl1, ctrl2, target) tuples."""
+        ops = chain.from_iterable(
+            map(part.row, range(lo, hi)) if self.is_compact else map(gate_ops, map(part.__getitem__, range(lo, hi)))
+            for part, lo, hi in self._ranges()
+        )
+        if self.qubits is None:
+            return ops
+        qubits = self.qubits | {NO_QUBIT}
+        return (row for row in ops if row[1] in qubits and row[2] in qubits and row[3] in qubits)
+
+    def _cached_metrics(self) -> MetricsCache:
+        if self._metrics is None:
+            self._metrics = MetricsCache.from_ops(self.iter_ops())
+        return self._metrics
+
+    @property
+    def num_gates(self) -> int:
+        if self.qubits is None:
+            return self.stop - self.start
+        return self._cached_metrics().n_gates
+
+    def __len__(self) -> int:
+        return self.num_gates
+
+    def view(self, start: int = 0, stop: int | None = None, qubits=None) -> "CircuitView":
+        """A view on a sub-range of this one, relative to its start."""
+        assert self.qubits is None, "Cannot slice a view restricted to qubits"
+        start, stop, _ = slice(start, stop).indices(self.stop - self.start)
+        return CircuitView(self.circuit, self.start + start, self.start + max(start, stop), qubits)
+
+    def to_circuit(self) -> QuantumCircuit:
+        """Copy the gates of the view into a new circuit."""
+        circuit = QuantumCircuit(compact=self.is_compact)
+        circuit.n_qubits = self.n_qubits
+        for row in self.iter_ops():
+            circuit._add(*row)
+        return circuit
+
+
+def view(self, start: int = 0, stop: int | None = None, qubits=None) -> CircuitView:
+    return CircuitView(self, start, stop, qubits)
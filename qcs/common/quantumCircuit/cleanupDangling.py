@@ -1,7 +1,8 @@
 from .base import QuantumCircuit
+from .circuitDag import CircuitDag, NO_NODE
 
 def cleanup_dangling_hadamard(self) -> QuantumCircuit:
-    _circuit = QuantumCircuit()
+    _circuit = QuantumCircuit(compact=self.is_compact)
     _circuit.request_qubits(self.n_qubits)
     is_had: dict[int, bool] = {i: False for i in range(self.n_qubits)}
     for i, gate in enumerate(self.gates):
@@ -40,7 +41,7 @@ def apply_rule_based_rewriting(
             out.append(g[i])
             i += 1
 
-    new_circ = QuantumCircuit()
+    new_circ = QuantumCircuit(compact=circ.is_compact)
     new_circ.n_qubits = circ.n_qubits
     new_circ.gates = out
     return new_circ, applied
@@ -48,99 +49,108 @@ def apply_rule_based_rewriting(
 def commutes(g1: dict, g2: dict) -> bool:
     return QuantumCircuit.deps_of(g1).isdisjoint(QuantumCircuit.deps_of(g2))
 
-def cancel_double_x(g: list[dict], i: int) -> tuple[int, list[dict], bool]:
-    if g[i]["name"] != "X":
-        return 0, [], False
-
-    tgt = g[i]["target"]
-    commute_buffer = []
-    for j in range(i + 1, min(len(g), i + 10)):
-        gj = g[j]
-        if gj["name"] == "X" and gj["target"] == tgt:
-            # Can cancel with g[i]; drop both and preserve commuted gates
-            return j - i + 1, commute_buffer, True
-        elif commutes(g[i], gj):
-            commute_buffer.append(gj)
+def apply_dag_rewriting(
+    dag: CircuitDag,
+    rules: list[callable],
+) -> int:
+    applied = 0
+    node = dag.first
+    while node != NO_NODE:
+        before = dag.order_prev[node]
+        for rule in rules:
+            if rule(dag, node):
+                applied += 1
+                # the rule removed node, resume right after its old predecessor
+                node = dag.first if before == NO_NODE else dag.order_next[before]
+                break
         else:
-            break
-
-    return 0, [], False
+            node = dag.order_next[node]
+    return applied
+
+def _x_parity_until(dag: CircuitDag, node: int, qubit: int, stop: int) -> tuple[int, list[int]] | None:
+    # follow the wire from node to stop, allowing only X gates in between
+    xs = []
+    cur = dag.next_on(node, qubit)
+    while cur != stop:
+        if cur == NO_NODE or dag.gate(cur)["name"] != "X":
+            return None
+        xs.append(cur)
+        cur = dag.next_on(cur, qubit)
+    return len(xs) % 2, xs
+
+def cancel_double_x(dag: CircuitDag, node: int) -> bool:
+    gate = dag.gate(node)
+    if gate["name"] != "X":
+        return False
+
+    # every gate between the pair on the other qubits commutes with both
+    nxt = dag.next_on(node, gate["target"])
+    if nxt == NO_NODE or dag.gate(nxt)["name"] != "X":
+        return False
+    dag.remove(node)
+    dag.remove(nxt)
+    return True
+
+def toffoli_cancel_or_rewrite(dag: CircuitDag, node: int) -> bool:
+    a = dag.gate(node)
+    if a["name"] != "Tof":
+        return False
 
-def toffoli_cancel_or_rewrite(g: list[dict], i: int) -> tuple[int, list[dict], bool]:
-    if g[i]["name"] != "Tof":
-        return 0, [], False
-
-    a = g[i]
     ctrl1, ctrl2, tgt = a["ctrl1"], a["ctrl2"], a["target"]
-    deps = QuantumCircuit.deps_of(a)
-
-    x_on_ctrl1 = 0
-    x_on_ctrl2 = 0
-    junk = []
-    j = i + 1
-
-    while j < len(g):
-        gj = g[j]
-
-        if gj["name"] == "Tof":
-            if gj["ctrl1"] == ctrl1 and gj["ctrl2"] == ctrl2 and gj["target"] == tgt:
-                # Matching Toffoli found
-                if x_on_ctrl1 == 0 and x_on_ctrl2 == 0:
-                    return j - i + 1, junk, True
-                elif x_on_ctrl1 + x_on_ctrl2 == 1:
-                    ctrl = ctrl1 if x_on_ctrl1 == 1 else ctrl2
-                    return j - i + 1, junk + [
-                        {"name": "CNOT", "ctrl": ctrl, "target": tgt}, 
-                        {"name": "X", "target": ctrl},
-                    ], True
-                elif x_on_ctrl1 == 1 and x_on_ctrl2 == 1:
-                    return j - i + 1, junk + [
-                        {"name": "CNOT", "ctrl": ctrl1, "target": tgt},
-                        {"name": "X", "target": tgt},
-                        {"name": "CNOT", "ctrl": ctrl2, "target": tgt},
-                        {"name": "X", "target": ctrl1},
-                        {"name": "X", "target": ctrl2},
-                    ], True
-                else:
-                    break  # more than 2 Xs — undefined
-            else:
-                break  # incompatible Toffoli
-        elif QuantumCircuit.deps_of(gj).isdisjoint(deps):
-            junk.append(gj)
-            j += 1
-        elif gj["name"] == "X":
-            if gj["target"] == ctrl1:
-                x_on_ctrl1 ^= 1
-            elif gj["target"] == ctrl2:
-                x_on_ctrl2 ^= 1
-            j += 1
-        else:
-            break
-    return 0, [], False
-
-
-def cancel_double_toffoli(g: list[dict], i: int) -> tuple[int, list[dict], bool]:
-    if g[i]["name"] != "Tof":
-        return 0, [], False
-    deps_i = QuantumCircuit.deps_of(g[i])
-    ctrl_pair = {g[i]["ctrl1"], g[i]["ctrl2"]}
-    tgt = g[i]["target"]
-    j = i + 1
-    junk = []
-    while j < len(g):
-        gate_j = g[j]
-        if gate_j["name"] == "Tof":
-            if {gate_j["ctrl1"], gate_j["ctrl2"]} == ctrl_pair and gate_j["target"] == tgt:
-                return j - i + 1, junk, True
-            else:
-                break  # another Toffoli that interferes
-
-        if QuantumCircuit.deps_of(gate_j).isdisjoint(deps_i):
-            junk.append(gate_j)
-            j += 1
-        else:
-            break
-    return 0, [], False
+    nxt = dag.next_on(node, tgt)
+    if nxt == NO_NODE:
+        return False
+    b = dag.gate(nxt)
+    if b["name"] != "Tof" or b["ctrl1"] != ctrl1 or b["ctrl2"] != ctrl2 or b["target"] != tgt:
+        return False
+
+    # only X gates may sit between the pair on the control wires
+    on_ctrl1 = _x_parity_until(dag, node, ctrl1, nxt)
+    on_ctrl2 = _x_parity_until(dag, node, ctrl2, nxt)
+    if on_ctrl1 is None or on_ctrl2 is None:
+        return False
+    (x_on_ctrl1, xs1), (x_on_ctrl2, xs2) = on_ctrl1, on_ctrl2
+
+    if x_on_ctrl1 == 0 and x_on_ctrl2 == 0:
+        replacement = []
+    elif x_on_ctrl1 + x_on_ctrl2 == 1:
+        # Tof . X(c) . Tof leaves the other control on the target
+        ctrl, other = (ctrl1, ctrl2) if x_on_ctrl1 == 1 else (ctrl2, ctrl1)
+        replacement = [
+            {"name": "CNOT", "ctrl": other, "target": tgt},
+            {"name": "X", "target": ctrl},
+        ]
+    else:
+        replacement = [
+            {"name": "CNOT", "ctrl": ctrl1, "target": tgt},
+            {"name": "X", "target": tgt},
+            {"name": "CNOT", "ctrl": ctrl2, "target": tgt},
+            {"name": "X", "target": ctrl1},
+            {"name": "X", "target": ctrl2},
+        ]
+    for gate in replacement:
+        dag.insert_before(nxt, gate)
+    for x in xs1 + xs2 + [node, nxt]:
+        dag.remove(x)
+    return True
+
+def cancel_double_toffoli(dag: CircuitDag, node: int) -> bool:
+    a = dag.gate(node)
+    if a["name"] != "Tof":
+        return False
+    tgt = a["target"]
+    nxt = dag.next_on(node, tgt)
+    if nxt == NO_NODE:
+        return False
+    b = dag.gate(nxt)
+    if b["name"] != "Tof" or b["target"] != tgt or {b["ctrl1"], b["ctrl2"]} != {a["ctrl1"], a["ctrl2"]}:
+        return False
+    # the pair must be adjacent on the control wires as well
+    if dag.next_on(node, a["ctrl1"]) != nxt or dag.next_on(node, a["ctrl2"]) != nxt:
+        return False
+    dag.remove(node)
+    dag.remove(nxt)
+    return True
 
 def cleanup(circ: QuantumCircuit) -> QuantumCircuit:
     rules = [
@@ -149,7 +159,8 @@ def cleanup(circ: QuantumCircuit) -> QuantumCircuit:
         toffoli_cancel_or_rewrite
     ]
     circ = cleanup_dangling_hadamard(circ)
+    dag = CircuitDag.from_circuit(circ)
     while True:
-        circ, applied = apply_rule_based_rewriting(circ, rules)
+        applied = apply_dag_rewriting(dag, rules)
         if applied == 0:
-            return circ
+            return dag.to_circuit()
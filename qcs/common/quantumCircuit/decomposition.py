@@ -9,7 +9,7 @@ def add_mcx(self, cs: list[int], target: int, ps: list[bool] = [], clean: bool =
         self.add_toffoli(cs[0], cs[1], target, ps[0], ps[1], clean)
 
 def to_basic_gates(self) -> QuantumCircuit:
-    _circuit = QuantumCircuit()
+    _circuit = QuantumCircuit(compact=self.is_compact)
     _circuit.n_qubits = self.n_qubits
     for gate in self.gates:
         assert "name" in gate, f"Gate {gate} does not have a 'name' key"
@@ -0,0 +1,94 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .base import QuantumCircuit
+from .io import from_file
+
+FAST_TODD_PASSES: tuple[str, ...] = ("FastTMerge", "InternalHOpt", "FastTODD")
+
+
+class ExternalOptimizerError(RuntimeError):
+    """The external optimizer is missing, failed, timed out or wrote no circuit."""
+
+
+class ExternalOptimizer:
+    """
+    Driver of the quantum_circuit_optimization binary.
+
+    Every job runs in its own temporary directory, so any number of jobs can
+    share a working directory, and is killed after timeout seconds. Jobs
+    submitted to the driver run on a pool of at most max_workers concurrent
+    processes, kept for the lifetime of the driver.
+    """
+
+    def __init__(
+        self,
+        binary: str = "quantum_circuit_optimization",
+        passes: tuple[str, ...] = FAST_TODD_PASSES,
+        timeout: float | None = None,
+        max_workers: int | None = None,
+    ):
+        self.binary: str = binary
+        self.passes: tuple[str, ...] = tuple(passes)
+        self.timeout: float | None = timeout
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        self._executable: str | None = None
+        self._pool: ThreadPoolExecutor | None = None
+
+    def __enter__(self) -> "ExternalOptimizer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def executable(self) -> str:
+        """The resolved path of the binary, looked up once."""
+        if self._executable is None:
+            executable = shutil.which(self.binary)
+            if executable is None:
+                raise ExternalOptimizerError(f"Optimizer binary '{self.binary}' not found")
+            self._executable = executable
+        return self._executable
+
+    def run(self, circuit: QuantumCircuit) -> QuantumCircuit:
+        """Optimize circuit in the calling thread."""
+        executable = self.executable()
+        with tempfile.TemporaryDirectory(prefix="qcs_opt_") as directory:
+            with open(os.path.join(directory, "input.qc"), "w") as f:
+                circuit.write_qc(f)
+            try:
+                result = subprocess.run(
+                    [executable, *self.passes, "input.qc"],
+                    cwd=directory,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    timeout=self.timeout,
+                )
+            except subprocess.TimeoutExpired:
+                raise ExternalOptimizerError(f"{self.binary} timed out after {self.timeout} s") from None
+            if result.returncode != 0:
+                stderr = result.stderr.decode(errors="replace").strip()
+                raise ExternalOptimizerError(f"{self.binary} exited with code {result.returncode}: {stderr[-500:]}")
+            output = os.path.join(directory, "output.qc")
+            if not os.path.exists(output):
+                raise ExternalOptimizerError(f"{self.binary} wrote no output circuit")
+            return from_file(output, compact=circuit.is_compact)
+
+    def submit(self, circuit: QuantumCircuit) -> Future:
+        """Queue circuit on the pool, the future holds the optimized circuit or the error."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._pool.submit(self.run, circuit)
+
+    def map(self, circuits) -> list[QuantumCircuit]:
+        """Optimize all circuits concurrently, results are in input order, the first error is raised."""
+        futures = [self.submit(circuit) for circuit in circuits]
+        return [future.result() for future in futures]
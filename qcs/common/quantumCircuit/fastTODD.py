@@ -1,22 +1,72 @@
 from .base import QuantumCircuit
+from .externalOptimizer import ExternalOptimizer
 
-def fast_todd_optimize(self) -> QuantumCircuit:
-    import os
-    import subprocess
-    
-    qcfile = "tmp.qc"
-    qcfileout = "output.qc"
-    
-    qcstr = self.to_qc()
-    try:
-        open(qcfile, "w").write(qcstr)
-        subprocess.run("quantum_circuit_optimization FastTMerge InternalHOpt FastTODD {} > /dev/null".format(qcfile), shell=True, check=True)
-        _circuit = QuantumCircuit.from_file(qcfileout)
-        os.remove(qcfile)
-        os.remove(qcfileout)
-    except:
-        print("FastTODD optimization failed, using original circuit.")
-        print(qcstr)
-        return self.copy()
+FAST_TODD_ENGINES = ("python", "external")
+T_COUNT_OPTIMIZERS = ("FastTODD", "TOHPE")
+
+def _to_internal_h_opt_gates(circuit: QuantumCircuit) -> QuantumCircuit:
+    """Rewrite the gates internal_h_opt does not read: Tdg as T S Z, CZ as H CNOT H."""
+    _circuit = QuantumCircuit()
+    _circuit.n_qubits = circuit.n_qubits
+    for gate in circuit.gates:
+        name = gate["name"]
+        if name == "Tdg":
+            _circuit.add_t(gate["target"])
+            _circuit.add_s(gate["target"])
+            _circuit.add_z(gate["target"])
+        elif name == "CZ":
+            _circuit.add_h(gate["target"])
+            _circuit.add_cnot(gate["ctrl"], gate["target"])
+            _circuit.add_h(gate["target"])
+        else:
+            _circuit.add_gate(gate)
     return _circuit
 
+def t_count_optimize(self, optimizer: str = "FastTODD", max_workers: int = 1, seed: int | None = None) -> QuantumCircuit:
+    """
+    T-count optimization by InternalHOpt followed by optimizer, FastTODD or
+    TOHPE, on every Hadamard-free slice, in-process on qcs.tohpe. Without
+    FastTMerge and Hadamard gadgetization it is weaker than the external
+    pipeline of fast_todd_optimize.
+
+    max_workers and seed act as in fast_todd_optimize, so a seed returned by
+    best_of_n replays here with the same optimizer.
+    """
+    from ...tohpe import SlicedCircuit, internal_h_opt
+
+    if optimizer not in T_COUNT_OPTIMIZERS:
+        raise ValueError(f"Unknown optimizer '{optimizer}', expected one of {T_COUNT_OPTIMIZERS}")
+
+    _circuit = internal_h_opt(_to_internal_h_opt_gates(self))
+    _circuit = SlicedCircuit.from_circ(_circuit).t_opt(optimizer, max_workers, seed)
+    return _circuit.to_compact() if self.is_compact else _circuit
+
+_external_optimizer: ExternalOptimizer | None = None
+
+def _fast_todd_external(self) -> QuantumCircuit:
+    global _external_optimizer
+    if _external_optimizer is None:
+        _external_optimizer = ExternalOptimizer()
+    return _external_optimizer.run(self)
+
+def fast_todd_optimize(self, engine: str = "external", max_workers: int = 1, seed: int | None = None) -> QuantumCircuit:
+    """
+    T-count optimization by FastTMerge, InternalHOpt and FastTODD.
+
+    The default "external" engine calls the quantum_circuit_optimization
+    binary through an ExternalOptimizer and raises ExternalOptimizerError
+    when it fails. The opt-in "python" engine runs in-process on qcs.tohpe,
+    see t_count_optimize: it has no FastTMerge nor Hadamard gadgetization
+    and only runs FastTODD inside Hadamard-free slices, so it removes far
+    fewer T gates. With max_workers > 1 the python engine scores the
+    FastTODD candidates of large slices on that many processes, with the
+    same result. A seed randomizes the row order and the tie-breaking of
+    the python engine, the result only depends on the seed.
+    """
+    if engine == "python":
+        return t_count_optimize(self, "FastTODD", max_workers, seed)
+    if engine == "external":
+        if seed is not None:
+            raise ValueError("The external FastTODD engine cannot be seeded")
+        return _fast_todd_external(self)
+    raise ValueError(f"Unknown FastTODD engine '{engine}', expected one of {FAST_TODD_ENGINES}")
@@ -0,0 +1,139 @@
+import struct
+from hashlib import blake2b
+
+from .gateArray import OP_CZ, OP_TOF, OP_CCZ, NO_QUBIT
+
+# operands of equal role are interchangeable: all of CZ and CCZ, the controls of Tof
+_ROLES = {OP_CZ: (0, 0, 0), OP_TOF: (0, 0, 1), OP_CCZ: (0, 0, 0)}
+
+_PACK_HEADER = struct.Struct("<4si").pack
+_PACK_GATE = struct.Struct("<Biii").pack
+_FLUSH_SIZE = 1 << 16
+
+
+def _symmetric(op: int, ctrl1: int, ctrl2: int, target: int) -> tuple[int, int, int, int]:
+    """Sort the interchangeable operands of CZ, Tof and CCZ."""
+    if op == OP_CZ and ctrl1 > target:
+        return op, target, ctrl2, ctrl1
+    if op == OP_TOF and ctrl1 > ctrl2:
+        return op, ctrl2, ctrl1, target
+    if op == OP_CCZ:
+        return (op, *sorted((ctrl1, ctrl2, target)))
+    return op, ctrl1, ctrl2, target
+
+
+def _relabelled(row: tuple, mapping: dict[int, int]) -> tuple[int, int, int, int]:
+    op, c1, c2, t = row
+    for q in (c1, c2, t):
+        if q != NO_QUBIT and q not in mapping:
+            mapping[q] = len(mapping)
+    return op, mapping.get(c1, c1), mapping.get(c2, c2), mapping.get(t, t)
+
+
+def _canonical_ops(self, relabel: bool, commute: bool):
+    if not commute:
+        mapping: dict[int, int] = {}
+        for row in self.iter_ops():
+            yield _symmetric(*(_relabelled(row, mapping) if relabel else row))
+        return
+
+    # gates in the same ASAP layer act on disjoint qubits, so they commute
+    layers: dict[int, list] = {}
+    for row, layer in zip(self.iter_ops(), self.layering(record_layers=True).layers):
+        layers.setdefault(layer, []).append(row)
+    if not relabel:
+        for layer in sorted(layers):
+            yield from sorted(_symmetric(*row) for row in layers[layer])
+        return
+
+    # a qubit not labelled yet is ranked by its usage, the (layer, opcode,
+    # role) of every gate on it, which does not depend on the labels
+    usage: dict[int, list] = {}
+    for layer in sorted(layers):
+        for op, *qubits in layers[layer]:
+            for q, role in zip(qubits, _ROLES.get(op, (0, 1, 2))):
+                if q != NO_QUBIT:
+                    usage.setdefault(q, []).append((layer, op, role))
+
+    mapping: dict[int, int] = {}
+
+    def rank(q: int) -> tuple:
+        return (0, mapping[q]) if q in mapping else (1, usage.get(q, []))
+
+    for layer in sorted(layers):
+        rows = layers[layer]
+        rows.sort(key=lambda row: (row[0], sorted(rank(q) for q in row[1:])))
+        for op, *qubits in rows:
+            roles = _ROLES.get(op, (0, 1, 2))
+            for _, _, q in sorted((role, rank(q), q) for q, role in zip(qubits, roles) if q != NO_QUBIT):
+                mapping.setdefault(q, len(mapping))
+        yield from sorted(_symmetric(op, *(mapping.get(q, q) for q in qubits)) for op, *qubits in rows)
+
+
+def fingerprint(self, relabel: bool = False, commute: bool = False) -> str:
+    """
+    Stable 128-bit hash of the circuit, as a hex string.
+
+    The operands of CZ, CCZ and the controls of Tof are unordered. With
+    relabel, qubits are renamed in order of first appearance. With commute,
+    the gates of every ASAP layer are sorted, so reordering gates on
+    disjoint qubits keeps the fingerprint.
+
+    With both, qubits first seen in the same layer are ordered by how the
+    whole circuit uses them. This is best effort, not a canonical form:
+    qubits with the same usage but different neighbourhoods keep their input
+    order, so circuits equal up to relabelling may still get different
+    fingerprints.
+    """
+    digest = blake2b(digest_size=16)
+    digest.update(_PACK_HEADER(b"QCSF", self.n_qubits))
+    buffer = bytearray()
+    for row in _canonical_ops(self, relabel, commute):
+        buffer += _PACK_GATE(*row)
+        if len(buffer) >= _FLUSH_SIZE:
+            digest.update(buffer)
+            buffer.clear()
+    digest.update(buffer)
+    return digest.hexdigest()
+
+
+class GateHashes:
+    """
+    Polynomial prefix hashes of a gate sequence.
+
+    range_hash(start, stop) is O(1) and equal for equal gate ranges, wherever
+    they are, so passes can memoize work on repeated sub-circuits.
+    """
+
+    MOD: int = (1 << 61) - 1
+    BASE: int = 0x5BD1E995_9E3779B9 % MOD
+
+    def __init__(self, ops=()):
+        self.prefix: list[int] = [0]
+        self.powers: list[int] = [1]
+        for row in ops:
+            self.push(*row)
+
+    @staticmethod
+    def gate_value(op: int, ctrl1: int, ctrl2: int, target: int) -> int:
+        op, ctrl1, ctrl2, target = _symmetric(op, ctrl1, ctrl2, target)
+        return (op + 1) | (ctrl1 + 1) << 8 | (ctrl2 + 1) << 29 | (target + 1) << 50
+
+    def push(self, op: int, ctrl1: int, ctrl2: int, target: int) -> None:
+        value = GateHashes.gate_value(op, ctrl1, ctrl2, target) % GateHashes.MOD
+        self.prefix.append((self.prefix[-1] * GateHashes.BASE + value) % GateHashes.MOD)
+        self.powers.append(self.powers[-1] * GateHashes.BASE % GateHashes.MOD)
+
+    def __len__(self) -> int:
+        return len(self.prefix) - 1
+
+    def range_hash(self, start: int = 0, stop: int | None = None) -> int:
+        start, stop, _ = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        shifted = self.prefix[start] * self.powers[stop - start]
+        # the length is mixed in so that ranges of different sizes differ
+        return ((self.prefix[stop] - shifted) % GateHashes.MOD) ^ (stop - start) << 61
+
+
+def gate_hashes(self) -> GateHashes:
+    return GateHashes(self.iter_ops())
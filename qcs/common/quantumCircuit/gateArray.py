@@ -0,0 +1,244 @@
+from array import array
+from collections.abc import MutableMapping, MutableSequence
+
+# opcodes follow the order of ALL_AVAILABLE_GATES in base.py
+GATE_NAMES: tuple[str, ...] = ("CNOT", "CZ", "Tof", "HAD", "S", "T", "Tdg", "X", "Z", "CCZ")
+OPCODE_OF: dict[str, int] = {name: op for op, name in enumerate(GATE_NAMES)}
+
+OP_CNOT, OP_CZ, OP_TOF, OP_HAD, OP_S, OP_T, OP_TDG, OP_X, OP_Z, OP_CCZ = range(len(GATE_NAMES))
+
+# the dict keys of every opcode, in the order used by the gate dicts
+GATE_KEYS: tuple[tuple[str, ...], ...] = tuple(
+    ("name", "ctrl", "target") if name in ("CNOT", "CZ") else
+    ("name", "ctrl1", "ctrl2", "target") if name in ("Tof", "CCZ") else
+    ("name", "target")
+    for name in GATE_NAMES
+)
+
+NO_QUBIT: int = -1
+
+
+def gate_dict(op: int, ctrl1: int, ctrl2: int, target: int) -> dict:
+    """Build the classic dict representation of a gate from its columns."""
+    if op == OP_CNOT or op == OP_CZ:
+        return {"name": GATE_NAMES[op], "ctrl": ctrl1, "target": target}
+    if op == OP_TOF or op == OP_CCZ:
+        return {"name": GATE_NAMES[op], "ctrl1": ctrl1, "ctrl2": ctrl2, "target": target}
+    return {"name": GATE_NAMES[op], "target": target}
+
+
+def gate_ops(gate) -> tuple[int, int, int, int]:
+    """Encode a gate dict (or GateView) as (opcode, ctrl1, ctrl2, target)."""
+    if isinstance(gate, GateView):
+        return gate._array.row(gate._index)
+    name = gate["name"]
+    op = OPCODE_OF.get(name)
+    if op is None:
+        raise NotImplementedError(f"Unsupported gate: {name}")
+    if op == OP_CNOT or op == OP_CZ:
+        return op, gate["ctrl"], NO_QUBIT, gate["target"]
+    if op == OP_TOF or op == OP_CCZ:
+        return op, gate["ctrl1"], gate["ctrl2"], gate["target"]
+    return op, NO_QUBIT, NO_QUBIT, gate["target"]
+
+
+class GateView(MutableMapping):
+    """
+    A dict-like window on one row of a GateArray.
+
+    Reading and writing keys goes straight to the underlying columns, so code
+    written against the dict gates keeps working on the compact storage.
+    """
+
+    __slots__ = ("_array", "_index")
+
+    def __init__(self, gate_array: "GateArray", index: int):
+        self._array = gate_array
+        self._index = index
+
+    def _column(self, key: str):
+        if key == "ctrl" or key == "ctrl1":
+            return self._array.ctrl1
+        if key == "ctrl2":
+            return self._array.ctrl2
+        if key == "target":
+            return self._array.target
+        return None
+
+    def __getitem__(self, key: str):
+        op = self._array.ops[self._index]
+        if key not in GATE_KEYS[op]:
+            raise KeyError(key)
+        if key == "name":
+            return GATE_NAMES[op]
+        return self._column(key)[self._index]
+
+    def __setitem__(self, key: str, value) -> None:
+        op = self._array.ops[self._index]
+        if key == "name":
+            new_op = OPCODE_OF.get(value)
+            if new_op is None or GATE_KEYS[new_op][1:] != GATE_KEYS[op][1:]:
+                raise ValueError(f"Cannot rename {GATE_NAMES[op]} gate to {value}")
+            self._array._writable()
+            self._array.ops[self._index] = new_op
+            return
+        if key not in GATE_KEYS[op]:
+            raise KeyError(key)
+        self._array._writable()
+        self._column(key)[self._index] = value
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("Cannot remove a field from a compact gate")
+
+    def __iter__(self):
+        return iter(GATE_KEYS[self._array.ops[self._index]])
+
+    def __len__(self) -> int:
+        return len(GATE_KEYS[self._array.ops[self._index]])
+
+    def copy(self) -> dict:
+        return gate_dict(*self._array.row(self._index))
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+
+class GateArray(MutableSequence):
+    """
+    Columnar gate storage: parallel int arrays for opcode, ctrl1, ctrl2 and target.
+
+    Two-qubit gates keep their control in ctrl1, unused operands are NO_QUBIT.
+    Indexing returns GateView objects, slicing returns a new GateArray.
+    """
+
+    __slots__ = ("ops", "ctrl1", "ctrl2", "target")
+
+    def __init__(self, gates=()):
+        self.ops = array("B")
+        self.ctrl1 = array("i")
+        self.ctrl2 = array("i")
+        self.target = array("i")
+        self.extend(gates)
+
+    @staticmethod
+    def from_columns(ops, ctrl1, ctrl2, target) -> "GateArray":
+        """Wrap existing columns (arrays or read-only memoryviews) without copying."""
+        assert len(ops) == len(ctrl1) == len(ctrl2) == len(target), "Column lengths differ"
+        gate_array = GateArray()
+        gate_array.ops, gate_array.ctrl1, gate_array.ctrl2, gate_array.target = ops, ctrl1, ctrl2, target
+        return gate_array
+
+    def _writable(self) -> None:
+        if not isinstance(self.ops, array):
+            # columns borrowed from a read-only buffer are copied on first write
+            self.ops = array("B", self.ops)
+            self.ctrl1 = array("i", self.ctrl1)
+            self.ctrl2 = array("i", self.ctrl2)
+            self.target = array("i", self.target)
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return GateArray.from_columns(
+                array("B", self.ops[index]),
+                array("i", self.ctrl1[index]),
+                array("i", self.ctrl2[index]),
+                array("i", self.target[index]),
+            )
+        if index < 0:
+            index += len(self.ops)
+        if not 0 <= index < len(self.ops):
+            raise IndexError("gate index out of range")
+        return GateView(self, index)
+
+    def __setitem__(self, index, gate) -> None:
+        if isinstance(index, slice):
+            gates = GateArray(gate)
+            self._writable()
+            self.ops[index] = gates.ops
+            self.ctrl1[index] = gates.ctrl1
+            self.ctrl2[index] = gates.ctrl2
+            self.target[index] = gates.target
+            return
+        op, c1, c2, t = gate_ops(gate)
+        self._writable()
+        self.ops[index], self.ctrl1[index], self.ctrl2[index], self.target[index] = op, c1, c2, t
+
+    def __delitem__(self, index) -> None:
+        self._writable()
+        del self.ops[index]
+        del self.ctrl1[index]
+        del self.ctrl2[index]
+        del self.target[index]
+
+    def __iter__(self):
+        for i in range(len(self.ops)):
+            yield GateView(self, i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, GateArray):
+            return list(self.iter_ops()) == list(other.iter_ops())
+        if isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def insert(self, index: int, gate) -> None:
+        op, c1, c2, t = gate_ops(gate)
+        self._writable()
+        self.ops.insert(index, op)
+        self.ctrl1.insert(index, c1)
+        self.ctrl2.insert(index, c2)
+        self.target.insert(index, t)
+
+    def append(self, gate) -> None:
+        self.append_op(*gate_ops(gate))
+
+    def append_op(self, op: int, ctrl1: int, ctrl2: int, target: int) -> None:
+        self._writable()
+        self.ops.append(op)
+        self.ctrl1.append(ctrl1)
+        self.ctrl2.append(ctrl2)
+        self.target.append(target)
+
+    def extend(self, gates) -> None:
+        if isinstance(gates, GateArray):
+            self._writable()
+            self.ops.extend(gates.ops)
+            self.ctrl1.extend(gates.ctrl1)
+            self.ctrl2.extend(gates.ctrl2)
+            self.target.extend(gates.target)
+            return
+        for gate in gates:
+            self.append_op(*gate_ops(gate))
+
+    def row(self, index: int) -> tuple[int, int, int, int]:
+        return self.ops[index], self.ctrl1[index], self.ctrl2[index], self.target[index]
+
+    def iter_ops(self):
+        """Iterate over (opcode, ctrl1, ctrl2, target) tuples."""
+        return zip(self.ops, self.ctrl1, self.ctrl2, self.target)
+
+    def copy(self) -> "GateArray":
+        return GateArray.from_columns(
+            array("B", self.ops), array("i", self.ctrl1), array("i", self.ctrl2), array("i", self.target)
+        )
+
+    def __reduce__(self):
+        # memory-mapped columns cannot be pickled, they are sent as arrays
+        columns = self.copy()
+        return GateArray.from_columns, (columns.ops, columns.ctrl1, columns.ctrl2, columns.target)
+
+    def __deepcopy__(self, memo) -> "GateArray":
+        return self.copy()
+
+    def to_list(self) -> list[dict]:
+        return [gate_dict(*row) for row in self.iter_ops()]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(col) * col.itemsize for col in (self.ops, self.ctrl1, self.ctrl2, self.target))
+
+    def __repr__(self) -> str:
+        return f"GateArray({self.to_list()!r})"
@@ -6,67 +6,64 @@ def hadamard_gadgetization(self, allow_mapping: bool = False) -> QuantumCircuit:
     else:
         return hadamard_gadgetization_no_mapping(self)
 
-def hadamard_gadgetization_no_mapping(self) -> QuantumCircuit:
-    initial_circuit = QuantumCircuit()
-    initial_circuit.n_qubits = self.n_qubits
-    
-    internal_circuit = QuantumCircuit()
-    internal_circuit.n_qubits = self.n_qubits
+def _internal_hadamards(self) -> list[int]:
+    """Indices of the Hadamard gates between the first and the last T gate."""
     flag = False
     last = max((i for i, gate in enumerate(self.gates) if gate["name"] == "T"), default=0)
+    indices = []
     for i, gate in enumerate(self.gates):
         if gate["name"] == "T": flag = True
         if gate["name"] == "HAD" and flag and i < last:
-            target = gate["target"]
-            _anc = internal_circuit.request_qubit()
-            
-            initial_circuit.add_gate({"name": "HAD", "target": _anc})
-            internal_circuit.add_gate({"name": "S", "target": _anc})
-            internal_circuit.add_gate({"name": "S", "target": target})
-            internal_circuit.add_gate({"name": "CNOT", "ctrl": target, "target": _anc})
-            internal_circuit.add_gate({"name": "S", "target": target})
-            internal_circuit.add_gate({"name": "Z", "target": target})
-            internal_circuit.add_gate({"name": "CNOT", "ctrl": _anc, "target": target})
-            internal_circuit.add_gate({"name": "CNOT", "ctrl": target, "target": _anc})
-        else:
-            internal_circuit.add_gate(gate)
-            
-    initial_circuit.append(internal_circuit)
-    return initial_circuit
+            indices.append(i)
+    return indices
+
+def hadamard_gadgetization_no_mapping(self) -> QuantumCircuit:
+    internal = _internal_hadamards(self)
+
+    # the ancillas are known upfront, so their initial Hadamard gates are
+    # added first and the rest is written once, with no second circuit to append
+    _circuit = QuantumCircuit(compact=self.is_compact)
+    _circuit.n_qubits = self.n_qubits
+    ancillas = _circuit.request_qubits(len(internal))
+    for _anc in ancillas:
+        _circuit.add_gate({"name": "HAD", "target": _anc})
+
+    start = 0
+    for i, _anc in zip(internal, ancillas):
+        for gate in self.view(start, i):
+            _circuit.add_gate(gate)
+        target = self.gates[i]["target"]
+        _circuit.add_gate({"name": "S", "target": _anc})
+        _circuit.add_gate({"name": "S", "target": target})
+        _circuit.add_gate({"name": "CNOT", "ctrl": target, "target": _anc})
+        _circuit.add_gate({"name": "S", "target": target})
+        _circuit.add_gate({"name": "Z", "target": target})
+        _circuit.add_gate({"name": "CNOT", "ctrl": _anc, "target": target})
+        _circuit.add_gate({"name": "CNOT", "ctrl": target, "target": _anc})
+        start = i + 1
+    for gate in self.view(start):
+        _circuit.add_gate(gate)
+    return _circuit
 
 def hadamard_gadgetization_mapping(self) -> 'QuantumCircuit':
     """
     This method allows the hadamard gadgetization with qubit mapping.
     However, the CZ introduced by the gadgetization still requires a Hadamard gate
     """
-    _circuit = QuantumCircuit()
-    _old_to_new: dict[int, int] = {}
-    for i in range(self.n_qubits):
-        _old_to_new[i] = _circuit.request_qubit()
-        
-    def mapped_gate(gate: dict) -> dict:
-        new_gate = gate.copy()
-        if "ctrl" in gate:
-            new_gate["ctrl"] = _old_to_new[gate["ctrl"]]
-        if "target" in gate:
-            new_gate["target"] = _old_to_new[gate["target"]]
-        if "ctrl1" in gate:
-            new_gate["ctrl1"] = _old_to_new[gate["ctrl1"]]
-        if "ctrl2" in gate:
-            new_gate["ctrl2"] = _old_to_new[gate["ctrl2"]]
-        return new_gate
-        
-    flag = False
-    last = max((i for i, gate in enumerate(self.gates) if gate["name"] == "T"), default=0)
+    _circuit = QuantumCircuit(compact=self.is_compact)
+    _circuit.request_qubits(self.n_qubits)
+
+    internal = set(_internal_hadamards(self))
     for i, gate in enumerate(self.gates):
-        if gate["name"] == "T": flag = True
-        if gate["name"] == "HAD" and flag and i < last:
+        if i in internal:
             target = gate["target"]
             _anc = _circuit.request_qubit()
             _circuit.add_gate({"name": "HAD", "target": _anc})
-            _circuit.add_gate({"name": "CZ", "ctrl": _old_to_new[target], "target": _anc})
-            _old_to_new[target] = _anc
+            _circuit.add_gate({"name": "CZ", "ctrl": target, "target": _anc})
+            # the rest of the qubit continues on the ancilla
+            _circuit.redirect_qubit(target, _anc)
         else:
-            _mapped_gate = mapped_gate(gate)
-            _circuit.add_gate(_mapped_gate)
+            _circuit.add_gate(gate)
+    for i in range(self.n_qubits):
+        _circuit.redirect_qubit(i, i)
     return _circuit
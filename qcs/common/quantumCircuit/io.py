@@ -1,8 +1,15 @@
+import os
+from io import BufferedIOBase, RawIOBase, StringIO
+from itertools import islice
+
 from .base import QuantumCircuit
-import pyzx as zx
+from .gateArray import OP_CNOT, OP_CZ, OP_TOF, OP_HAD, OP_S, OP_T, OP_TDG, OP_X, OP_Z, GATE_NAMES
+from .qcReader import QcReader
+from .qasmReader import QasmReader
+from .binaryFormat import load_binary
 
-def from_zx_circuit(qc) -> 'QuantumCircuit':
-    circuit = QuantumCircuit()
+def from_zx_circuit(qc, compact: bool = False) -> 'QuantumCircuit':
+    circuit = QuantumCircuit(compact=compact)
     circuit.request_qubits(qc.qubits)
     for gate in qc.gates:
         if gate.name == "Tof":
@@ -25,23 +32,53 @@ def from_zx_circuit(qc) -> 'QuantumCircuit':
             circuit.add_h(gate.target)
         elif gate.name == "S":
             circuit.add_s(gate.target)
+            if getattr(gate, "adjoint", False):
+                circuit.add_z(gate.target)
         elif gate.name == "T":
-            circuit.add_t(gate.target)
+            if getattr(gate, "adjoint", False):
+                circuit.add_tdg(gate.target)
+            else:
+                circuit.add_t(gate.target)
         elif gate.name == "Tdg":
             circuit.add_tdg(gate.target)
         else:
             raise NotImplementedError(f"Unsupported gate: \"{gate.name}\"")
     return circuit
 
+def from_reader(reader, compact: bool = False) -> 'QuantumCircuit':
+    """Fill a circuit from a QcReader or QasmReader."""
+    circuit = QuantumCircuit(compact=compact)
+    circuit.n_qubits = reader.n_qubits
+    for row in reader:
+        circuit._add(*row)
+    # the ancillas of multi-controlled gates are only known at the end
+    circuit.n_qubits = reader.n_qubits
+    return circuit
+
 @staticmethod
-def from_file(filename: str) -> 'QuantumCircuit':
+def from_file(filename: str | os.PathLike, compact: bool = False) -> 'QuantumCircuit':
+    filename = os.fspath(filename)
+    if filename.endswith(".qc"):
+        with open(filename) as f:
+            return from_reader(QcReader(f), compact)
+    if filename.endswith(".qcsb"):
+        circuit = load_binary(filename)
+        return circuit if compact else circuit.to_expanded()
+    if filename.endswith(".qasm"):
+        with open(filename) as f:
+            # statements span lines freely, so the file is read in blocks
+            return from_reader(QasmReader(iter(lambda: f.read(1 << 16), "")), compact)
+    import pyzx as zx
     qc = zx.Circuit.load(filename)
-    return from_zx_circuit(qc)
+    return from_zx_circuit(qc, compact)
+
+@staticmethod
+def from_qc(qc: str, compact: bool = False) -> 'QuantumCircuit':
+    return from_reader(QcReader(qc.splitlines()), compact)
 
 @staticmethod
-def from_qasm(qasm: str) -> 'QuantumCircuit':
-    qc = zx.Circuit.from_qasm(qasm)
-    return from_zx_circuit(qc)
+def from_qasm(qasm: str, compact: bool = False) -> 'QuantumCircuit':
+    return from_reader(QasmReader([qasm]), compact)
 
 @staticmethod
 def from_truth_table(truth_table: list[str], n: int, m: int, use_gray_code: bool = True) -> 'QuantumCircuit':
@@ -79,66 +116,114 @@ def from_truth_table(truth_table: list[str], n: int, m: int, use_gray_code: bool
     return qc
 
 
+# one line template per opcode, formatted with the (opcode, ctrl1, ctrl2, target) row
+QC_TEMPLATES: dict[int, str] = {
+    OP_TOF: "tof q{1} q{2} q{3}\n",
+    OP_CNOT: "tof q{1} q{3}\n",
+    OP_CZ: "Z q{1} q{3}\n",
+    OP_X: "X q{3}\n",
+    OP_HAD: "H q{3}\n",
+    OP_S: "S q{3}\n",
+    OP_T: "T q{3}\n",
+    OP_Z: "Z q{3}\n",
+    OP_TDG: "T q{3}\nS q{3}\nZ q{3}\n",
+}
+
+def _qc_gate_lines(q: list[str]) -> dict:
+    """The line of every gate name, formatted straight from the gate dict with the qubit labels q."""
+    return {
+        "Tof": lambda g: f"tof {q[g['ctrl1']]} {q[g['ctrl2']]} {q[g['target']]}\n",
+        "CNOT": lambda g: f"tof {q[g['ctrl']]} {q[g['target']]}\n",
+        "CZ": lambda g: f"Z {q[g['ctrl']]} {q[g['target']]}\n",
+        "X": lambda g: f"X {q[g['target']]}\n",
+        "HAD": lambda g: f"H {q[g['target']]}\n",
+        "S": lambda g: f"S {q[g['target']]}\n",
+        "T": lambda g: f"T {q[g['target']]}\n",
+        "Z": lambda g: f"Z {q[g['target']]}\n",
+        "Tdg": lambda g: f"T {q[g['target']]}\nS {q[g['target']]}\nZ {q[g['target']]}\n",
+    }
+
+def _format_batches(circuit, templates: dict[int, str], gate_lines: dict):
+    """
+    Yield the lines of the circuit in batches of 4096 gates. Compact circuits
+    fill the opcode templates, list-backed ones format their gate dicts with
+    the name-keyed gate_lines.
+    """
+    if circuit.is_compact:
+        formats = {op: template.format for op, template in templates.items()}
+        rows = circuit.iter_ops()
+        while batch := list(islice(rows, 4096)):
+            try:
+                yield "".join([formats[row[0]](*row) for row in batch])
+            except KeyError as e:
+                raise NotImplementedError(f"Unsupported gate: {GATE_NAMES[e.args[0]]}") from None
+        return
+    for part in circuit._parts():
+        for i in range(0, len(part), 4096):
+            try:
+                lines = "".join([gate_lines[gate["name"]](gate) for gate in part[i:i + 4096]])
+            except KeyError as e:
+                raise NotImplementedError(f"Unsupported gate: {e.args[0]}") from None
+            yield lines
+
+def _write_lines(f, header: str, batches, footer: str = "") -> None:
+    """Write header, batches and footer to a text or binary handle."""
+    binary = isinstance(f, (RawIOBase, BufferedIOBase)) or "b" in getattr(f, "mode", "")
+    write = (lambda text: f.write(text.encode())) if binary else f.write
+    write(header)
+    for batch in batches:
+        write(batch)
+    write(footer)
+
+def write_qc(self, f, inputs: list = []) -> None:
+    """Stream the circuit in the .qc format to a text or binary file handle."""
+    qubits = " ".join(f"q{i}" for i in range(self.n_qubits))
+    header = f".v {qubits}\n.i {' '.join(inputs) if inputs else qubits}\n\nBEGIN\n\n"
+    gate_lines = _qc_gate_lines([f"q{i}" for i in range(self.n_qubits)])
+    _write_lines(f, header, _format_batches(self, QC_TEMPLATES, gate_lines), "\nEND\n")
+
 def to_qc(self, inputs: list = []) -> str:
-    qubits = [f"q{i}" for i in range(self.n_qubits)]
-
-    qc_str = f".v {' '.join(qubits)}\n"
-    qc_str += f".i {' '.join(inputs) if inputs else ' '.join(qubits)}\n\n"
-    qc_str += "BEGIN\n\n"
-
-    for gate in self.gates:
-        name = gate["name"]
-        if name == "Tof":
-            qc_str += f"tof {qubits[gate['ctrl1']]} {qubits[gate['ctrl2']]} {qubits[gate['target']]}\n"
-        elif name == "CNOT":
-            qc_str += f"tof {qubits[gate['ctrl']]} {qubits[gate['target']]}\n"
-        elif name == "CZ":
-            qc_str += f"Z {qubits[gate['ctrl']]} {qubits[gate['target']]}\n"
-        elif name == "X":
-            qc_str += f"X {qubits[gate['target']]}\n"
-        elif name == "HAD":
-            qc_str += f"H {qubits[gate['target']]}\n"
-        elif name == "S":
-            qc_str += f"S {qubits[gate['target']]}\n"
-        elif name == "T":
-            qc_str += f"T {qubits[gate['target']]}\n"
-        elif name == "Z":
-            qc_str += f"Z {qubits[gate['target']]}\n"
-        elif name == "Tdg":
-            qc_str += f"T {qubits[gate['target']]}\n"
-            qc_str += f"S {qubits[gate['target']]}\n"
-            qc_str += f"Z {qubits[gate['target']]}\n"
-        else:
-            raise NotImplementedError(f"Unsupported gate: {name}")
-    qc_str += "\nEND\n"
-    return qc_str
+    buffer = StringIO()
+    write_qc(self, buffer, inputs)
+    return buffer.getvalue()
 
 def to_json(self) -> dict:
-    return self.gates
+    return self.gates.to_list() if self.is_compact else self.gates
+
+# one line template per opcode, formatted with the (opcode, ctrl1, ctrl2, target) row
+QASM_TEMPLATES: dict[int, str] = {
+    OP_TOF: "ccx q[{1}], q[{2}], q[{3}];\n",
+    OP_CNOT: "cx q[{1}], q[{3}];\n",
+    OP_CZ: "cz q[{1}], q[{3}];\n",
+    OP_X: "x q[{3}];\n",
+    OP_Z: "z q[{3}];\n",
+    OP_HAD: "h q[{3}];\n",
+    OP_S: "s q[{3}];\n",
+    OP_T: "t q[{3}];\n",
+    OP_TDG: "tdg q[{3}];\n",
+}
+
+def _qasm_gate_lines(q: list[str]) -> dict:
+    """The line of every gate name, formatted straight from the gate dict with the qubit labels q."""
+    return {
+        "Tof": lambda g: f"ccx {q[g['ctrl1']]}, {q[g['ctrl2']]}, {q[g['target']]};\n",
+        "CNOT": lambda g: f"cx {q[g['ctrl']]}, {q[g['target']]};\n",
+        "CZ": lambda g: f"cz {q[g['ctrl']]}, {q[g['target']]};\n",
+        "X": lambda g: f"x {q[g['target']]};\n",
+        "Z": lambda g: f"z {q[g['target']]};\n",
+        "HAD": lambda g: f"h {q[g['target']]};\n",
+        "S": lambda g: f"s {q[g['target']]};\n",
+        "T": lambda g: f"t {q[g['target']]};\n",
+        "Tdg": lambda g: f"tdg {q[g['target']]};\n",
+    }
+
+def write_qasm(self, f) -> None:
+    """Stream the circuit as OpenQASM 2.0 to a text or binary file handle."""
+    header = f'OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[{self.n_qubits}];\n'
+    gate_lines = _qasm_gate_lines([f"q[{i}]" for i in range(self.n_qubits)])
+    _write_lines(f, header, _format_batches(self, QASM_TEMPLATES, gate_lines))
 
 def to_qasm(self) -> str:
-    qasm_str: str = "OPENQASM 2.0;\n"
-    qasm_str += f'include "qelib1.inc";\n'
-    qasm_str += f"qreg q[{self.n_qubits}];\n"
-    for gate in self.gates:
-        if gate["name"] == "Tof":
-            qasm_str += f"ccx q[{gate['ctrl1']}], q[{gate['ctrl2']}], q[{gate['target']}];\n"
-        elif gate["name"] == "CNOT":
-            qasm_str += f"cx q[{gate['ctrl']}], q[{gate['target']}];\n"
-        elif gate["name"] == "CZ":
-            qasm_str += f"cz q[{gate['ctrl']}], q[{gate['target']}];\n"
-        elif gate["name"] == "X":
-            qasm_str += f"x q[{gate['target']}];\n"
-        elif gate["name"] == "Z":
-            qasm_str += f"z q[{gate['target']}];\n"
-        elif gate["name"] == "HAD":
-            qasm_str += f"h q[{gate['target']}];\n"
-        elif gate["name"] == "S":
-            qasm_str += f"s q[{gate['target']}];\n"
-        elif gate["name"] == "T":
-            qasm_str += f"t q[{gate['target']}];\n"
-        elif gate["name"] == "Tdg":
-            qasm_str += f"tdg q[{gate['target']}];\n"
-        else:
-            raise NotImplementedError(f"Unsupported gate: {gate['name']}")
-    return qasm_str
\ No newline at end of file
+    buffer = StringIO()
+    write_qasm(self, buffer)
+    return buffer.getvalue()
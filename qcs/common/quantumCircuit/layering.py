@@ -0,0 +1,73 @@
+from itertools import chain
+
+from .base import QuantumCircuit
+
+
+class Layering:
+    """
+    As-soon-as-possible layering of a gate sequence.
+
+    Every qubit keeps three frontiers: the last layer touching it, and the
+    number of T and CNOT/CZ layers on the longest path ending at it. A gate
+    synchronizes the frontiers of all its qubits, so depth, T-depth and CNOT
+    depth are critical-path lengths rather than per-qubit gate counts.
+    """
+
+    def __init__(self, n_qubits: int = 0, record_layers: bool = False):
+        self.frontier: list[int] = [0] * n_qubits
+        self.t_frontier: list[int] = [0] * n_qubits
+        self.cnot_frontier: list[int] = [0] * n_qubits
+        self.depth: int = 0
+        self.t_depth: int = 0
+        self.cnot_depth: int = 0
+        # the layer of every pushed gate, starting at 0
+        self.layers: list[int] | None = [] if record_layers else None
+
+    def push(self, gate: dict) -> int:
+        deps = QuantumCircuit.deps_of(gate)
+        top = max(deps)
+        if top >= len(self.frontier):
+            grow = [0] * (top + 1 - len(self.frontier))
+            self.frontier += grow
+            self.t_frontier += grow
+            self.cnot_frontier += grow
+
+        layer = max(self.frontier[q] for q in deps) + 1
+        t_layer = max(self.t_frontier[q] for q in deps) + (gate["name"] in ("T", "Tdg"))
+        cnot_layer = max(self.cnot_frontier[q] for q in deps) + (gate["name"] in ("CNOT", "CZ"))
+        for q in deps:
+            self.frontier[q] = layer
+            self.t_frontier[q] = t_layer
+            self.cnot_frontier[q] = cnot_layer
+
+        self.depth = max(self.depth, layer)
+        self.t_depth = max(self.t_depth, t_layer)
+        self.cnot_depth = max(self.cnot_depth, cnot_layer)
+        if self.layers is not None:
+            self.layers.append(layer - 1)
+        return layer - 1
+
+
+def layering(self, record_layers: bool = False) -> Layering:
+    result = Layering(self.n_qubits, record_layers)
+    for gate in chain.from_iterable(self._parts()):
+        result.push(gate)
+    return result
+
+def _cached_layering(self) -> Layering:
+    metrics = self._cached_metrics()
+    if metrics.layering is None:
+        metrics.layering = layering(self)
+    return metrics.layering
+
+@property
+def depth(self) -> int:
+    return _cached_layering(self).depth
+
+@property
+def t_depth(self) -> int:
+    return _cached_layering(self).t_depth
+
+@property
+def cnot_depth(self) -> int:
+    return _cached_layering(self).cnot_depth
@@ -1,38 +1,124 @@
+from .gateArray import OP_CNOT, OP_CZ, OP_HAD, OP_T, OP_TDG, GATE_NAMES
+
+
+class MetricsCache:
+    """
+    Gate counters of a circuit, updated by every gate appended to it.
+
+    The Hadamard gates before the first and after the last T gate are
+    tallied separately so that num_internal_h is a subtraction.
+    """
+
+    __slots__ = ("n_gates", "op_counts", "first_t", "last_t", "h_before_t", "h_after_t", "t_per_qubit", "layering")
+
+    def __init__(self):
+        self.n_gates: int = 0
+        self.op_counts: list[int] = [0] * len(GATE_NAMES)
+        self.first_t: int | None = None
+        self.last_t: int = 0
+        self.h_before_t: int = 0
+        self.h_after_t: int = 0
+        self.t_per_qubit: dict[int, int] = {}
+        # depth metrics are computed on demand and dropped on every change
+        self.layering = None
+
+    @staticmethod
+    def from_ops(ops) -> "MetricsCache":
+        cache = MetricsCache()
+        for op, _, _, target in ops:
+            cache.push(op, target)
+        return cache
+
+    def push(self, op: int, target: int) -> None:
+        index = self.n_gates
+        self.n_gates += 1
+        self.layering = None
+        self.op_counts[op] += 1
+        if op == OP_T or op == OP_TDG:
+            if self.first_t is None:
+                self.first_t = index
+            self.last_t = index + 1
+            self.h_after_t = 0
+            self.t_per_qubit[target] = self.t_per_qubit.get(target, 0) + 1
+        elif op == OP_HAD:
+            if self.first_t is None:
+                self.h_before_t += 1
+            else:
+                self.h_after_t += 1
+
+    def merge(self, other: "MetricsCache") -> None:
+        """Account for the gates of other appended after the current ones."""
+        offset = self.n_gates
+        self.n_gates += other.n_gates
+        self.layering = None
+        self.op_counts = [a + b for a, b in zip(self.op_counts, other.op_counts)]
+        if other.first_t is None:
+            if self.first_t is None:
+                self.h_before_t += other.h_before_t
+            else:
+                self.h_after_t += other.h_before_t
+        else:
+            if self.first_t is None:
+                self.first_t = offset + other.first_t
+                self.h_before_t += other.h_before_t
+            self.last_t = offset + other.last_t
+            self.h_after_t = other.h_after_t
+        for qubit, count in other.t_per_qubit.items():
+            self.t_per_qubit[qubit] = self.t_per_qubit.get(qubit, 0) + count
+
+    def relabel(self, mapping: dict[int, int]) -> None:
+        t_per_qubit: dict[int, int] = {}
+        for qubit, count in self.t_per_qubit.items():
+            qubit = mapping.get(qubit, qubit)
+            t_per_qubit[qubit] = t_per_qubit.get(qubit, 0) + count
+        self.t_per_qubit = t_per_qubit
+        self.layering = None
+
+    def copy(self) -> "MetricsCache":
+        cache = MetricsCache()
+        cache.n_gates, cache.first_t, cache.last_t = self.n_gates, self.first_t, self.last_t
+        cache.h_before_t, cache.h_after_t = self.h_before_t, self.h_after_t
+        cache.op_counts, cache.t_per_qubit = self.op_counts[:], self.t_per_qubit.copy()
+        cache.layering = self.layering
+        return cache
+
+    @property
+    def num_t(self) -> int:
+        return self.op_counts[OP_T] + self.op_counts[OP_TDG]
+
+
 @property
 def num_t(self) -> int:
-    return sum(1 for gate in self.gates if gate["name"] in ["T", "Tdg"])
+    return self._cached_metrics().num_t
 
 @property
 def num_gates(self) -> int:
-    return len(self.gates)
+    return sum(len(part) for part in self._stored_parts())
 
 @property
 def num_2q(self) -> int:
-    return sum(1 for gate in self.gates if gate["name"] in ["CNOT", "CZ"])
+    counts = self._cached_metrics().op_counts
+    return counts[OP_CNOT] + counts[OP_CZ]
 
 @property
 def num_internal_h(self) -> int:
-    first_t: int = next((i for i, gate in enumerate(self.gates) if gate["name"] in ["T", "Tdg"]), len(self.gates))
-    last_t: int = len(self.gates) - next((i for i, gate in enumerate(reversed(self.gates)) if gate["name"] in ["T", "Tdg"]), len(self.gates)) if self.num_t > 0 else 0
-    return sum(1 for i, gate in enumerate(self.gates) if gate["name"] == "HAD" and first_t <= i < last_t)
+    metrics = self._cached_metrics()
+    if metrics.first_t is None:
+        return 0
+    return metrics.op_counts[OP_HAD] - metrics.h_before_t - metrics.h_after_t
 
 @property
 def num_h(self) -> int:
-    return sum(1 for gate in self.gates if gate["name"] == "HAD")
+    return self._cached_metrics().op_counts[OP_HAD]
 
 @property
 def first_t(self) -> int:
-    return next((i for i, gate in enumerate(self.gates) if gate["name"] in ["T", "Tdg"]), len(self.gates))
+    metrics = self._cached_metrics()
+    return metrics.n_gates if metrics.first_t is None else metrics.first_t
 
 @property
 def last_t(self) -> int:
-    return len(self.gates) - next((i for i, gate in enumerate(reversed(self.gates)) if gate["name"] in ["T", "Tdg"]), len(self.gates)) if self.num_t > 0 else 0
+    return self._cached_metrics().last_t
 
 def t_depth_of(self, qubit: int) -> int:
-    return sum(1 for gate in self.gates if gate["name"] in ["T", "Tdg"] and gate.get("target") == qubit)
-
-@property
-def t_depth(self) -> int:
-    if self.num_t == 0:
-        return 0
-    return max(self.t_depth_of(i) for i in range(self.n_qubits))
+    return self._cached_metrics().t_per_qubit.get(qubit, 0)
@@ -0,0 +1,81 @@
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from .base import QuantumCircuit
+from .fastTODD import T_COUNT_OPTIMIZERS, t_count_optimize
+
+MULTI_START_OPTIMIZERS = T_COUNT_OPTIMIZERS
+
+
+def _run_start(circuit: QuantumCircuit, optimizer: str, seed: int | None) -> QuantumCircuit:
+    return t_count_optimize(circuit, optimizer, seed=seed)
+
+
+def multi_start_seeds(seed: int, n_starts: int) -> list[int | None]:
+    """The seeds of the starts of best_of_n, None for the deterministic start 0."""
+    spawned = np.random.SeedSequence(seed).spawn(max(0, n_starts - 1))
+    return [None] + [int(child.generate_state(1)[0]) for child in spawned]
+
+
+def best_of_n(
+    circuit: QuantumCircuit,
+    n_starts: int = 8,
+    seed: int = 0,
+    time_budget: float | None = None,
+    max_workers: int | None = None,
+    optimizer: str = "FastTODD",
+) -> tuple[QuantumCircuit, int | None]:
+    """
+    Run n_starts T-count optimizations of circuit and keep the one with the
+    fewest T gates, with the seed that reproduces it.
+
+    Start 0 is the deterministic run (seed None), the other starts get the
+    independent seeds of multi_start_seeds, spawned by
+    numpy.random.SeedSequence(seed), so runs with nearby base seeds do not
+    repeat each other's starts.
+    circuit.t_count_optimize(optimizer, seed=seed) replays the returned seed. The starts run on a pool of max_workers processes. After
+    time_budget seconds of wall-clock time the starts still running are
+    stopped; only if none has finished by then is start 0 waited for, so
+    that there is a result. Ties go to the earliest start.
+    """
+    if optimizer not in MULTI_START_OPTIMIZERS:
+        raise ValueError(f"Unknown optimizer '{optimizer}', expected one of {MULTI_START_OPTIMIZERS}")
+    seeds = multi_start_seeds(seed, n_starts)
+    if len(seeds) == 1:
+        return _run_start(circuit, optimizer, None), None
+
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    best, best_seed = None, None
+    processes = min(max_workers or os.cpu_count() or 1, len(seeds))
+    # leaving the pool terminates the starts still running
+    with multiprocessing.Pool(processes) as pool:
+        jobs = [pool.apply_async(_run_start, (circuit, optimizer, s)) for s in seeds]
+        for s, job in zip(seeds, jobs):
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                result = job.get(timeout)
+            except multiprocessing.TimeoutError:
+                continue
+            if best is None or result.num_t < best.num_t:
+                best, best_seed = result, s
+        if best is None:
+            best, best_seed = jobs[0].get(), None
+    return best, best_seed
+
+
+def multi_start_optimize(
+    self,
+    n_starts: int = 8,
+    seed: int = 0,
+    time_budget: float | None = None,
+    max_workers: int | None = None,
+    optimizer: str = "FastTODD",
+) -> QuantumCircuit:
+    """
+    The circuit of best_of_n, never more T gates than the deterministic run
+    unless time_budget stopped it.
+    """
+    return best_of_n(self, n_starts, seed, time_budget, max_workers, optimizer)[0]
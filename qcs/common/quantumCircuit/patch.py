@@ -1,4 +1,5 @@
 from .base import QuantumCircuit
+from .gateArray import *
 
 from .metrics import *
 
@@ -6,9 +7,17 @@ QuantumCircuit.num_t = num_t
 QuantumCircuit.num_2q = num_2q
 QuantumCircuit.num_h = num_h
 QuantumCircuit.num_internal_h = num_internal_h
-QuantumCircuit.t_depth = t_depth
 QuantumCircuit.t_depth_of = t_depth_of
 QuantumCircuit.num_gates = num_gates
+QuantumCircuit.first_t = first_t
+QuantumCircuit.last_t = last_t
+
+from .layering import *
+
+QuantumCircuit.layering = layering
+QuantumCircuit.depth = depth
+QuantumCircuit.t_depth = t_depth
+QuantumCircuit.cnot_depth = cnot_depth
 
 from .gateset import *
 
@@ -33,6 +42,10 @@ from .phaseCNOTSynthesis import *
 QuantumCircuit.optimize_cnot_phase_regions = optimize_cnot_phase_regions
 QuantumCircuit.optimize_cnot_regions = optimize_cnot_regions
 
+from .circuitDag import *
+
+QuantumCircuit.to_dag = to_dag
+
 from .cleanupDangling import *
 
 QuantumCircuit.cleanup_dangling_hadamard = cleanup_dangling_hadamard
@@ -42,11 +55,25 @@ from .io import *
 
 QuantumCircuit.from_truth_table = from_truth_table
 QuantumCircuit.from_qasm = from_qasm
+QuantumCircuit.from_qc = from_qc
 QuantumCircuit.from_file = from_file
 QuantumCircuit.to_qasm = to_qasm
+QuantumCircuit.write_qasm = write_qasm
 QuantumCircuit.to_qc = to_qc
+QuantumCircuit.write_qc = write_qc
 QuantumCircuit.to_json = to_json
 
+from .binaryFormat import *
+
+QuantumCircuit.save_binary = save_binary
+QuantumCircuit.load_binary = load_binary
+
+from .circuitCache import *
+
+from .resultCache import *
+
+from .externalOptimizer import *
+
 from .zxCalculus import *
 
 QuantumCircuit.run_zx = run_zx
@@ -54,8 +81,31 @@ QuantumCircuit.run_zx = run_zx
 from .fastTODD import *
 
 QuantumCircuit.fast_todd_optimize = fast_todd_optimize
+QuantumCircuit.t_count_optimize = t_count_optimize
+
+from .multiStart import *
+
+QuantumCircuit.multi_start_optimize = multi_start_optimize
 
 from .transformations import *
 
 QuantumCircuit.map_qubit = map_qubit
 QuantumCircuit.swap_qubits = swap_qubits
+QuantumCircuit.redirect_qubit = redirect_qubit
+
+from .fingerprint import *
+
+QuantumCircuit.fingerprint = fingerprint
+QuantumCircuit.gate_hashes = gate_hashes
+
+from .circuitView import *
+
+QuantumCircuit.view = view
+# views share the read-only API of the circuits
+for _name in (
+    "num_t", "num_2q", "num_h", "num_internal_h", "first_t", "last_t", "t_depth_of",
+    "layering", "depth", "t_depth", "cnot_depth", "to_dag", "to_qc", "to_qasm",
+    "write_qasm", "write_qc",
+    "fingerprint", "gate_hashes",
+):
+    setattr(CircuitView, _name, getattr(QuantumCircuit, _name))
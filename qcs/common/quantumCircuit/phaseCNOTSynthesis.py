@@ -1,26 +1,25 @@
 from .base import QuantumCircuit
 
-def optimize_cnot_phase_block(self, gates: list[dict]) -> 'QuantumCircuit':
+def optimize_cnot_phase_block(self, gates) -> 'QuantumCircuit':
     from qcs.common.linearFunction import optimize_cnot_phase_block
     optimized_gates = optimize_cnot_phase_block(gates, self.n_qubits)
     print(optimized_gates)
     return optimized_gates
 
 def optimize_cnot_phase_regions(self) -> 'QuantumCircuit':
-    _circuit = QuantumCircuit()
+    _circuit = QuantumCircuit(compact=self.is_compact)
     _circuit.request_qubits(self.n_qubits)
-    buffer = []
-    for gate in self.gates:
-        if gate["name"] in {"CNOT", "S", "T", "Tdg", "Z"}:
-            buffer.append(gate)
-        else:
-            if buffer:
-                optimized_gates = optimize_cnot_phase_block(self, buffer)
+    # the current CNOT-phase region is self.view(start, i), nothing is buffered
+    start = 0
+    for i, gate in enumerate(self.gates):
+        if gate["name"] not in {"CNOT", "S", "T", "Tdg", "Z"}:
+            if start < i:
+                optimized_gates = optimize_cnot_phase_block(self, self.view(start, i))
                 _circuit.extend(optimized_gates)
-                buffer = []
             _circuit.add_gate(gate)
-    if buffer:
-        optimized_gates = optimize_cnot_phase_block(self, buffer)
+            start = i + 1
+    if start < self.num_gates:
+        optimized_gates = optimize_cnot_phase_block(self, self.view(start))
         _circuit.extend(optimized_gates)
     return _circuit
 
@@ -51,7 +50,7 @@ def optimize_cnot_regions(self) -> list[dict]:
             out.append(g)
             i += 1
 
-    _circuit = QuantumCircuit()
+    _circuit = QuantumCircuit(compact=self.is_compact)
     _circuit.n_qubits = self.n_qubits
     _circuit.gates = out
     return _circuit
@@ -0,0 +1,183 @@
+import re
+
+from .gateArray import OP_CNOT, OP_CZ, OP_TOF, OP_HAD, OP_S, OP_T, OP_TDG, OP_X, OP_Z, NO_QUBIT, gate_dict
+
+_STATEMENT = re.compile(r"\s*([A-Za-z_]\w*)\s*(?:\(([^)]*)\))?\s*(.*?)\s*$", re.S)
+_ARGUMENT = re.compile(r"\s*([A-Za-z_]\w*)\s*(?:\[\s*(\d+)\s*\])?\s*$")
+# fast path for a gate on one to three indexed qubits, the common case
+_INDEXED = re.compile(
+    r"\s*([A-Za-z_]\w*)\s+([A-Za-z_]\w*)\s*\[\s*(\d+)\s*\]"
+    r"(?:\s*,\s*([A-Za-z_]\w*)\s*\[\s*(\d+)\s*\])?"
+    r"(?:\s*,\s*([A-Za-z_]\w*)\s*\[\s*(\d+)\s*\])?\s*$"
+)
+
+# the qelib1 gates emitted by to_qasm, plus sdg, as sequences of opcodes
+QASM_GATES: dict[str, tuple[int, ...]] = {
+    "cx": (OP_CNOT,),
+    "CX": (OP_CNOT,),
+    "cz": (OP_CZ,),
+    "ccx": (OP_TOF,),
+    "h": (OP_HAD,),
+    "s": (OP_S,),
+    "sdg": (OP_S, OP_Z),
+    "t": (OP_T,),
+    "tdg": (OP_TDG,),
+    "x": (OP_X,),
+    "z": (OP_Z,),
+}
+_ARITY = {OP_CNOT: 2, OP_CZ: 2, OP_TOF: 3}
+
+
+class QasmReader:
+    """
+    Streaming reader of the OpenQASM 2.0 subset written by to_qasm.
+
+    Statements are split on ';' as the text arrives, in lines or in blocks of
+    any size, so a file is never held in memory. The header and the qreg declarations must precede the first
+    gate, all quantum registers are laid out one after the other. A register
+    argument without an index applies the gate to all its qubits.
+    Iterating yields (opcode, ctrl1, ctrl2, target) rows.
+    """
+
+    def __init__(self, lines):
+        self._statements = self._split(lines)
+        self.registers: dict[str, tuple[int, int]] = {}
+        self.n_qubits: int = 0
+        self._pending: tuple | None = None
+        self._read_header()
+
+    @staticmethod
+    def _split(chunks):
+        """Yield the statements of text arriving in chunks (lines or blocks)."""
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            # comments run to the end of the line, so only complete lines are split
+            if "//" in buffer:
+                head, newline, buffer = buffer.rpartition("\n")
+                head = "\n".join(line.split("//", 1)[0] for line in head.split("\n"))
+                buffer = head + newline + buffer
+                if "//" in buffer.rpartition("\n")[2]:
+                    continue
+            if ";" in buffer:
+                *statements, buffer = buffer.split(";")
+                for statement in statements:
+                    if not statement.isspace() and statement:
+                        yield statement
+        buffer = buffer.split("//", 1)[0]
+        if buffer.strip():
+            raise ValueError(f"Unterminated QASM statement: '{buffer.strip()}'")
+
+    def _read_header(self) -> None:
+        for statement in self._statements:
+            keyword = statement.split(None, 1)[0]
+            if keyword == "OPENQASM":
+                version = statement.split(None, 1)[1].strip()
+                if not version.startswith("2"):
+                    raise ValueError(f"Unsupported OpenQASM version {version}")
+            elif keyword == "include":
+                continue
+            elif keyword == "qreg":
+                name, size = self._argument(statement.split(None, 1)[1])
+                if size is None:
+                    raise ValueError(f"Missing size in '{statement.strip()}'")
+                self.registers[name] = (self.n_qubits, size)
+                self.n_qubits += size
+            else:
+                # the first gate, kept for __iter__
+                self._pending = statement
+                return
+
+    @staticmethod
+    def _argument(text: str) -> tuple[str, int | None]:
+        match = _ARGUMENT.match(text)
+        if match is None:
+            raise ValueError(f"Cannot parse QASM argument '{text.strip()}'")
+        name, index = match.groups()
+        return name, None if index is None else int(index)
+
+    def _qubits(self, text: str) -> list[list[int]]:
+        """The qubits of every argument, a whole register gives all its qubits."""
+        qubits = []
+        for arg in text.split(","):
+            name, index = self._argument(arg)
+            if name not in self.registers:
+                raise ValueError(f"Undeclared quantum register '{name}'")
+            offset, size = self.registers[name]
+            if index is None:
+                qubits.append(list(range(offset, offset + size)))
+            elif index < size:
+                qubits.append([offset + index])
+            else:
+                raise ValueError(f"Index {index} out of range for register '{name}'")
+        return qubits
+
+    def _gate(self, statement: str):
+        name, params, args = _STATEMENT.match(statement).groups()
+        if name in ("creg", "barrier"):
+            return
+        ops = QASM_GATES.get(name)
+        if ops is None or params is not None:
+            raise ValueError(f"Unsupported QASM statement: '{statement.strip()}'")
+        arity = _ARITY.get(ops[0], 1)
+        qubits = self._qubits(args)
+        if len(qubits) != arity:
+            raise ValueError(f"'{name}' expects {arity} arguments, got '{args}'")
+        width = max(len(q) for q in qubits)
+        if any(len(q) not in (1, width) for q in qubits):
+            raise ValueError(f"Registers of different sizes in '{statement.strip()}'")
+        for i in range(width):
+            operands = [q[i] if len(q) > 1 else q[0] for q in qubits]
+            if arity == 1:
+                row = NO_QUBIT, NO_QUBIT, operands[0]
+            elif arity == 2:
+                row = operands[0], NO_QUBIT, operands[1]
+            else:
+                row = tuple(operands)
+            for op in ops:
+                yield (op, *row)
+
+    def _qubit(self, register: str, index: str) -> int:
+        offset, size = self.registers.get(register, (0, 0))
+        index = int(index)
+        return offset + index if index < size else -1
+
+    def _fast_gate(self, statement: str):
+        """Rows of a gate on indexed qubits, None to fall back to _gate."""
+        match = _INDEXED.match(statement)
+        if match is None:
+            return None
+        name, r1, i1, r2, i2, r3, i3 = match.groups()
+        ops = QASM_GATES.get(name)
+        if ops is None:
+            return None
+        arity = _ARITY.get(ops[0], 1)
+        if arity == 1 and r2 is None:
+            qubits = (self._qubit(r1, i1),)
+            row = NO_QUBIT, NO_QUBIT, qubits[0]
+        elif arity == 2 and r2 is not None and r3 is None:
+            qubits = self._qubit(r1, i1), self._qubit(r2, i2)
+            row = qubits[0], NO_QUBIT, qubits[1]
+        elif arity == 3 and r3 is not None:
+            row = qubits = self._qubit(r1, i1), self._qubit(r2, i2), self._qubit(r3, i3)
+        else:
+            return None
+        if -1 in qubits:
+            # let _gate report the bad register or index
+            return None
+        return [(op, *row) for op in ops]
+
+    def __iter__(self):
+        if self._pending is not None:
+            yield from self._gate(self._pending)
+            self._pending = None
+        for statement in self._statements:
+            rows = self._fast_gate(statement)
+            if rows is None:
+                yield from self._gate(statement)
+            else:
+                yield from rows
+
+    def gates(self):
+        """Iterate over the gates as dicts."""
+        return (gate_dict(*row) for row in self)
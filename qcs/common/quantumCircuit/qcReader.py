@@ -0,0 +1,130 @@
+from .gateArray import OP_CNOT, OP_CZ, OP_TOF, OP_HAD, OP_S, OP_T, OP_TDG, OP_X, OP_Z, NO_QUBIT, gate_dict
+
+
+class QcReader:
+    """
+    Line-streaming reader of the .qc format.
+
+    The preamble (.v, .i, .o) is read on construction, so n_qubits, inputs
+    and outputs are known before the first gate. Iterating yields the gates
+    between BEGIN and END as (opcode, ctrl1, ctrl2, target) rows, one line
+    at a time. Gates with more than two controls are decomposed with shared
+    ancillas numbered after the declared qubits, which grows n_qubits.
+    """
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self.line_number: int = 0
+        self.labels: dict[str, int] = {}
+        self.inputs: list[str] = []
+        self.outputs: list[str] = []
+        self.ancillas: list[int] = []
+        self.n_qubits: int = 0
+        self._read_preamble()
+
+    def _tokens(self):
+        """Yield the non-empty lines as token lists, comments removed."""
+        for line in self._lines:
+            self.line_number += 1
+            tokens = line.split("#", 1)[0].replace(",", " ").split()
+            if tokens:
+                yield tokens
+
+    def _read_preamble(self) -> None:
+        for tokens in self._tokens():
+            directive = tokens[0]
+            if directive.upper() == "BEGIN":
+                self.n_qubits = len(self.labels)
+                return
+            if not directive.startswith("."):
+                raise ValueError(f"Line {self.line_number}: unexpected '{directive}' before BEGIN")
+            for label in tokens[1:]:
+                if label not in self.labels:
+                    self.labels[label] = len(self.labels)
+            if directive == ".i":
+                self.inputs += tokens[1:]
+            elif directive == ".o":
+                self.outputs += tokens[1:]
+        raise ValueError("Missing BEGIN in .qc input")
+
+    def _ancilla(self, index: int) -> int:
+        while len(self.ancillas) <= index:
+            self.ancillas.append(self.n_qubits)
+            self.n_qubits += 1
+        return self.ancillas[index]
+
+    def _mcx(self, ctrls: list[int], target: int):
+        """Multi-controlled X as a V-chain of Toffoli gates on the ancillas."""
+        chain = [self._ancilla(i) for i in range(len(ctrls) - 2)]
+        compute = [(OP_TOF, ctrls[0], ctrls[1], chain[0])]
+        for i in range(1, len(chain)):
+            compute.append((OP_TOF, ctrls[i + 1], chain[i - 1], chain[i]))
+        yield from compute
+        yield OP_TOF, ctrls[-1], chain[-1], target
+        yield from reversed(compute)
+
+    def __iter__(self):
+        for tokens in self._tokens():
+            name = tokens[0].lower()
+            if name == "end":
+                return
+            try:
+                qubits = [self.labels[label] for label in tokens[1:]]
+            except KeyError as e:
+                raise ValueError(f"Line {self.line_number}: undeclared qubit {e.args[0]}") from None
+            yield from self._gate(name, qubits)
+        raise ValueError("Missing END in .qc input")
+
+    def _gate(self, name: str, qubits: list[int]):
+        if len(qubits) == 1:
+            t = qubits[0]
+            if name in ("tof", "t1", "not", "x"):
+                yield OP_X, NO_QUBIT, NO_QUBIT, t
+            elif name == "z":
+                yield OP_Z, NO_QUBIT, NO_QUBIT, t
+            elif name in ("s", "p"):
+                yield OP_S, NO_QUBIT, NO_QUBIT, t
+            elif name in ("s*", "p*"):
+                yield OP_S, NO_QUBIT, NO_QUBIT, t
+                yield OP_Z, NO_QUBIT, NO_QUBIT, t
+            elif name == "t":
+                yield OP_T, NO_QUBIT, NO_QUBIT, t
+            elif name == "t*":
+                yield OP_TDG, NO_QUBIT, NO_QUBIT, t
+            elif name == "h":
+                yield OP_HAD, NO_QUBIT, NO_QUBIT, t
+            else:
+                raise ValueError(f"Line {self.line_number}: unknown single-qubit gate '{name}'")
+        elif name in ("tof", "cnot", "t2") and len(qubits) == 2:
+            yield OP_CNOT, qubits[0], NO_QUBIT, qubits[1]
+        elif name in ("z", "cz") and len(qubits) == 2:
+            yield OP_CZ, qubits[0], NO_QUBIT, qubits[1]
+        elif name == "swap" and len(qubits) == 2:
+            a, b = qubits
+            yield OP_CNOT, a, NO_QUBIT, b
+            yield OP_CNOT, b, NO_QUBIT, a
+            yield OP_CNOT, a, NO_QUBIT, b
+        elif name in ("tof", "t3") and len(qubits) == 3:
+            yield OP_TOF, qubits[0], qubits[1], qubits[2]
+        elif name in ("z", "ccz") and len(qubits) == 3:
+            yield OP_HAD, NO_QUBIT, NO_QUBIT, qubits[2]
+            yield OP_TOF, qubits[0], qubits[1], qubits[2]
+            yield OP_HAD, NO_QUBIT, NO_QUBIT, qubits[2]
+        elif name in ("tof", "t4", "t5", "t6", "t7") and len(qubits) > 3:
+            yield from self._mcx(qubits[:-1], qubits[-1])
+        elif name == "z" and len(qubits) > 3:
+            yield OP_HAD, NO_QUBIT, NO_QUBIT, qubits[-1]
+            yield from self._mcx(qubits[:-1], qubits[-1])
+            yield OP_HAD, NO_QUBIT, NO_QUBIT, qubits[-1]
+        else:
+            raise ValueError(f"Line {self.line_number}: unknown gate '{name}' on {len(qubits)} qubits")
+
+    def gates(self):
+        """Iterate over the gates as dicts."""
+        return (gate_dict(*row) for row in self)
+
+
+def iter_qc_file(filename: str):
+    """Yield the gates of a .qc file as dicts without holding the circuit in memory."""
+    with open(filename) as f:
+        yield from QcReader(f).gates()
@@ -0,0 +1,99 @@
+from .gateArray import GateArray
+
+QUBIT_FIELDS = ("ctrl", "ctrl1", "ctrl2", "target")
+
+
+def relabel_gates(gates, mapping: dict[int, int]) -> None:
+    """Rename the qubits of a private gate list or GateArray in place."""
+    if isinstance(gates, GateArray):
+        gates._writable()
+        for column in (gates.ctrl1, gates.ctrl2, gates.target):
+            for i, qubit in enumerate(column):
+                if qubit in mapping:
+                    column[i] = mapping[qubit]
+        return
+    # gate dicts may be shared with snapshots, so changed gates are replaced, not edited
+    for i, gate in enumerate(gates):
+        changes = {k: mapping[gate[k]] for k in QUBIT_FIELDS if k in gate and gate[k] in mapping}
+        if changes:
+            gates[i] = {**gate, **changes}
+
+
+class QubitMap:
+    """
+    Lazy qubit relabelling of a circuit.
+
+    The stored gates act on slots, the qubit a slot currently stands for is
+    label_of.get(slot, slot). map_qubit and swap_qubits only update these
+    tables in O(1), the stored gates are rewritten once when they are read.
+    Gates added later on a qubit are stored on one of its slots. The aliases
+    send gates added later on a qubit to another qubit and are never folded.
+    """
+
+    __slots__ = ("label_of", "slots_of", "alias")
+
+    def __init__(self):
+        self.label_of: dict[int, int] = {}
+        # the slots of every qubit whose slots are not just [qubit]
+        self.slots_of: dict[int, list[int]] = {}
+        self.alias: dict[int, int] = {}
+
+    @property
+    def is_pending(self) -> bool:
+        return bool(self.label_of)
+
+    def slots(self, qubit: int) -> list[int]:
+        return self.slots_of.get(qubit, [qubit])
+
+    def slot(self, qubit: int) -> int | None:
+        """The slot new gates on qubit go to, None if no slot stands for it."""
+        slots = self.slots_of.get(qubit)
+        if slots is None:
+            return qubit
+        return slots[0] if slots else None
+
+    def _set_label(self, slots: list[int], qubit: int) -> None:
+        for slot in slots:
+            if slot == qubit:
+                self.label_of.pop(slot, None)
+            else:
+                self.label_of[slot] = qubit
+
+    def _set_slots(self, qubit: int, slots: list[int]) -> None:
+        if slots == [qubit]:
+            self.slots_of.pop(qubit, None)
+        else:
+            self.slots_of[qubit] = slots
+
+    def swap(self, q1: int, q2: int) -> None:
+        slots1, slots2 = self.slots(q1), self.slots(q2)
+        self._set_label(slots1, q2)
+        self._set_label(slots2, q1)
+        self._set_slots(q1, slots2)
+        self._set_slots(q2, slots1)
+
+    def map(self, q1: int, q2: int) -> None:
+        if q1 == q2:
+            return
+        slots1 = self.slots(q1)
+        self._set_label(slots1, q2)
+        self._set_slots(q2, self.slots(q2) + slots1)
+        self._set_slots(q1, [])
+
+    def redirect(self, qubit: int, to: int) -> None:
+        if qubit == to:
+            self.alias.pop(qubit, None)
+        else:
+            self.alias[qubit] = to
+
+    def take_labels(self) -> dict[int, int]:
+        """Return the pending relabelling and reset the slots to the identity."""
+        label_of = self.label_of
+        self.label_of, self.slots_of = {}, {}
+        return label_of
+
+    def copy(self) -> "QubitMap":
+        qubit_map = QubitMap()
+        qubit_map.label_of, qubit_map.alias = self.label_of.copy(), self.alias.copy()
+        qubit_map.slots_of = {qubit: slots[:] for qubit, slots in self.slots_of.items()}
+        return qubit_map
@@ -0,0 +1,105 @@
+import inspect
+import os
+from collections import OrderedDict
+from typing import Callable
+
+from .base import QuantumCircuit
+from .binaryFormat import BINARY_VERSION, load_binary, save_binary
+from .circuitCache import _digest, _evict_lru, _write_atomic
+
+# bump when the passes or the layout of the cached results change
+RESULT_CACHE_VERSION: int = 1
+
+
+def _resolve(circuit: QuantumCircuit, optimizer) -> tuple[str, Callable]:
+    """The name and the function of a pass, given as a method name of circuit or a function."""
+    if isinstance(optimizer, str):
+        return optimizer, getattr(type(circuit), optimizer)
+    return f"{optimizer.__module__}.{optimizer.__qualname__}", optimizer
+
+
+class ResultCache:
+    """
+    Memoization of circuit passes such as fast_todd_optimize, run_zx or
+    t_count_optimization.
+
+    Results are keyed by the fingerprint of the input circuit (gates on
+    disjoint qubits commute), the name of the pass, its options bound to its
+    signature with the defaults filled in, RESULT_CACHE_VERSION and the
+    cache_version attribute of the pass, if any, to bump when its results
+    change. They are kept in an in-memory LRU of max_entries circuits and, with a directory,
+    on disk as <key>.qcsb files evicted least recently used first once they
+    take more than max_bytes. hits, disk_hits and misses count the lookups.
+    """
+
+    def __init__(self, directory: str | None = None, max_entries: int = 256, max_bytes: int = 1 << 30):
+        self.directory: str | None = directory
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+        self._memory: OrderedDict[str, QuantumCircuit] = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "entries": len(self._memory)}
+
+    @staticmethod
+    def key(circuit: QuantumCircuit, optimizer, options: dict) -> str:
+        name, function = _resolve(circuit, optimizer)
+        bound = inspect.signature(function).bind(circuit, **options)
+        bound.apply_defaults()
+        # the first argument is the circuit itself
+        arguments = sorted(list(bound.arguments.items())[1:])
+        version = (BINARY_VERSION, RESULT_CACHE_VERSION, getattr(function, "cache_version", 0))
+        return _digest(*version, circuit.fingerprint(commute=True), name, arguments)
+
+    def _remember(self, key: str, result: QuantumCircuit) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, circuit: QuantumCircuit, optimizer, /, **options) -> QuantumCircuit | None:
+        """The cached result of the pass on circuit, or None."""
+        key = self.key(circuit, optimizer, options)
+        result = self._memory.get(key)
+        if result is not None:
+            self.hits += 1
+            self._memory.move_to_end(key)
+        elif self.directory is not None and os.path.exists(path := os.path.join(self.directory, key + ".qcsb")):
+            self.disk_hits += 1
+            os.utime(path)
+            result = load_binary(path).copy()
+            self._remember(key, result)
+        else:
+            self.misses += 1
+            return None
+        return result.copy() if circuit.is_compact else result.to_expanded()
+
+    def put(self, circuit: QuantumCircuit, optimizer, result: QuantumCircuit, /, **options) -> None:
+        key = self.key(circuit, optimizer, options)
+        result = result.to_compact()
+        self._remember(key, result)
+        if self.directory is not None:
+            _write_atomic(os.path.join(self.directory, key + ".qcsb"), lambda tmp: save_binary(result, tmp))
+            _evict_lru(self.directory, self.max_bytes)
+
+    def apply(self, circuit: QuantumCircuit, optimizer, /, **options) -> QuantumCircuit:
+        """
+        Run optimizer on circuit through the cache. optimizer is the name of
+        a QuantumCircuit method or a function taking the circuit first.
+        """
+        result = self.get(circuit, optimizer, **options)
+        if result is None:
+            result = _resolve(circuit, optimizer)[1](circuit, **options)
+            self.put(circuit, optimizer, result, **options)
+        return result
+
+    def clear(self) -> None:
+        """Drop the in-memory entries and reset the counters, the disk store is kept."""
+        self._memory.clear()
+        self.hits = self.disk_hits = self.misses = 0
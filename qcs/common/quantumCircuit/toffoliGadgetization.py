@@ -4,7 +4,7 @@ from .base import QuantumCircuit
 def toffoli_gadgetization(self) -> QuantumCircuit:
     clean_qubits = {i: True for i in range(self.n_qubits)}
     n = len(self.gates)
-    _circuit = QuantumCircuit()
+    _circuit = QuantumCircuit(compact=self.is_compact)
     _circuit.n_qubits = self.n_qubits
     for i in range(n):
         g = self.gates[i]
@@ -21,12 +21,21 @@ def toffoli_gadgetization(self) -> QuantumCircuit:
             clean_qubits[target] = False
     return _circuit
 
-def iterative_toffoli_gadgetization(self) -> QuantumCircuit:
+def iterative_toffoli_gadgetization(self, cache=None) -> QuantumCircuit:
+    """
+    Gadgetize the Toffoli gates whose gadget lowers the FastTODD T-count. The
+    many FastTODD runs go through cache, a ResultCache, when one is given.
+    """
+    def optimize(circuit: QuantumCircuit) -> QuantumCircuit:
+        if cache is None:
+            return circuit.fast_todd_optimize()
+        return cache.apply(circuit, "fast_todd_optimize")
+
     clean_qubits = {i: True for i in range(self.n_qubits)}
 
     n = len(self.gates)
 
-    _circuit = QuantumCircuit()
+    _circuit = QuantumCircuit(compact=self.is_compact)
     _circuit.n_qubits = self.n_qubits
 
     for i in range(n):
@@ -43,15 +52,15 @@ def iterative_toffoli_gadgetization(self) -> QuantumCircuit:
                 clean_qubits[target] = False
                 continue
 
-            circuit_gadgetize = _circuit.copy()
+            circuit_gadgetize = _circuit.snapshot()
             ancilla = circuit_gadgetize.request_qubit()
             circuit_gadgetize.add_clean_toffoli(c1, c2, ancilla)
-            circuit_gadgetize = circuit_gadgetize.fast_todd_optimize()
+            circuit_gadgetize = optimize(circuit_gadgetize)
             t_gadgetize = circuit_gadgetize.num_t
 
-            circuit_no_gadgetize = _circuit.copy()
+            circuit_no_gadgetize = _circuit.snapshot()
             circuit_no_gadgetize.add_gate(g)
-            circuit_no_gadgetize = circuit_no_gadgetize.fast_todd_optimize()
+            circuit_no_gadgetize = optimize(circuit_no_gadgetize)
             t_no_gadgetize = circuit_no_gadgetize.num_t
 
             # predict the T gates by looking at the Toffoli gates after this
@@ -96,6 +105,6 @@ def iterative_toffoli_gadgetization(self) -> QuantumCircuit:
         else:
             _circuit.add_gate(g)
         clean_qubits[target] = False
-    _circuit = _circuit.fast_todd_optimize()
+    _circuit = optimize(_circuit)
     # plot_circuit(_circuit, "final_circuit.png")
     return _circuit
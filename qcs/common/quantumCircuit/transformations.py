@@ -1,35 +1,26 @@
+from .qubitMap import QubitMap
+
+def _qubit_map_of(self) -> QubitMap:
+    if self._qubit_map is None:
+        self._qubit_map = QubitMap()
+    return self._qubit_map
+
 def map_qubit(self, q1: int, q2: int):
     assert 0 <= q1 < self.n_qubits and 0 <= q2 < self.n_qubits, "Qubit indices out of range"
-    for gate in self.gates:
-        if "ctrl" in gate and gate["ctrl"] == q1:
-            gate["ctrl"] = q2
-        if "target" in gate and gate["target"] == q1:
-            gate["target"] = q2
-        if "ctrl1" in gate and gate["ctrl1"] == q1:
-            gate["ctrl1"] = q2
-        if "ctrl2" in gate and gate["ctrl2"] == q1:
-            gate["ctrl2"] = q2
-            
+    _qubit_map_of(self).map(q1, q2)
+    if self._metrics is not None:
+        self._metrics.relabel({q1: q2})
+
 def swap_qubits(self, q1: int, q2: int):
     assert 0 <= q1 < self.n_qubits and 0 <= q2 < self.n_qubits, "Qubit indices out of range"
-    for gate in self.gates:
-        if "ctrl" in gate:
-            if gate["ctrl"] == q1:
-                gate["ctrl"] = q2
-            elif gate["ctrl"] == q2:
-                gate["ctrl"] = q1
-        if "target" in gate:
-            if gate["target"] == q1:
-                gate["target"] = q2
-            elif gate["target"] == q2:
-                gate["target"] = q1
-        if "ctrl1" in gate:
-            if gate["ctrl1"] == q1:
-                gate["ctrl1"] = q2
-            elif gate["ctrl1"] == q2:
-                gate["ctrl1"] = q1
-        if "ctrl2" in gate:
-            if gate["ctrl2"] == q1:
-                gate["ctrl2"] = q2
-            elif gate["ctrl2"] == q2:
-                gate["ctrl2"] = q1    
\ No newline at end of file
+    _qubit_map_of(self).swap(q1, q2)
+    if self._metrics is not None:
+        self._metrics.relabel({q1: q2, q2: q1})
+
+def redirect_qubit(self, qubit: int, to: int):
+    """
+    Send the gates added later on qubit to the qubit to, the gates already in
+    the circuit are left as they are. redirect_qubit(q, q) undoes it.
+    """
+    assert 0 <= qubit < self.n_qubits and 0 <= to < self.n_qubits, "Qubit indices out of range"
+    _qubit_map_of(self).redirect(qubit, to)
@@ -1,11 +1,44 @@
-import pyzx as zx
 from .base import QuantumCircuit
+from .gateArray import OP_CNOT, OP_CZ, OP_TOF, OP_HAD, OP_S, OP_T, OP_TDG, OP_X, OP_Z, OP_CCZ, GATE_NAMES
+from .io import from_zx_circuit
+
+def to_zx_circuit(self):
+    """Build the pyzx circuit gate by gate, without going through QASM."""
+    import pyzx as zx
+    from pyzx.circuit import gates
+
+    circuit = zx.Circuit(self.n_qubits)
+    for op, c1, c2, t in self.iter_ops():
+        if op == OP_CNOT:
+            circuit.add_gate(gates.CNOT(c1, t))
+        elif op == OP_CZ:
+            circuit.add_gate(gates.CZ(c1, t))
+        elif op == OP_TOF:
+            circuit.add_gate(gates.Tofolli(c1, c2, t))
+        elif op == OP_CCZ:
+            circuit.add_gate(gates.CCZ(c1, c2, t))
+        elif op == OP_HAD:
+            circuit.add_gate(gates.HAD(t))
+        elif op == OP_S:
+            circuit.add_gate(gates.S(t))
+        elif op == OP_T:
+            circuit.add_gate(gates.T(t))
+        elif op == OP_TDG:
+            circuit.add_gate(gates.T(t, adjoint=True))
+        elif op == OP_X:
+            circuit.add_gate(gates.NOT(t))
+        elif op == OP_Z:
+            circuit.add_gate(gates.Z(t))
+        else:
+            raise NotImplementedError(f"Unsupported gate: {GATE_NAMES[op]}")
+    return circuit
 
 def run_zx(self) -> QuantumCircuit:
-    circuit = zx.Circuit.from_qasm(self.to_qasm())
+    import pyzx as zx
+    circuit = to_zx_circuit(self)
     graph = circuit.to_graph()
     zx.simplify.full_reduce(graph, quiet=True)
     circuit = zx.extract_circuit(graph, up_to_perm=False)
     circuit = circuit.to_basic_gates()
     circuit = circuit.split_phase_gates()
-    return QuantumCircuit.from_zx_circuit(circuit)
+    return from_zx_circuit(circuit, self.is_compact)
@@ -28,14 +28,14 @@ class RowMajorTableau:
     def append_z(self, qubit): self.signs.xor(self.x[qubit])
 
     def append_v(self, qubit):
-        a = copy.deepcopy(self.x[qubit])
+        a = self.x[qubit].copy()
         a.negate()
         a.and_(self.z[qubit])
         self.signs.xor(a)
         self.x[qubit].xor(self.z[qubit])
 
     def append_s(self, qubit):
-        a = copy.deepcopy(self.z[qubit])
+        a = self.z[qubit].copy()
         a.and_(self.x[qubit])
         self.signs.xor(a)
         self.z[qubit].xor(self.x[qubit])
@@ -46,7 +46,7 @@ class RowMajorTableau:
         self.append_s(qubit)
 
     def append_cx(self, qubits):
-        a = copy.deepcopy(self.z[qubits[0]])
+        a = self.z[qubits[0]].copy()
         a.negate()
         a.xor(self.x[qubits[1]])
         a.and_(self.z[qubits[1]])
@@ -0,0 +1,157 @@
+import re
+
+from .netlistReader import NetlistReader
+
+# identifiers (escaped ones end at a space), sized constants, operators, any other character
+_TOKEN = re.compile(r"\\\S+|[A-Za-z_][\w$]*(?:\[\d+\])?|\d*'[bBdDhH][0-9a-fA-F_]+|\d+|~\^|\^~|[^\s\w]")
+_COMMENT = re.compile(r"//.*|/\*.*?\*/|/\*.*", re.S)
+# the single gate assignments written by ABC, on one line
+_SIMPLE_ASSIGN = re.compile(
+    r"\s*assign\s+([A-Za-z_][\w$]*)\s*=\s*(~?)\s*([A-Za-z_][\w$]*)\s*(?:([&|^])\s*(~?)\s*([A-Za-z_][\w$]*)\s*)?;\s*$"
+)
+_BLOCK_END = re.compile(r".*?\*/", re.S)
+
+
+def _constant(token: str) -> bool:
+    if "'" not in token:
+        return bool(int(token) & 1)
+    value = token.split("'")[1]
+    base = {"b": 2, "d": 10, "h": 16}[value[0].lower()]
+    return bool(int(value[1:].replace("_", ""), base) & 1)
+
+
+def _is_name(token: str) -> bool:
+    return token[0].isalpha() or token[0] in "_\\"
+
+
+class VerilogReader(NetlistReader):
+    """
+    Streaming reader of the structural Verilog written by ABC.
+
+    Supports module, input, output and wire declarations and assign
+    statements with any expression over ~, &, |, ^, ~^, parentheses and the
+    constants 1'b0 / 1'b1. Expressions are split into two-input gates on the
+    fly, constants are folded. See NetlistReader for the nodes and gates.
+    """
+
+    def __init__(self, lines):
+        super().__init__()
+        self._lines = iter(lines)
+        self._read()
+
+    def _uncomment(self, line: str, in_comment: bool) -> tuple[str, bool]:
+        """Remove the comments of a line, in_comment tells if a /* block is open."""
+        if in_comment:
+            end = _BLOCK_END.match(line)
+            if end is None:
+                return "", True
+            line = line[end.end():]
+        comments = _COMMENT.findall(line)
+        open_block = bool(comments) and comments[-1].startswith("/*") and not comments[-1].endswith("*/")
+        return _COMMENT.sub(" ", line), open_block
+
+    def _read(self) -> None:
+        statement, in_comment = [], False
+        for line in self._lines:
+            self.line_number += 1
+            if not statement and not in_comment:
+                match = _SIMPLE_ASSIGN.match(line)
+                if match is not None:
+                    self._simple_assign(*match.groups())
+                    continue
+            if in_comment or "/" in line:
+                line, in_comment = self._uncomment(line, in_comment)
+            tokens = _TOKEN.findall(line)
+            if ";" not in tokens:
+                # declarations may span many lines, only the new tokens are scanned
+                statement += tokens
+            else:
+                for token in tokens:
+                    if token == ";":
+                        self._statement(statement)
+                        statement = []
+                    else:
+                        statement.append(token)
+            if statement and statement[0] == "endmodule":
+                return
+        if statement:
+            raise ValueError(f"Line {self.line_number}: unterminated statement")
+
+    def _statement(self, statement: list[str]) -> None:
+        keyword = statement[0] if statement else None
+        if keyword in ("input", "output"):
+            if "[" in statement:
+                raise ValueError(f"Line {self.line_number}: vectors are not supported")
+            if any(token != "," for token in statement[2::2]):
+                raise ValueError(f"Line {self.line_number}: malformed {keyword} declaration")
+            nodes = [self._id(name) for name in statement[1::2]]
+            (self.inputs if keyword == "input" else self.outputs).extend(nodes)
+        elif keyword == "assign":
+            if len(statement) < 4 or statement[2] != "=":
+                raise ValueError(f"Line {self.line_number}: malformed assign")
+            self._assign(self._id(statement[1]), statement[3:])
+        elif keyword not in ("module", "wire"):
+            raise ValueError(f"Line {self.line_number}: unsupported statement '{keyword}'")
+
+    def _assign(self, node: int, tokens: list[str]) -> None:
+        self._expr, self._pos = tokens, 0
+        expr = self._or()
+        if self._pos != len(tokens):
+            raise ValueError(f"Line {self.line_number}: unexpected '{tokens[self._pos]}'")
+        self._drive(node, expr)
+
+    def _simple_assign(self, lhs: str, not1: str, name1: str, op: str | None, not2: str, name2: str) -> None:
+        """Fast path for the `[~]a` and `[~]a op [~]b` assignments written by ABC."""
+        literal1 = self._id(name1), not1 == "~"
+        if op is None:
+            self._drive(self._id(lhs), literal1)
+            return
+        literal2 = self._id(name2), not2 == "~"
+        if op == "|":
+            self._drive(self._id(lhs), self._disjunction(literal1, literal2))
+        else:
+            self._drive(self._id(lhs), (op, literal1, literal2, False))
+
+    def _peek(self) -> str | None:
+        return self._expr[self._pos] if self._pos < len(self._expr) else None
+
+    def _or(self) -> tuple:
+        expr = self._xor()
+        while self._peek() == "|":
+            self._pos += 1
+            expr = self._disjunction(expr, self._xor())
+        return expr
+
+    def _xor(self) -> tuple:
+        expr = self._and()
+        while self._peek() in ("^", "~^", "^~"):
+            op = self._expr[self._pos]
+            self._pos += 1
+            expr = self._binary("^", expr, self._and())
+            if op != "^":
+                expr = self._negate(expr)
+        return expr
+
+    def _and(self) -> tuple:
+        expr = self._unary()
+        while self._peek() == "&":
+            self._pos += 1
+            expr = self._binary("&", expr, self._unary())
+        return expr
+
+    def _unary(self) -> tuple:
+        token = self._peek()
+        self._pos += 1
+        if token == "~":
+            return self._negate(self._unary())
+        if token == "(":
+            expr = self._or()
+            if self._peek() != ")":
+                raise ValueError(f"Line {self.line_number}: missing ')'")
+            self._pos += 1
+            return expr
+        if token is not None and _is_name(token):
+            return self._id(token), False
+        if token is not None and (token[0].isdigit() or token[0] == "'"):
+            return None, _constant(token)
+        raise ValueError(f"Line {self.line_number}: unexpected '{token}' in expression")
@@ -2,14 +2,29 @@
 
 import copy
 import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
 
 from .common import *
 
+# below this many candidate pairs per round, fast_todd scores in the calling process
+PARALLEL_MIN_PAIRS = 512
+# from this many terms on, fast_todd scores the candidates of a pair in one batch of NumPy calls
+BATCHED_MIN_ROWS = 96
+
+def _lex_less(a: int, b: int) -> bool:
+    """Compare packed vectors as tuples of bits, entry 0 first."""
+    diff = a ^ b
+    return bool(b & diff & -diff)
+
 def to_remove_indices(table: list[BitVector]) -> list[int]:
     seen = {}
     to_remove = []
     for i, bv in enumerate(table):
-        vec = tuple(bv.get_integer_vec())
+        vec = bv.to_int()
         first_one = bv.get_first_one()
         if not bv.get(first_one):
             to_remove.append(i)
@@ -22,31 +37,30 @@ def to_remove_indices(table: list[BitVector]) -> list[int]:
     return to_remove
 
 def to_remove(table: list[BitVector]) -> list[int]:
+    return _to_remove_words([vec.to_int() for vec in table])
+
+def _to_remove_words(words: list[int]) -> list[int]:
     seen = {}
     to_remove = []
 
-    for i, vec in enumerate(table):
-        vec_int = vec.get_integer_vec()
-        first_one = vec.get_first_one()
-
-        if not vec.get(first_one):
+    for i, vec_int in enumerate(words):
+        if not vec_int:
             to_remove.append(i)
-        elif tuple(vec_int) in seen:
-            to_remove.append(seen[tuple(vec_int)])
+        elif vec_int in seen:
+            to_remove.append(seen[vec_int])
             to_remove.append(i)
-            del seen[tuple(vec_int)]
+            del seen[vec_int]
         else:
-            seen[tuple(vec_int)] = i
+            seen[vec_int] = i
 
     return to_remove
 
 def proper(table: list[BitVector]) -> list[BitVector]:
-    seen: dict[tuple[bool, ...], int] = {}
+    seen: dict[int, int] = {}
     to_remove: list[int] = []
     for i, bv in enumerate(table):
-        col: tuple[bool, ...] = tuple(bv.get_boolean_vec())
-        first_one: int = bv.get_first_one()
-        if not bv.get(first_one):
+        col: int = bv.to_int()
+        if not col:
             to_remove.append(i)
         elif col in seen:
             to_remove.append(seen[col])
@@ -59,79 +73,215 @@ def proper(table: list[BitVector]) -> list[BitVector]:
         table.pop(i)
     return table
 
-def kernel(matrix: list[BitVector], augmented_matrix: list[BitVector], pivots: dict[int, int]) -> BitVector | None:
-    for row_idx, row in enumerate(matrix):
+def kernel(matrix: GF2Matrix, augmented_matrix: GF2Matrix, pivots: dict[int, int]) -> BitVector | None:
+    for row_idx in range(len(matrix)):
         if row_idx in pivots:
             continue
+        row, aug = matrix[row_idx], augmented_matrix[row_idx]
         # Eliminate current row using existing pivots
         for pivot_row, pivot_col in pivots.items():
-            if row.get(pivot_col):
-                matrix[row_idx].xor(matrix[pivot_row])
-                augmented_matrix[row_idx].xor(augmented_matrix[pivot_row])
-        index = row.get_first_one()
-        if row.get(index):
+            if row >> pivot_col & 1:
+                row ^= matrix[pivot_row]
+                aug ^= augmented_matrix[pivot_row]
+        matrix[row_idx], augmented_matrix[row_idx] = row, aug
+        if row:
             # Eliminate this variable from all pivot rows
-            for pivot_row, _ in pivots.items():
-                if matrix[pivot_row].get(index):
-                    matrix[pivot_row].xor(row)
-                    augmented_matrix[pivot_row].xor(augmented_matrix[row_idx])
-            pivots[row_idx] = index
+            low = row & -row
+            for pivot_row in pivots:
+                if matrix[pivot_row] & low:
+                    matrix[pivot_row] ^= row
+                    augmented_matrix[pivot_row] ^= aug
+            pivots[row_idx] = low.bit_length() - 1
         else:
-            return copy.deepcopy(augmented_matrix[row_idx])
+            return BitVector.from_int(aug, augmented_matrix.n_cols)
     return None
 
-def fast_todd(table, n_qubits: int) -> list['BitVector']:
+def _best_reduction(table, n_qubits, matrix, pivots, augmented, rows):
     """
-    FastTODD algorithm for phase polynomial optimization.
+    Best (score, z, y) over the candidate pairs (i, j) with i in rows and
+    j > i, in combinations order, the first best pair wins ties.
     """
-    table = copy.deepcopy(table)
-    while True:
-        table = tohpe(table, n_qubits)
-        matrix = extend_boolean_vectors(table, n_qubits)
-
-        pivots = {}
-        augmented = identity_table(len(table))
-
-        kernel(matrix, augmented, pivots)
-        _pivots = {v: k for k, v in pivots.items()}
-        row_map = {tuple(bv.get_integer_vec()): i for i, bv in enumerate(table)}
-
-        max_score, max_z, max_y = 0, None, None
-        for i, j in itertools.combinations(range(len(table)), 2):
-            z = copy.deepcopy(table[i]); z.xor(table[j])
+    row_map = {bv.to_int(): i for i, bv in enumerate(table)}
+    packed = _PackedTable(table) if len(table) >= BATCHED_MIN_ROWS else None
+    max_score, max_z, max_y = 0, None, None
+    for i in rows:
+        for j in range(i + 1, len(table)):
+            z = table[i].copy(); z.xor(table[j])
             z_vec = z.get_boolean_vec()
-            r_mat, r_aug = calculate_reduced_matrix(n_qubits, matrix, _pivots, augmented, z_vec)
-            _max_score, _max_z, _max_y = evaluate_reduction_score(table, i, row_map, j, z, r_mat, r_aug)
+            r_mat, r_aug = calculate_reduced_matrix(n_qubits, matrix, pivots, augmented, z_vec)
+            if packed is None:
+                _max_score, _max_z, _max_y = evaluate_reduction_score(table, i, row_map, j, z, r_mat, r_aug)
+            else:
+                _max_score, _max_z, _max_y = evaluate_reduction_score_batched(packed, i, j, z, r_mat, r_aug)
             if _max_score > max_score:
                 max_score, max_z, max_y = _max_score, _max_z, _max_y
-        if max_score == 0: break
-        y, z = max_y, max_z
-        for i in range(len(table)):
-            if y.get(i): table[i].xor(z)
-        if y.popcount() % 2 == 1: table.append(z)
-        table = proper(table)
+    return max_score, max_z, max_y
+
+def _pair_shards(n_rows: int, n_shards: int) -> list[range]:
+    """Split the first rows of the pairs into consecutive ranges with about as many pairs each."""
+    total = n_rows * (n_rows - 1) // 2
+    shards, start, count = [], 0, 0
+    for i in range(n_rows):
+        count += n_rows - 1 - i
+        if count * n_shards >= total * (len(shards) + 1):
+            shards.append(range(start, i + 1))
+            start = i + 1
+    if start < n_rows:
+        shards.append(range(start, n_rows))
+    return shards
+
+def _share_rows(blocks: list[tuple[list[int], int]]) -> SharedMemory:
+    """Copy blocks of (rows, n_bits) into one shared memory segment, little-endian rows of fixed width."""
+    widths = [(n_bits + 7) // 8 for _, n_bits in blocks]
+    shm = SharedMemory(create=True, size=max(1, sum(len(rows) * w for (rows, _), w in zip(blocks, widths))))
+    offset = 0
+    for (rows, _), width in zip(blocks, widths):
+        for row in rows:
+            shm.buf[offset:offset + width] = row.to_bytes(width, "little")
+            offset += width
+    return shm
+
+def _read_rows(buf, offset: int, n_rows: int, n_bits: int) -> tuple[list[int], int]:
+    width = (n_bits + 7) // 8
+    rows = [int.from_bytes(buf[offset + k * width:offset + (k + 1) * width], "little") for k in range(n_rows)]
+    return rows, offset + n_rows * width
+
+def _fast_todd_shard(name, n_rows, size, matrix_cols, n_qubits, pivots, rows):
+    """_best_reduction in a worker process, on the table and matrices shared by fast_todd."""
+    shm = SharedMemory(name=name)
+    try:
+        words, offset = _read_rows(shm.buf, 0, n_rows, size)
+        matrix, offset = _read_rows(shm.buf, offset, n_rows, matrix_cols)
+        augmented, _ = _read_rows(shm.buf, offset, n_rows, n_rows)
+    finally:
+        shm.close()
+    table = [BitVector.from_int(word, size) for word in words]
+    matrix = GF2Matrix.from_rows(matrix, matrix_cols)
+    augmented = GF2Matrix.from_rows(augmented, n_rows)
+    score, z, y = _best_reduction(table, n_qubits, matrix, pivots, augmented, rows)
+    return score, z and z.to_int(), y and y.to_int()
+
+def _best_reduction_parallel(pool, max_workers, table, n_qubits, matrix, pivots, augmented):
+    """_best_reduction over all pairs, sharded on pool, with the same result."""
+    size = len(table[0])
+    shm = _share_rows([
+        ([row.to_int() for row in table], size),
+        (matrix.rows, matrix.n_cols),
+        (augmented.rows, augmented.n_cols),
+    ])
+    try:
+        futures = [
+            pool.submit(_fast_todd_shard, shm.name, len(table), size, matrix.n_cols, n_qubits, pivots, rows)
+            for rows in _pair_shards(len(table), 4 * max_workers)
+        ]
+        # shards are in pair order, keeping the first best shard keeps the serial choice
+        max_score, max_z, max_y = 0, None, None
+        for future in futures:
+            score, z, y = future.result()
+            if score > max_score:
+                max_score = score
+                max_z, max_y = BitVector.from_int(z, size), BitVector.from_int(y, len(table))
+    finally:
+        shm.close()
+        shm.unlink()
+    return max_score, max_z, max_y
+
+def fast_todd(table, n_qubits: int, max_workers: int = 1, seed: int | None = None) -> list['BitVector']:
+    """
+    FastTODD algorithm for phase polynomial optimization.
+
+    With max_workers > 1, rounds with at least PARALLEL_MIN_PAIRS candidate
+    pairs are scored on a pool of processes that read the table and the
+    matrices from shared memory. The result is the same as the serial one.
+    With a seed, the rows are shuffled and every TOHPE round is seeded, so
+    ties go another way, reproducibly for the same seed.
+    """
+    table = [row.copy() for row in table]
+    rng = None if seed is None else random.Random(seed)
+    if rng is not None:
+        rng.shuffle(table)
+    pool = None
+    try:
+        while True:
+            table = tohpe(table, n_qubits, None if rng is None else rng.getrandbits(64))
+            size = len(table[0]) if table else n_qubits
+            matrix = GF2Matrix.from_rows(
+                _extend_words([bv.to_int() for bv in table], size, n_qubits),
+                size + n_qubits * (n_qubits - 1) // 2,
+            )
+
+            pivots = {}
+            augmented = identity_table(len(table))
+
+            kernel(matrix, augmented, pivots)
+            _pivots = {v: k for k, v in pivots.items()}
+
+            if max_workers > 1 and len(table) * (len(table) - 1) // 2 >= PARALLEL_MIN_PAIRS:
+                if pool is None:
+                    pool = ProcessPoolExecutor(max_workers=max_workers)
+                max_score, max_z, max_y = _best_reduction_parallel(
+                    pool, max_workers, table, n_qubits, matrix, _pivots, augmented
+                )
+            else:
+                max_score, max_z, max_y = _best_reduction(
+                    table, n_qubits, matrix, _pivots, augmented, range(len(table))
+                )
+            if max_score == 0: break
+            y, z = max_y, max_z
+            for i in range(len(table)):
+                if y.get(i): table[i].xor(z)
+            if y.popcount() % 2 == 1: table.append(z)
+            table = proper(table)
+    finally:
+        if pool is not None:
+            pool.shutdown()
     return table
 
 def extend_boolean_vectors(table, n_qubits):
-    matrix = copy.deepcopy(table)
-    for i in range(len(matrix)):
-        t_vec = matrix[i].get_boolean_vec()[:n_qubits]
-        extended = []
-        for _ in range(n_qubits):
-            if t_vec and t_vec.pop(0):
-                extended += t_vec.copy()
-            else:
-                extended += [False] * len(t_vec)
-        matrix[i].extend_vec(extended, len(extended))
-    return matrix
-
-def identity_table(n: int):
-    augmented = []
-    for i in range(n):
-        bv = BitVector(n)
-        bv.xor_bit(i)
-        augmented.append(bv)
-    return augmented
+    """
+    Append to every row x the products x_a x_b, a < b < n_qubits, in
+    lexicographic order of (a, b).
+    """
+    size = len(table[0]) if table else n_qubits
+    n_pairs = n_qubits * (n_qubits - 1) // 2
+    return [BitVector.from_int(word, size + n_pairs) for word in _extend_words([bv.to_int() for bv in table], size, n_qubits)]
+
+def _pair_offsets(n_qubits: int) -> list[int]:
+    """The position of the products x_a x_b, b > a, in the extension, x_a x_b is at offsets[a] + b."""
+    return [a * (n_qubits - 1) - a * (a - 1) // 2 - a - 1 for a in range(n_qubits)]
+
+def _extend_words(words: list[int], size: int, n_qubits: int) -> list[int]:
+    """
+    _extend_word of many packed rows, as the upper triangle of the outer
+    product of every row with itself, a few thousand rows at a time.
+    """
+    if not words or n_qubits < 2:
+        return list(words)
+    n_bytes = (size + 7) // 8
+    a, b = np.triu_indices(n_qubits, 1)
+    chunk = max(1, (1 << 24) // len(a))
+    extended = []
+    for start in range(0, len(words), chunk):
+        part = words[start:start + chunk]
+        data = b"".join(word.to_bytes(n_bytes, "little") for word in part)
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8).reshape(len(part), n_bytes), axis=1, bitorder="little")
+        products = np.packbits(bits[:, a] & bits[:, b], axis=1, bitorder="little")
+        extended.extend(word | int.from_bytes(row.tobytes(), "little") << size for word, row in zip(part, products))
+    return extended
+
+def _extend_word(word: int, size: int, n_qubits: int) -> int:
+    """extend_boolean_vectors of one packed row of size bits, one shift per set bit."""
+    extended, remaining = word, word & ((1 << (n_qubits - 1)) - 1)
+    offsets = _pair_offsets(n_qubits)
+    while remaining:
+        low = remaining & -remaining
+        a = low.bit_length() - 1
+        extended |= (word >> (a + 1) & ((1 << (n_qubits - 1 - a)) - 1)) << (size + offsets[a] + a + 1)
+        remaining ^= low
+    return extended
+
+def identity_table(n: int) -> GF2Matrix:
+    return GF2Matrix.identity(n)
 
 def evaluate_reduction_score(table, i, row_map, j, z, r_mat, r_aug):
     """
@@ -140,200 +290,269 @@ def evaluate_reduction_score(table, i, row_map, j, z, r_mat, r_aug):
     """
     max_score = 0
     max_y, max_z = None, None
-    for k, (rm, ra) in enumerate(zip(r_mat, r_aug)):
-        idx = rm.get_first_one()
+    z_int = z.to_int()
+    mat_rows, aug_rows = r_mat.rows, r_aug.rows
+    for k in range(len(mat_rows)):
+        rm, ra = mat_rows[k], aug_rows[k]
         # Gaussian elimination step
-        if rm.get(idx):
-            pivot, aug_pivot = copy.deepcopy(rm), copy.deepcopy(ra)
-            for l in range(k + 1, len(r_mat)):
-                if r_mat[l].get(idx):
-                    r_mat[l].xor(pivot)
-                    r_aug[l].xor(aug_pivot)
+        if rm:
+            low = rm & -rm
+            for l in range(k + 1, len(mat_rows)):
+                if mat_rows[l] & low:
+                    mat_rows[l] ^= rm
+                    aug_rows[l] ^= ra
         # Check if this row can improve the reduction
-        elif ra.get(i) ^ ra.get(j):
+        elif (ra >> i ^ ra >> j) & 1:
             score = 0
-            y = copy.deepcopy(ra)
-            _table = copy.deepcopy(table)
             # Simulate applying reduction and count improvements
-            for l in range(len(_table)):
-                if y.get(l):
-                    _table[l].xor(z)
-                    key = tuple(_table[l].get_integer_vec())
-                    if key in row_map and not y.get(row_map[key]):
-                        score += 2
-                    _table[l].xor(z)
+            y = ra
+            while y:
+                low = y & -y
+                key = table[low.bit_length() - 1].to_int() ^ z_int
+                if key in row_map and not ra >> row_map[key] & 1:
+                    score += 2
+                y ^= low
             # Adjust score for parity
-            if y.popcount() % 2 == 1:
-                key = tuple(z.get_integer_vec())
-                score += 1 if key in row_map else -1
+            if ra.bit_count() % 2 == 1:
+                score += 1 if z_int in row_map else -1
             # Update best score if improved
             if score > max_score:
-                max_score, max_y, max_z = score, y, copy.deepcopy(z)
+                max_score, max_y, max_z = score, BitVector.from_int(ra, r_aug.n_cols), z.copy()
+    return max_score, max_z, max_y
+
+class _PackedTable:
+    """
+    The rows of a table as an (m, words) uint64 array, with a sorted hash
+    index of the rows to find many of them at once.
+    """
+
+    def __init__(self, table: list[BitVector]):
+        self.size = len(table[0]) if table else 0
+        self.n_words = max(1, (self.size + 63) // 64)
+        self.row_map = {bv.to_int(): i for i, bv in enumerate(table)}
+        self.rows = self.pack([bv.to_int() for bv in table])
+        hashes = self._hash(self.rows)
+        self.order = np.argsort(hashes, kind="stable")
+        self.sorted_hashes = hashes[self.order]
+
+    def pack(self, words: list[int]) -> np.ndarray:
+        data = b"".join(word.to_bytes(8 * self.n_words, "little") for word in words)
+        return np.frombuffer(data, dtype="<u8").reshape(len(words), self.n_words)
+
+    @staticmethod
+    def _hash(rows: np.ndarray) -> np.ndarray:
+        hashes = rows[:, 0].copy()
+        for k in range(1, rows.shape[1]):
+            hashes = hashes * np.uint64(0x9E3779B97F4A7C15) ^ rows[:, k]
+        return hashes
+
+    def find(self, queries: np.ndarray) -> np.ndarray:
+        """The index of every query row in the table, -1 when absent."""
+        hashes = self._hash(queries)
+        pos = np.minimum(np.searchsorted(self.sorted_hashes, hashes), len(self.order) - 1)
+        found = self.order[pos]
+        hit = (self.sorted_hashes[pos] == hashes) & np.all(self.rows[found] == queries, axis=1)
+        result = np.where(hit, found, -1)
+        # rows sharing a hash with another row are looked up one by one
+        for q in np.flatnonzero(~hit & (self.sorted_hashes[pos] == hashes)):
+            word = int.from_bytes(queries[q].tobytes(), "little")
+            result[q] = self.row_map.get(word, -1)
+        return result
+
+def evaluate_reduction_score_batched(packed: _PackedTable, i, j, z, r_mat, r_aug):
+    """
+    evaluate_reduction_score with all candidates y of the pair scored
+    together: table[y] ^ z is one array operation and the rows are looked
+    up in the hash index of packed. Returns the same max_score, max_z, max_y.
+    """
+    candidates = []
+    mat_rows, aug_rows = r_mat.rows, r_aug.rows
+    for k in range(len(mat_rows)):
+        rm, ra = mat_rows[k], aug_rows[k]
+        # Gaussian elimination step, candidates do not change the later rows
+        if rm:
+            low = rm & -rm
+            for l in range(k + 1, len(mat_rows)):
+                if mat_rows[l] & low:
+                    mat_rows[l] ^= rm
+                    aug_rows[l] ^= ra
+        elif (ra >> i ^ ra >> j) & 1:
+            candidates.append(ra)
+    if not candidates:
+        return 0, None, None
+
+    m = len(packed.rows)
+    n_bytes = (m + 7) // 8
+    data = b"".join(ra.to_bytes(n_bytes, "little") for ra in candidates)
+    masks = np.unpackbits(
+        np.frombuffer(data, dtype=np.uint8).reshape(len(candidates), n_bytes), axis=1, bitorder="little"
+    )[:, :m].astype(bool)
+    candidate_idx, row_idx = np.nonzero(masks)
+    z_int = z.to_int()
+    found = packed.find(packed.rows[row_idx] ^ packed.pack([z_int])[0])
+    improves = found >= 0
+    improves[improves] = ~masks[candidate_idx[improves], found[improves]]
+    scores = 2 * np.bincount(candidate_idx[improves], minlength=len(candidates))
+
+    max_score, max_y, max_z = 0, None, None
+    z_in_table = z_int in packed.row_map
+    for ra, score in zip(candidates, scores.tolist()):
+        # Adjust score for parity
+        if ra.bit_count() % 2 == 1:
+            score += 1 if z_in_table else -1
+        if score > max_score:
+            max_score, max_y, max_z = score, BitVector.from_int(ra, r_aug.n_cols), z.copy()
     return max_score, max_z, max_y
 
 def calculate_reduced_matrix(n_qubits, matrix, pivots, augmented, z_vec):
-    r_mat, r_aug = [], []
+    # the columns of the extension touched by z: x_k z_b for every k, then z_a z_b and z_a
+    offsets = _pair_offsets(n_qubits)
+    ones = [a for a in range(n_qubits) if z_vec[a]]
+    mat_rows, aug_rows = matrix.rows, augmented.rows
+
+    def reduced_column(positions):
+        col, a_col = 0, 0
+        for pos in positions:
+            col ^= 1 << pos
+            if pos in pivots:
+                col ^= mat_rows[pivots[pos]]
+                a_col ^= aug_rows[pivots[pos]]
+        return col, a_col
+
+    r_mat, r_aug = GF2Matrix(0, matrix.n_cols), GF2Matrix(0, augmented.n_cols)
     for k in range(n_qubits):
-        col = BitVector(len(matrix[0]))
-        a_col = BitVector(len(augmented[0]))
-        idx = 0
-        for a in reversed(range(n_qubits)):
-            for b in range(a):
-                if (a == k and z_vec[b]) or (b == k and z_vec[a]):
-                    col.xor_bit(n_qubits + idx)
-                    if n_qubits + idx in pivots:
-                        col.xor(matrix[pivots[n_qubits + idx]])
-                        a_col.xor(augmented[pivots[n_qubits + idx]])
-                idx += 1
+        col, a_col = reduced_column(n_qubits + offsets[min(k, b)] + max(k, b) for b in ones if b != k)
         r_mat.append(col)
         r_aug.append(a_col)
 
     # Last column for quadratic terms
-    col = BitVector(len(matrix[0]))
-    a_col = BitVector(len(augmented[0]))
-    idx = 0
-    for a in reversed(range(n_qubits)):
-        for b in range(a):
-            if z_vec[a] and z_vec[b]:
-                col.xor_bit(n_qubits + idx)
-                if n_qubits + idx in pivots:
-                    col.xor(matrix[pivots[n_qubits + idx]])
-                    a_col.xor(augmented[pivots[n_qubits + idx]])
-            idx += 1
-        if z_vec[a]:
-            col.xor_bit(a)
-            if a in pivots:
-                col.xor(matrix[pivots[a]])
-                a_col.xor(augmented[pivots[a]])
+    col, a_col = reduced_column(itertools.chain(
+        (n_qubits + offsets[a] + b for a, b in itertools.combinations(ones, 2)), ones
+    ))
     r_mat.append(col)
     r_aug.append(a_col)
     return r_mat,r_aug
 
-def tohpe(table: list['BitVector'], n_qubits: int) -> list['BitVector']:
+def tohpe(table: list['BitVector'], n_qubits: int, seed: int | None = None) -> list['BitVector']:
     """
     Simplified and commented version of TOHPE algorithm.
     Attempts to reduce the number of phase polynomial terms.
+
+    With a seed, the rows are shuffled and ties between the best
+    reductions are broken at random, reproducibly for the same seed.
     """
-    def clear_column(i: int, matrix: list['BitVector'], augmented: list['BitVector'], pivots: dict[int, int]) -> None:
-        # Remove column i from pivots and clear it from matrix and augmented
-        if i not in pivots:
-            return
-        val = pivots.pop(i)
-        if not augmented[i].get(i):
-            for j in range(len(matrix)):
-                if augmented[j].get(i):
-                    pivots[j] = val
-                    matrix[i], matrix[j] = copy.deepcopy(matrix[j]), copy.deepcopy(matrix[i])
-                    augmented[i], augmented[j] = copy.deepcopy(augmented[j]), copy.deepcopy(augmented[i])
-                    break
-        col, aug_col = copy.deepcopy(matrix[i]), copy.deepcopy(augmented[i])
+    def clear_column(i: int, matrix: GF2Matrix, augmented: GF2Matrix, pivots: dict[int, int]) -> None:
+        # Make row i the only row of the elimination combining table[i], so that it can be replaced
+        bit = 1 << i
+        if not augmented[i] & bit:
+            j = next((j for j in range(len(matrix)) if augmented[j] & bit), None)
+            if j is None:
+                pivots.pop(i, None)
+                return
+            val = pivots.pop(i, None)
+            pivots.pop(j, None)
+            if val is not None:
+                pivots[j] = val
+            matrix.swap_rows(i, j)
+            augmented.swap_rows(i, j)
+        pivots.pop(i, None)
+        col, aug_col = matrix[i], augmented[i]
         for j in range(len(matrix)):
-            if j != i and augmented[j].get(i):
-                matrix[j].xor(col)
-                augmented[j].xor(aug_col)
-
-    matrix = extend_boolean_vectors(table, n_qubits)
+            if j != i and augmented[j] & bit:
+                matrix[j] ^= col
+                augmented[j] ^= aug_col
+
+    # the rows are handled as packed ints and only turned back into BitVectors at the end
+    size = len(table[0]) if table else n_qubits
+    words = [row.to_int() for row in table]
+    rng = None if seed is None else random.Random(seed)
+    if rng is not None:
+        rng.shuffle(words)
+    matrix = GF2Matrix.from_rows(_extend_words(words, size, n_qubits), size + n_qubits * (n_qubits - 1) // 2)
     pivots: dict[int, int] = {}
-    augmented = identity_table(len(table))
+    augmented = identity_table(len(words))
 
     while True:
         y = kernel(matrix, augmented, pivots)
         if y is None:
             break
+        y_word = y.to_int()
 
         # Score possible reductions
-        score_map = {}
-        parity = (y.popcount() & 1) == 1
-        for i, row in enumerate(table):
-            key = tuple(row.get_integer_vec())
-            if (parity and not y.get(i)) or (not parity and y.get(i)):
-                score_map[key] = 1
-
-        for i in range(len(table)):
-            if not y.get(i):
-                continue
-            for j in range(len(table)):
-                if y.get(j):
-                    continue
-                z = copy.deepcopy(table[i])
-                z.xor(table[j])
-                key = tuple(z.get_integer_vec())
+        score_map: dict[int, int] = {}
+        parity = y_word.bit_count() & 1
+        outside, inside = [], []
+        for i, word in enumerate(words):
+            selected = y_word >> i & 1
+            (inside if selected else outside).append(word)
+            if selected != parity:
+                score_map[word] = 1
+
+        for a in inside:
+            for b in outside:
+                key = a ^ b
                 score_map[key] = score_map.get(key, 0) + 2
 
         # Find best reduction
         best_key = None
         best_val = 0
-        for k, v in score_map.items():
-            if v > best_val or (v == best_val and (best_key is None or k < best_key)):
-                best_key, best_val = k, v
+        if rng is None:
+            for k, v in score_map.items():
+                # ties go to the lexicographically smallest vector, the one without the lowest differing bit
+                if v > best_val or (v == best_val and (best_key is None or _lex_less(k, best_key))):
+                    best_key, best_val = k, v
+        elif score_map:
+            best_val = max(score_map.values())
+            best_key = rng.choice([k for k, v in score_map.items() if v == best_val])
         if best_val <= 0:
             break
-        z = BitVector.from_integer_vec(list(best_key))
-        to_update = y.get_boolean_vec()[:len(table)]
+        z = best_key
+        to_update = y_word & ((1 << len(words)) - 1)
 
         # If y has odd parity, append new row to all tables
-        if y.popcount() & 1:
-            new_len = len(table[0].bits)
-            table.append(BitVector(new_len))
-            matrix.append(BitVector(len(matrix[0].bits)))
-            e = BitVector(len(table))
-            e.xor_bit(len(augmented))
-            augmented.append(e)
-            to_update.append(True)
+        if parity:
+            to_update |= 1 << len(words)
+            words.append(0)
+            matrix.append(0)
+            augmented.add_columns()
+            augmented.append(1 << len(augmented))
 
         # Apply reduction
-        affected = [idx for idx, f in enumerate(to_update) if f]
-        for idx in affected:
-            table[idx].xor(z)
+        for idx in range(len(words)):
+            if to_update >> idx & 1:
+                words[idx] ^= z
 
-        if len(to_update) < len(table):
-            to_update.extend([False] * (len(table) - len(to_update)))
-            
         # Remove duplicate or zero rows, keep tables in sync
-        remove_idxs = sorted(to_remove(table), reverse=True)
+        remove_idxs = sorted(_to_remove_words(words), reverse=True)
         for idx in remove_idxs:
-            last = len(table) - 1
+            clear_column(idx, matrix, augmented, pivots)
+            last = len(words) - 1
             if idx != last:
-                table[idx], table[last]           = table[last], table[idx]
-                matrix[idx], matrix[last]         = matrix[last], matrix[idx]
-                augmented[idx], augmented[last]   = augmented[last], augmented[idx]
-                to_update[idx], to_update[last]   = to_update[last], to_update[idx]
-            table.pop()
+                words[idx], words[last] = words[last], words[idx]
+                if (to_update >> idx ^ to_update >> last) & 1:
+                    to_update ^= 1 << idx | 1 << last
+                matrix.swap_rows(idx, last)
+                augmented.swap_rows(idx, last)
+            words.pop()
             matrix.pop()
             augmented.pop()
-            to_update.pop()
+            to_update &= (1 << last) - 1
 
             if last in pivots:
                 pivots[idx] = pivots.pop(last)
 
-            for row in augmented:
-                if row.get(idx) != row.get(last):
-                    row.xor_bit(idx)
-                if row.get(last):
-                    row.xor_bit(last)
-                row.bits.pop()
-                
-        # Truncate augmented rows to match table length
-        for row in augmented:
-            row.bits = row.bits[:len(table)]
+            augmented.swap_columns(idx, last)
+            augmented.truncate_columns(last)
 
         # Update matrix and augmented for affected rows
-        for idx in affected:
-            if idx >= len(table):  # skip if row was removed
+        for idx in range(len(words)):
+            if not to_update >> idx & 1:
                 continue
             clear_column(idx, matrix, augmented, pivots)
-            matrix[idx] = copy.deepcopy(table[idx])
-            
-            e = BitVector(len(table))
-            e.xor_bit(idx)
-            augmented[idx] = e
-            
-            t_vec = table[idx].get_boolean_vec()[:n_qubits]
-            ext = []
-            for _ in range(n_qubits):
-                ext += t_vec.copy() if t_vec and t_vec.pop(0) else [False] * len(t_vec)
-            matrix[idx].extend_vec(ext, n_qubits)
+            matrix[idx] = _extend_word(words[idx], size, n_qubits)
+            augmented[idx] = 1 << idx
 
+    table[:] = [BitVector.from_int(word, size) for word in words]
     return table
 
 class SlicedCircuit:
@@ -349,16 +568,13 @@ class SlicedCircuit:
         sliced = SlicedCircuit(circ.n_qubits)
 
         first_t = circ.first_t
-        for g in circ.gates[:first_t]:
+        for g in circ.view(stop=first_t):
             sliced.init_circuit.add_gate(g)
 
         tab = ColumnMajorTableau(circ.n_qubits)
         poly = PhasePolynomial(circ.n_qubits)
 
-        for idx, gate in enumerate(circ.gates):
-            if idx < first_t:
-                continue
-
+        for gate in circ.view(first_t):
             name = gate["name"]
             if name == "HAD":
                 if poly.table:
@@ -375,7 +591,6 @@ class SlicedCircuit:
             elif name == "S":
                 q = gate["target"]
                 tab.prepend_s(q)
-                tab.prepend_z(q)
 
             elif name == "CNOT":
                 tab.prepend_cx([gate["ctrl"], gate["target"]])
@@ -386,10 +601,9 @@ class SlicedCircuit:
                     sliced.tableau_vec.append(tab)
                     tab = ColumnMajorTableau(circ.n_qubits)
 
-                poly.table.append(copy.deepcopy(tab.stabs[q].z))
+                poly.table.append(tab.stabs[q].z.copy())
                 if tab.stabs[q].sign:
                     tab.prepend_s(q)
-                    tab.prepend_z(q)
 
             else:
                 raise NotImplementedError(f"Unsupported gate {name}")
@@ -399,14 +613,17 @@ class SlicedCircuit:
         sliced.tableau_vec.append(tab)
         return sliced
 
-    def t_opt(self, optimizer: str):
+    def t_opt(self, optimizer: str, max_workers: int = 1, seed: int | None = None):
         _circuit = copy.deepcopy(self.init_circuit)
+        # every slice gets its own seed drawn from seed
+        rng = None if seed is None else random.Random(seed)
         for i in range(len(self.phase_polynomials)):
             table = self.phase_polynomials[i].table[:]
+            slice_seed = None if rng is None else rng.getrandbits(64)
             if optimizer == "FastTODD":
-                self.phase_polynomials[i].table = fast_todd(table[:], self.n_qubits)
+                self.phase_polynomials[i].table = fast_todd(table[:], self.n_qubits, max_workers, slice_seed)
             elif optimizer == "TOHPE":
-                self.phase_polynomials[i].table = tohpe(table[:], self.n_qubits)
+                self.phase_polynomials[i].table = tohpe(table[:], self.n_qubits, slice_seed)
             else:
                 print(f"Optimizer not implemented: {optimizer}")
                 raise SystemExit(1)
@@ -480,7 +697,7 @@ def h_opt_reverse(c_in: QuantumCircuit) -> RowMajorTableau:
         elif name == "Z":
             tab.prepend_z(q["target"])
         elif name == "S":
-            tab.prepend_s(q["target"]); tab.prepend_z(q["target"])
+            tab.prepend_s(q["target"])
         elif name == "CNOT":
             tab.prepend_cx([q["ctrl"], q["target"]])
     for gate in reversed(c_in.gates):
@@ -492,7 +709,7 @@ def h_opt_reverse(c_in: QuantumCircuit) -> RowMajorTableau:
         elif name == "Z":
             tab.prepend_z(q["target"])
         elif name == "S":
-            tab.prepend_s(q["target"])
+            tab.prepend_s(q["target"]); tab.prepend_z(q["target"])
         elif name == "CNOT":
             tab.prepend_cx([q["ctrl"], q["target"]])
         elif name in {"T", "Tdg"}:
@@ -517,7 +734,7 @@ def internal_h_opt(c_in: QuantumCircuit) -> QuantumCircuit:
         elif name == "Z":
             tab.prepend_z(q["target"])
         elif name == "S":
-            tab.prepend_s(q["target"]); tab.prepend_z(q["target"])
+            tab.prepend_s(q["target"])
         elif name == "CNOT":
             tab.prepend_cx([q["ctrl"], q["target"]])
         elif name in {"T", "Tdg"}:
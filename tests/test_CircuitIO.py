@@ -0,0 +1,247 @@
+import copy
+import os
+import pickle
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
+
+import pytest
+
+from qcs import QuantumCircuit, QcReader, QasmReader, CircuitCache, ResultCache
+
+QC_SAMPLE = """
+# a comment
+.v a b c d e
+.i a b
+.o e
+
+BEGIN
+T* a
+S* b  # trailing comment
+Z a b
+Z a b c
+tof a b c d e
+H a
+END
+"""
+
+QASM_SAMPLE = """
+OPENQASM 2.0;
+include "qelib1.inc";  // the standard gates
+qreg a[2];
+qreg b[2];
+creg c[2];
+h a;
+sdg b[1]; cx a[0],
+    b[0];
+ccx a[0], a[1], b[1];
+barrier a;
+"""
+
+
+def test_01_qc_reader_streams_gates():
+    reader = QcReader(QC_SAMPLE.splitlines())
+    assert reader.n_qubits == 5
+    assert (reader.inputs, reader.outputs) == (["a", "b"], ["e"])
+
+    rows = list(reader)
+    assert reader.n_qubits == 7 and reader.ancillas == [5, 6]
+    assert len(rows) == 1 + 2 + 1 + 3 + 5 + 1
+
+
+def test_02_from_qc():
+    circuit = QuantumCircuit.from_qc(QC_SAMPLE)
+    assert circuit.n_qubits == 7
+    assert circuit.gates[:4] == [
+        {"name": "Tdg", "target": 0},
+        {"name": "S", "target": 1},
+        {"name": "Z", "target": 1},
+        {"name": "CZ", "ctrl": 0, "target": 1},
+    ]
+    assert circuit.gates[7:12] == [
+        {"name": "Tof", "ctrl1": 0, "ctrl2": 1, "target": 5},
+        {"name": "Tof", "ctrl1": 2, "ctrl2": 5, "target": 6},
+        {"name": "Tof", "ctrl1": 3, "ctrl2": 6, "target": 4},
+        {"name": "Tof", "ctrl1": 2, "ctrl2": 5, "target": 6},
+        {"name": "Tof", "ctrl1": 0, "ctrl2": 1, "target": 5},
+    ]
+    assert QuantumCircuit.from_qc(QC_SAMPLE, compact=True).gates == circuit.gates
+
+    roundtrip = QuantumCircuit.from_qc(circuit.to_qc())
+    assert roundtrip.n_qubits == circuit.n_qubits and roundtrip.num_t == circuit.num_t
+
+
+def test_03_qc_reader_errors():
+    with pytest.raises(ValueError, match="undeclared qubit"):
+        QuantumCircuit.from_qc(".v a\nBEGIN\nH b\nEND\n")
+    with pytest.raises(ValueError, match="Missing END"):
+        QuantumCircuit.from_qc(".v a\nBEGIN\nH a\n")
+
+
+def test_04_qasm_reader():
+    reader = QasmReader([QASM_SAMPLE])
+    assert reader.registers == {"a": (0, 2), "b": (2, 2)} and reader.n_qubits == 4
+    assert list(reader.gates()) == [
+        {"name": "HAD", "target": 0},
+        {"name": "HAD", "target": 1},
+        {"name": "S", "target": 3},
+        {"name": "Z", "target": 3},
+        {"name": "CNOT", "ctrl": 0, "target": 2},
+        {"name": "Tof", "ctrl1": 0, "ctrl2": 1, "target": 3},
+    ]
+    # statements may be split anywhere across lines
+    assert list(QasmReader(QASM_SAMPLE.splitlines(keepends=True))) == list(QasmReader([QASM_SAMPLE]))
+
+
+def test_05_qasm_roundtrip():
+    circuit = QuantumCircuit.from_qc(QC_SAMPLE)
+    roundtrip = QuantumCircuit.from_qasm(circuit.to_qasm(), compact=True)
+    assert roundtrip.n_qubits == circuit.n_qubits
+    assert roundtrip.gates == circuit.gates
+
+
+def test_06_qasm_reader_errors():
+    header = "OPENQASM 2.0;\nqreg q[2];\n"
+    with pytest.raises(ValueError, match="out of range"):
+        QuantumCircuit.from_qasm(header + "cx q[0], q[2];\n")
+    with pytest.raises(ValueError, match="Unsupported QASM statement"):
+        QuantumCircuit.from_qasm(header + "rz(0.5) q[0];\n")
+    with pytest.raises(ValueError, match="Unterminated"):
+        QuantumCircuit.from_qasm(header + "h q[0]\n")
+
+
+def test_07_streaming_writers():
+    circuit = QuantumCircuit.from_qc(QC_SAMPLE)
+    for write, to_str in ((circuit.write_qc, circuit.to_qc), (circuit.write_qasm, circuit.to_qasm)):
+        text, binary = StringIO(), BytesIO()
+        write(text)
+        write(binary)
+        assert text.getvalue() == binary.getvalue().decode() == to_str()
+    circuit.add_gate({"name": "CCZ", "ctrl1": 0, "ctrl2": 1, "target": 2})
+    with pytest.raises(NotImplementedError):
+        circuit.to_qasm()
+
+
+def test_08_binary_format(tmp_path):
+    circuit = QuantumCircuit.from_qc(QC_SAMPLE)
+    circuit.swap_qubits(0, 1)
+    filename = str(tmp_path / "sample.qcsb")
+    circuit.save_binary(filename)
+
+    loaded = QuantumCircuit.load_binary(filename)
+    assert loaded.is_compact and loaded.n_qubits == circuit.n_qubits
+    assert loaded.gates == circuit.gates
+    assert loaded.num_t == circuit.num_t
+    assert QuantumCircuit.from_file(filename).gates == circuit.gates
+
+    # the first write copies the mapped columns
+    loaded.add_h(0)
+    assert QuantumCircuit.load_binary(filename).num_gates == circuit.num_gates
+
+    (tmp_path / "bad.qcsb").write_bytes(b"QCSX" + bytes(28))
+    with pytest.raises(ValueError, match="not a QCSB file"):
+        QuantumCircuit.load_binary(str(tmp_path / "bad.qcsb"))
+
+
+def test_09_circuit_cache(tmp_path):
+    source = tmp_path / "sample.qc"
+    source.write_text(QC_SAMPLE)
+    cache = CircuitCache(str(tmp_path / "cache"))
+
+    entry = cache.entry(str(source))
+    assert cache.load(str(source)).gates == QuantumCircuit.from_qc(QC_SAMPLE).gates
+    # a new mtime with the same content reuses the entry
+    os.utime(source, ns=(0, 0))
+    assert cache.entry(str(source)) == entry
+    source.write_text(QC_SAMPLE.replace("H a", "H b"))
+    assert cache.entry(str(source)) != entry
+
+    assert cache.warm(str(tmp_path), max_workers=2) == 1
+    CircuitCache(cache.directory, max_bytes=0).evict()
+    assert not any(name.endswith((".qcsb", ".ref")) for name in os.listdir(cache.directory))
+
+
+def test_10_result_cache(tmp_path, monkeypatch):
+    circuit = QuantumCircuit()
+    circuit.request_qubits(3)
+    circuit.add_toffoli(0, 1, 2)
+    circuit.add_toffoli(0, 1, 2)
+    cache = ResultCache(str(tmp_path / "results"))
+
+    result = cache.apply(circuit, "t_count_optimize")
+    assert cache.apply(circuit, "t_count_optimize").gates == result.gates
+    # options are bound to the signature, a spelled-out default shares the entry
+    cache.apply(circuit, "t_count_optimize", optimizer="FastTODD")
+    assert cache.stats == {"hits": 2, "disk_hits": 0, "misses": 1, "entries": 1}
+    cache.apply(circuit, "t_count_optimize", seed=1)
+    assert cache.stats == {"hits": 2, "disk_hits": 0, "misses": 2, "entries": 2}
+    with pytest.raises(TypeError):
+        cache.apply(circuit, "t_count_optimize", optimizer_name="TOHPE")
+
+    # a new cache reads the results back from disk
+    cache = ResultCache(cache.directory)
+    assert cache.get(circuit, "t_count_optimize").gates == result.gates
+    assert cache.get(circuit, "run_zx") is None
+    assert cache.stats == {"hits": 0, "disk_hits": 1, "misses": 1, "entries": 1}
+
+    # a new version of the pass misses the old results
+    monkeypatch.setattr(QuantumCircuit.t_count_optimize, "cache_version", 2, raising=False)
+    assert cache.get(circuit, "t_count_optimize") is None
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: cache.put(circuit, "t_count_optimize", result), range(32)))
+    assert not any(name.endswith(".tmp") for name in os.listdir(cache.directory))
+    ResultCache(cache.directory, max_bytes=0).put(circuit, "t_count_optimize", result)
+    assert not any(name.endswith(".qcsb") for name in os.listdir(cache.directory))
+
+
+def test_11_pickle_memory_mapped_circuit(tmp_path):
+    source = tmp_path / "sample.qc"
+    source.write_text(QC_SAMPLE)
+    circuit = CircuitCache(str(tmp_path / "cache")).load(str(source), compact=True)
+    assert isinstance(circuit.gates.ops, memoryview)
+    for clone in (pickle.loads(pickle.dumps(circuit)), copy.deepcopy(circuit)):
+        assert clone.n_qubits == circuit.n_qubits
+        assert clone.gates == circuit.gates
+    # the source keeps its memory map
+    assert isinstance(circuit.gates.ops, memoryview)
+
+
+def test_12_writers_on_text_mode_tempfiles():
+    for circuit in (QuantumCircuit.from_qc(QC_SAMPLE), QuantumCircuit.from_qc(QC_SAMPLE, compact=True)):
+        for write, to_str in ((circuit.write_qc, circuit.to_qc), (circuit.write_qasm, circuit.to_qasm)):
+            with tempfile.NamedTemporaryFile("w+") as named, tempfile.SpooledTemporaryFile(mode="w+") as spooled:
+                for f in (named, spooled):
+                    write(f)
+                    f.seek(0)
+                    assert f.read() == to_str()
+            with tempfile.SpooledTemporaryFile() as spooled:
+                write(spooled)
+                spooled.seek(0)
+                assert spooled.read().decode() == to_str()
+
+
+def test_13_circuit_cache_evicts_on_store(tmp_path, monkeypatch):
+    source = tmp_path / "sample.qc"
+    source.write_text(QC_SAMPLE)
+    cache = CircuitCache(str(tmp_path / "cache"))
+    evictions = []
+    monkeypatch.setattr(cache, "evict", lambda: evictions.append(1))
+    cache.load(str(source))
+    cache.load(str(source))
+    assert len(evictions) == 1
+
+    # threads of one process store the same entry without clashing temporary files
+    source.write_text(QC_SAMPLE.replace("H a", "H b"))
+    with ThreadPoolExecutor(8) as pool:
+        assert len(set(pool.map(lambda _: cache.entry(str(source)), range(32)))) == 1
+    assert not any(name.endswith(".tmp") for name in os.listdir(cache.directory))
+
+
+def test_14_from_file_accepts_paths(tmp_path):
+    source = tmp_path / "sample.qc"
+    source.write_text(QC_SAMPLE)
+    circuit = QuantumCircuit.from_qc(QC_SAMPLE)
+    assert QuantumCircuit.from_file(source).gates == circuit.gates
+    (tmp_path / "sample.qasm").write_text(circuit.to_qasm())
+    assert QuantumCircuit.from_file(tmp_path / "sample.qasm", compact=True).gates == circuit.gates
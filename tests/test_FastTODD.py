@@ -0,0 +1,312 @@
+import itertools
+import os
+import random
+import shutil
+import sys
+
+import numpy as np
+import pytest
+
+from qcs import BitVector, CircuitCache, ExternalOptimizer, ExternalOptimizerError, GF2Matrix, QuantumCircuit
+from qcs import best_of_n, fast_todd, multi_start_seeds
+from qcs import tohpe as tohpe_optimizer
+
+_MATRICES = {
+    "HAD": np.array([[1, 1], [1, -1]]) / np.sqrt(2),
+    "X": np.array([[0, 1], [1, 0]]),
+    "Z": np.diag([1, -1]),
+    "S": np.diag([1, 1j]),
+    "T": np.diag([1, np.exp(1j * np.pi / 4)]),
+    "Tdg": np.diag([1, np.exp(-1j * np.pi / 4)]),
+}
+
+
+def _unitary(circuit: QuantumCircuit) -> np.ndarray:
+    n = circuit.n_qubits
+    state = np.eye(2**n, dtype=complex).reshape([2] * n + [2**n])
+    for gate in circuit.gates:
+        name, target = gate["name"], gate["target"]
+        if name in _MATRICES:
+            state = np.moveaxis(np.tensordot(_MATRICES[name], state, axes=(1, target)), 0, target)
+            continue
+        controls = [gate["ctrl"]] if "ctrl" in gate else [gate["ctrl1"], gate["ctrl2"]]
+        index = tuple(1 if q in controls else slice(None) for q in range(n))
+        sub = state[index]
+        axis = target - sum(q < target for q in controls)
+        if name in ("CNOT", "Tof"):
+            state[index] = np.flip(sub, axis=axis).copy()
+        else:
+            state[index] = np.moveaxis(np.tensordot(_MATRICES["Z"], sub, axes=(1, axis)), 0, axis)
+    return state.reshape(2**n, 2**n)
+
+
+def _equivalent(a: QuantumCircuit, b: QuantumCircuit) -> bool:
+    ua, ub = _unitary(a), _unitary(b)
+    k = np.argmax(np.abs(ua[:, 0]))
+    return np.allclose(ua * (ub[k, 0] / ua[k, 0]), ub)
+
+
+def _signature(table: list[BitVector], n: int) -> set:
+    return {
+        (a, b, c)
+        for a, b, c in itertools.combinations_with_replacement(range(n), 3)
+        if sum(row.get(a) and row.get(b) and row.get(c) for row in table) % 2
+    }
+
+
+def _random_table(n: int, size: int, rng: random.Random) -> list[BitVector]:
+    table = []
+    for _ in range(size):
+        row = BitVector.from_integer_vec([rng.randint(0, 1) for _ in range(n)])
+        if row.popcount():
+            table.append(row)
+    return table
+
+
+@pytest.mark.parametrize("optimizer", [tohpe_optimizer, fast_todd])
+def test_01_signature_is_preserved(optimizer):
+    rng = random.Random(0)
+    for _ in range(20):
+        table = _random_table(5, 20, rng)
+        reduced = optimizer([BitVector.from_integer_vec(row.get_integer_vec()) for row in table], 5)
+        assert len(reduced) <= len(table)
+        assert _signature(reduced, 5) == _signature(table, 5)
+
+
+def test_02_fast_todd_optimize_in_process():
+    rng = random.Random(1)
+    for _ in range(10):
+        circuit = QuantumCircuit()
+        circuit.request_qubits(4)
+        for _ in range(16):
+            q = rng.sample(range(4), 3)
+            kind = rng.choice(["h", "s", "t", "tdg", "x", "cnot", "cz", "toffoli"])
+            if kind in ("cnot", "cz"):
+                getattr(circuit, f"add_{kind}")(q[0], q[1])
+            elif kind == "toffoli":
+                circuit.add_toffoli(*q)
+            else:
+                getattr(circuit, f"add_{kind}")(q[0])
+        optimized = circuit.fast_todd_optimize(engine="python")
+        assert optimized.n_qubits == circuit.n_qubits
+        assert _equivalent(circuit, optimized)
+
+
+def test_03_fast_todd_optimize_toffoli_ladder():
+    circuit = QuantumCircuit()
+    circuit.request_qubits(3)
+    for _ in range(2):
+        circuit.add_toffoli(0, 1, 2)
+    # two identical Toffoli gates cancel, no T gate is left
+    assert circuit.fast_todd_optimize(engine="python").num_t == 0
+    with pytest.raises(ValueError, match="Unknown FastTODD engine"):
+        circuit.fast_todd_optimize(engine="rust")
+
+
+def _fake_binary(tmp_path, body: str) -> str:
+    """An executable standing in for quantum_circuit_optimization, argv[-1] is the input file."""
+    path = tmp_path / "fake_optimizer"
+    path.write_text(f"#!{sys.executable}\nimport shutil, sys, time\n{body}\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_04_external_optimizer_pool(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    binary = _fake_binary(tmp_path, "shutil.copy(sys.argv[-1], 'output.qc')")
+    circuits = []
+    for n in range(2, 6):
+        circuit = QuantumCircuit()
+        circuit.request_qubits(n)
+        circuit.add_toffoli(0, 1, n - 1)
+        circuits.append(circuit)
+
+    with ExternalOptimizer(binary, timeout=60, max_workers=3) as optimizer:
+        results = optimizer.map(circuits)
+    assert [result.to_qc() for result in results] == [circuit.to_qc() for circuit in circuits]
+    # nothing is left in the working directory
+    assert sorted(os.listdir(tmp_path)) == ["fake_optimizer"]
+
+
+def test_05_external_optimizer_errors(tmp_path):
+    circuit = QuantumCircuit()
+    circuit.request_qubits(1)
+    circuit.add_t(0)
+    failing = _fake_binary(tmp_path, "sys.stderr.write('bad gate'); sys.exit(3)")
+    with pytest.raises(ExternalOptimizerError, match="code 3: bad gate"):
+        ExternalOptimizer(failing).run(circuit)
+    with pytest.raises(ExternalOptimizerError, match="timed out"):
+        ExternalOptimizer(_fake_binary(tmp_path, "time.sleep(30)"), timeout=0.5).run(circuit)
+    with pytest.raises(ExternalOptimizerError, match="not found"):
+        ExternalOptimizer("no_such_optimizer_binary").run(circuit)
+
+
+def test_06_packed_bit_vector():
+    rng = random.Random(2)
+    for _ in range(50):
+        a_bits = [rng.randint(0, 1) for _ in range(rng.randint(0, 70))]
+        b_bits = [rng.randint(0, 1) for _ in range(rng.randint(0, 70))]
+        a, b = BitVector.from_integer_vec(a_bits), BitVector.from_integer_vec(b_bits)
+        m = min(len(a_bits), len(b_bits))
+        assert a.get_integer_vec() == a_bits and len(a) == len(a_bits)
+        assert a.popcount() == sum(a_bits)
+        assert a.get_first_one() == (a_bits.index(1) if 1 in a_bits else 0)
+        assert a.get_all_ones(40) == [i for i, v in enumerate(a_bits[:40]) if v]
+
+        xor = a.copy()
+        xor.xor(b)
+        assert xor.get_integer_vec() == [u ^ v for u, v in zip(a_bits, b_bits)] + a_bits[m:]
+        and_ = a.copy()
+        and_.and_(b)
+        assert and_.get_integer_vec() == [u & v for u, v in zip(a_bits, b_bits)] + a_bits[m:]
+        assert a.get_integer_vec() == a_bits
+
+        a.extend_vec(b_bits, len(b_bits))
+        a.append(True)
+        assert a.get_integer_vec() == a_bits + b_bits + [1]
+        assert a.pop() and len(a) == len(a_bits) + len(b_bits)
+        a.truncate(len(a_bits))
+        assert a.to_int() == int("".join(map(str, reversed(a_bits))) or "0", 2)
+        assert repr(a) == "".join(map(str, a_bits))
+
+
+def test_07_gf2_matrix():
+    rng = random.Random(3)
+    for _ in range(30):
+        n_rows, n_cols = rng.randint(1, 40), rng.randint(2, 30)
+        rows = [rng.getrandbits(n_cols) for _ in range(n_rows)]
+        matrix = GF2Matrix.from_rows(rows, n_cols)
+        assert [v.to_int() for v in matrix.to_bit_vectors()] == rows
+        assert GF2Matrix.from_bit_vectors(matrix.to_bit_vectors()).rows == rows
+
+        transposed = matrix.transpose()
+        assert (len(transposed), transposed.n_cols) == (n_cols, n_rows)
+        assert all(transposed.get(j, i) == matrix.get(i, j) for i in range(n_rows) for j in range(n_cols))
+        assert transposed.transpose().rows == rows
+
+        i, j = rng.sample(range(n_cols), 2)
+        swapped = matrix.copy()
+        swapped.swap_columns(i, j)
+        assert all(swapped.get(r, i) == matrix.get(r, j) and swapped.get(r, j) == matrix.get(r, i) for r in range(n_rows))
+        swapped.truncate_columns(j)
+        assert swapped.n_cols == j and all(row < 1 << j for row in swapped)
+        assert matrix.rows == rows
+
+
+def test_08_tohpe_keeps_the_input_table():
+    tohpe_module = sys.modules["qcs.tohpe"]
+    rng = random.Random(4)
+    for _ in range(10):
+        circuit = QuantumCircuit()
+        circuit.request_qubits(4)
+        for _ in range(16):
+            q = rng.sample(range(4), 3)
+            kind = rng.choice(["h", "s", "t", "x", "cnot", "toffoli"])
+            if kind == "cnot":
+                circuit.add_cnot(q[0], q[1])
+            elif kind == "toffoli":
+                circuit.add_toffoli(*q)
+            else:
+                getattr(circuit, f"add_{kind}")(q[0])
+        sliced = tohpe_module.SlicedCircuit.from_circ(tohpe_module.internal_h_opt(circuit))
+        # the Clifford correction is computed from the table TOHPE was given
+        assert _equivalent(circuit, sliced.t_opt("TOHPE"))
+
+
+def test_09_parallel_fast_todd_matches_serial(monkeypatch):
+    monkeypatch.setattr(sys.modules["qcs.tohpe"], "PARALLEL_MIN_PAIRS", 1)
+    rng = random.Random(5)
+    for _ in range(5):
+        table = _random_table(6, 24, rng)
+        serial = fast_todd(table, 6)
+        parallel = fast_todd(table, 6, max_workers=2)
+        assert [row.to_int() for row in parallel] == [row.to_int() for row in serial]
+
+
+def test_10_batched_scoring_matches_loop(monkeypatch):
+    tohpe_module = sys.modules["qcs.tohpe"]
+    rng = random.Random(6)
+    tables = [_random_table(7, 30, rng) for _ in range(5)]
+    loop = [[row.to_int() for row in fast_todd(table, 7)] for table in tables]
+    monkeypatch.setattr(tohpe_module, "BATCHED_MIN_ROWS", 1)
+    assert [[row.to_int() for row in fast_todd(table, 7)] for table in tables] == loop
+
+    # rows of more than one word, all in one hash bucket
+    words = list({rng.getrandbits(100) | 1 for _ in range(20)})
+    packed = tohpe_module._PackedTable([BitVector.from_int(word, 100) for word in words])
+    monkeypatch.setattr(packed, "_hash", lambda rows: np.zeros(len(rows), dtype=np.uint64))
+    packed.sorted_hashes[:] = 0
+    queries = packed.pack(words[::-1] + [0, 2])
+    assert packed.find(queries).tolist() == list(range(len(words)))[::-1] + [-1, -1]
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 9, 70])
+def test_11_quadratic_extension(n):
+    tohpe_module = sys.modules["qcs.tohpe"]
+    rng = random.Random(n)
+    words = [rng.getrandbits(n) for _ in range(10)]
+    extended = [row.to_int() for row in tohpe_module.extend_boolean_vectors([BitVector.from_int(w, n) for w in words], n)]
+    for word, row in zip(words, extended):
+        bits = [word >> a & 1 for a in range(n)]
+        products = [bits[a] & bits[b] for a, b in itertools.combinations(range(n), 2)]
+        assert BitVector.from_int(row, n + len(products)).get_integer_vec() == bits + products
+        assert tohpe_module._extend_word(word, n, n) == row
+
+
+def test_12_seeded_multi_start():
+    rng = random.Random(8)
+    table = _random_table(6, 30, rng)
+    for optimizer in (tohpe_optimizer, fast_todd):
+        runs = [[row.to_int() for row in optimizer(table[:], 6, seed=seed)] for seed in (1, 1, 2)]
+        assert runs[0] == runs[1]
+        assert _signature([BitVector.from_int(word, 6) for word in runs[2]], 6) == _signature(table, 6)
+
+    circuit = QuantumCircuit()
+    circuit.request_qubits(4)
+    for _ in range(12):
+        circuit.add_toffoli(*rng.sample(range(4), 3))
+        circuit.add_h(rng.randrange(4))
+    assert _equivalent(circuit, circuit.fast_todd_optimize(engine="python", seed=3))
+    best, seed = best_of_n(circuit, n_starts=4, seed=10, max_workers=2)
+    assert best.num_t <= circuit.fast_todd_optimize(engine="python").num_t
+    assert seed in multi_start_seeds(10, 4)
+    # nearby base seeds share no start
+    assert set(multi_start_seeds(10, 8)[1:]).isdisjoint(multi_start_seeds(11, 8)[1:])
+    assert multi_start_seeds(10, 4) == multi_start_seeds(10, 8)[:4]
+    assert circuit.fast_todd_optimize(engine="python", seed=seed).to_qc() == best.to_qc()
+
+
+def test_13_multi_start_replay_and_budget(tmp_path):
+    rng = random.Random(13)
+    circuit = QuantumCircuit()
+    circuit.request_qubits(4)
+    for _ in range(10):
+        circuit.add_toffoli(*rng.sample(range(4), 3))
+        circuit.add_h(rng.randrange(4))
+    best, seed = best_of_n(circuit, n_starts=3, seed=20, max_workers=2, optimizer="TOHPE")
+    assert circuit.t_count_optimize("TOHPE", seed=seed).to_qc() == best.to_qc()
+    with pytest.raises(ValueError):
+        circuit.t_count_optimize("QuickTODD")
+
+    # with no time left a start is still returned
+    best, seed = best_of_n(circuit, n_starts=3, time_budget=0, max_workers=1)
+    assert _equivalent(circuit, best)
+    assert circuit.t_count_optimize(seed=seed).to_qc() == best.to_qc()
+
+    # memory-mapped circuits are sent to the pool as arrays
+    source = tmp_path / "sample.qc"
+    source.write_text(circuit.to_qc())
+    mapped = CircuitCache(str(tmp_path / "cache")).load(str(source), compact=True)
+    best, seed = best_of_n(mapped, n_starts=2, max_workers=2)
+    assert best.is_compact
+    assert mapped.t_count_optimize(seed=seed).to_qc() == best.to_qc()
+
+
+@pytest.mark.skipif(shutil.which("quantum_circuit_optimization") is None, reason="optimizer binary not installed")
+@pytest.mark.parametrize("name", ["tof_3", "barenco_tof_3", "tof_4", "barenco_tof_4"])
+def test_14_default_engine_t_count(name):
+    circuit = QuantumCircuit.from_file(os.path.join(os.path.dirname(__file__), "..", "data", "input", "qc", f"{name}.qc"))
+    optimized = circuit.fast_todd_optimize()
+    # the default pipeline must not do worse than ZX, nor than the in-process engine
+    assert optimized.num_t <= circuit.run_zx().num_t
+    assert optimized.num_t <= circuit.fast_todd_optimize(engine="python").num_t
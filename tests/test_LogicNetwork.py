@@ -0,0 +1,122 @@
+import pytest
+
+from qcs import LogicNetwork, VerilogReader, BlifReader
+
+VERILOG_SAMPLE = """
+// Benchmark "top" written by ABC
+module top ( a, b, c,
+    y, z );
+  input  a, b, c;
+  output y, z;
+  wire t; /* a block
+  comment */
+  assign t = a & ~b;
+  assign y = ~t ^ ~c;
+  assign z = (a | b) & c ^ 1'b1;
+endmodule
+"""
+
+BLIF_SAMPLE = """
+.model top  # written by ABC
+.inputs a b \\
+  c
+.outputs y z
+.names new_n0
+.names a b t
+10 1
+.names t c y
+01 1
+10 1
+.names a b new_n0 c z
+1--1 1
+-1-1 1
+.end
+"""
+
+
+def _evaluate(network: LogicNetwork, values: dict[str, int]) -> list[int]:
+    values = dict(values)
+    for node in network.gates:
+        gate = network.gates[node]
+        fanins = [values[f] ^ gate.data[f"p{i + 1}"] for i, f in enumerate(gate.inputs)]
+        if gate.is_buf:
+            values[node] = fanins[0]
+        else:
+            value = fanins[0] & fanins[1] if gate.is_and else fanins[0] ^ fanins[1]
+            values[node] = value ^ gate.data["p3"]
+    return [values[po] for po in network.outputs]
+
+
+def test_01_verilog_reader():
+    network = LogicNetwork.from_verilog(VERILOG_SAMPLE)
+    assert network.inputs == ["a", "b", "c"]
+    assert network.num_pos == 2
+    # the multi-operand assignment of z is split into two gates
+    assert len(network.gates) == 4 and network.num_ands == 3
+    assert network.nodes[:4] == ["a", "b", "c", "n0"] and network.node_id("n0") == 3
+    assert network.is_pi("a") and not network.is_pi("n0")
+    assert all(network.is_po(po) for po in network.outputs)
+
+    for x in range(8):
+        a, b, c = x & 1, x >> 1 & 1, x >> 2 & 1
+        t = a & (1 - b)
+        assert _evaluate(network, {"a": a, "b": b, "c": c}) == [t ^ c, ((a | b) & c) ^ 1]
+
+
+def test_02_verilog_topological_order():
+    network = LogicNetwork.from_verilog(
+        "module top(a, b, y); input a, b; output y;\n"
+        "assign y = w ^ a;\nassign w = a & b;\nendmodule\n"
+    )
+    assert network.outputs == ["n1"]
+    assert network.gates["n1"].inputs == ["n0", "a"]
+
+
+def test_03_verilog_errors():
+    with pytest.raises(ValueError, match="never assigned"):
+        list(VerilogReader(["module top(a, y); input a; output y;", "assign y = a & w;", "endmodule"]))
+    with pytest.raises(ValueError, match="Combinational loop"):
+        list(VerilogReader(["module top(a, y); input a; output y;", "assign y = a & y;", "endmodule"]))
+    with pytest.raises(ValueError, match="missing"):
+        VerilogReader(["module top(a, y); input a; output y;", "assign y = (a & a;", "endmodule"])
+
+
+def test_04_blif_reader():
+    network = LogicNetwork.from_blif(BLIF_SAMPLE)
+    assert network.inputs == ["a", "b", "c"]
+    # the constant new_n0 is folded away
+    assert network.num_ands == 4
+    for x in range(8):
+        a, b, c = x & 1, x >> 1 & 1, x >> 2 & 1
+        assert _evaluate(network, {"a": a, "b": b, "c": c}) == [(a & (1 - b)) ^ c, (a | b) & c]
+    with pytest.raises(ValueError, match="unsupported"):
+        BlifReader([".model top", ".latch a b", ".end"])
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_05_blif_aiger_round_trip(binary: bool):
+    network = LogicNetwork.from_verilog(VERILOG_SAMPLE)
+    from_blif = LogicNetwork.from_blif(network.to_blif())
+    from_aiger = LogicNetwork.from_aiger(network.to_aiger(binary))
+    assert from_aiger.inputs == ["a", "b", "c"]
+    # the xor is expanded into three and gates
+    assert from_aiger.num_ands == 6
+    for x in range(8):
+        values = {"a": x & 1, "b": x >> 1 & 1, "c": x >> 2 & 1}
+        expected = _evaluate(network, values)
+        assert _evaluate(from_blif, values) == expected
+        assert _evaluate(from_aiger, values) == expected
+
+
+def test_06_constant_outputs():
+    network = LogicNetwork.from_blif(".model top\n.inputs a b\n.outputs y z w\n.names new_n0\n.names new_n0 y\n1 1\n"
+                                     ".names z\n1\n.names a b w\n11 1\n.end\n")
+    assert network.num_pos == 3
+    for x in range(4):
+        values = {"a": x & 1, "b": x >> 1}
+        expected = [0, 1, values["a"] & values["b"]]
+        assert _evaluate(network, values) == expected
+        assert _evaluate(LogicNetwork.from_aiger(network.to_aiger()), values) == expected
+        assert _evaluate(LogicNetwork.from_blif(network.to_blif()), values) == expected
+    with pytest.raises(ValueError, match="no input"):
+        LogicNetwork.from_verilog("module top(y); output y;\nassign y = 1'b0;\nendmodule\n")
@@ -0,0 +1,237 @@
+from qcs import QuantumCircuit, GateArray
+
+
+def _toy_circuit(compact: bool = False) -> QuantumCircuit:
+    circuit = QuantumCircuit(compact=compact)
+    circuit.request_qubits(3)
+    circuit.add_h(2)
+    circuit.add_toffoli(0, 1, 2)
+    circuit.add_cnot(0, 1)
+    circuit.add_t(1)
+    circuit.add_h(0)
+    circuit.add_tdg(2)
+    circuit.add_cz(1, 2)
+    circuit.add_h(1)
+    return circuit
+
+
+def test_01_compact_gates_match_dicts():
+    circuit = _toy_circuit()
+    compact = _toy_circuit(compact=True)
+
+    assert compact.is_compact and not circuit.is_compact
+    assert isinstance(compact.gates, GateArray)
+    assert compact.gates == circuit.gates
+    assert compact.gates[1] == {"name": "Tof", "ctrl1": 0, "ctrl2": 1, "target": 2}
+    assert compact.gates[2]["ctrl"] == 0
+    assert "ctrl" not in compact.gates[3]
+    assert compact.to_json() == circuit.to_json()
+    assert compact.to_expanded().gates == circuit.gates
+
+
+def test_02_compact_metrics_and_writers():
+    circuit = _toy_circuit()
+    compact = circuit.to_compact()
+
+    for metric in ["num_t", "num_h", "num_2q", "num_internal_h", "first_t", "last_t", "num_gates"]:
+        assert getattr(compact, metric) == getattr(circuit, metric), metric
+    assert compact.to_qc() == circuit.to_qc()
+    assert compact.to_qasm() == circuit.to_qasm()
+
+
+def test_03_compact_copy_append_edit():
+    compact = _toy_circuit(compact=True)
+    duplicate = compact.copy()
+    duplicate.append(_toy_circuit())
+    duplicate.gates[0]["target"] = 1
+
+    assert duplicate.is_compact
+    assert duplicate.num_gates == 2 * compact.num_gates
+    assert compact.gates[0]["target"] == 2
+    assert duplicate.gates[0] == {"name": "HAD", "target": 1}
+
+
+def test_04_snapshot_shares_history():
+    for compact in (False, True):
+        circuit = _toy_circuit(compact=compact)
+        branch = circuit.snapshot()
+        branch.add_t(0)
+        circuit.add_x(2)
+        other = circuit.snapshot()
+        other.swap_qubits(0, 2)
+
+        assert branch.num_gates == circuit.num_gates == 9
+        assert branch.gates[-1] == {"name": "T", "target": 0}
+        assert circuit.gates[-1] == {"name": "X", "target": 2}
+        assert circuit.gates[:8] == _toy_circuit().gates
+        assert other.gates[0] == {"name": "HAD", "target": 0}
+        assert circuit.gates[0] == {"name": "HAD", "target": 2}
+        assert branch.to_qc() == branch.copy().to_qc()
+
+        # editing the gates of a snapshot leaves its source alone, and back
+        source = _toy_circuit(compact=compact)
+        snapshot = source.snapshot()
+        snapshot.gates[0]["target"] = 1
+        source.gates[1]["target"] = 0
+        assert source.gates[0] == {"name": "HAD", "target": 2}
+        assert snapshot.gates[1] == {"name": "Tof", "ctrl1": 0, "ctrl2": 1, "target": 2}
+
+
+def test_05_metrics_follow_edits():
+    circuit = _toy_circuit()
+    assert (circuit.num_t, circuit.num_h, circuit.num_internal_h) == (2, 3, 1)
+
+    circuit.add_t(0)
+    circuit.append(_toy_circuit())
+    assert (circuit.num_t, circuit.num_h, circuit.num_internal_h) == (5, 6, 4)
+    assert circuit.last_t == 15 and circuit.t_depth_of(0) == 1
+
+    circuit.swap_qubits(0, 2)
+    assert circuit.t_depth_of(2) == 1 and circuit.t_depth_of(0) == 2
+
+    circuit.gates.append({"name": "HAD", "target": 0})
+    assert circuit.num_h == 7
+
+    # gates edited in place through .gates, as dicts or GateViews, are counted again
+    def metrics(c):
+        return c.num_t, c.num_h, c.num_internal_h, c.first_t, c.depth, c.t_depth, c.t_depth_of(0)
+
+    for compact in (False, True):
+        circuit = _toy_circuit(compact=compact)
+        assert metrics(circuit) == (2, 3, 1, 3, 6, 1, 0)
+        circuit.gates[0]["name"] = "T"
+        circuit.gates[4]["name"] = "T"
+        assert metrics(circuit)[:4] == (4, 1, 0, 0)
+        assert metrics(circuit) == metrics(circuit.to_expanded())
+
+
+def test_06_layered_depths():
+    circuit = QuantumCircuit()
+    circuit.request_qubits(3)
+    circuit.add_t(0)
+    circuit.add_t(1)
+    circuit.add_cnot(0, 1)
+    circuit.add_t(1)
+    circuit.add_t(2)
+
+    layering = circuit.layering(record_layers=True)
+    assert layering.layers == [0, 0, 1, 2, 0]
+    assert layering.frontier == [2, 3, 1]
+    assert (circuit.depth, circuit.t_depth, circuit.cnot_depth) == (3, 2, 1)
+
+    circuit.add_cnot(2, 1)
+    assert (circuit.depth, circuit.t_depth, circuit.cnot_depth) == (4, 2, 2)
+
+
+def test_07_dag_wires_and_cleanup():
+    circuit = QuantumCircuit()
+    circuit.request_qubits(3)
+    circuit.add_toffoli(0, 1, 2)
+    for _ in range(12):
+        circuit.add_cnot(0, 1)
+    circuit.add_x(0)
+    circuit.add_toffoli(0, 1, 2)
+
+    dag = circuit.to_dag()
+    assert len(dag) == 15
+    assert dag.next_on(0, 2) == 14 and dag.next_on(0, 1) == 1
+    assert list(dag.wire(2)) == [0, 14]
+    assert dag.to_circuit().gates == circuit.gates
+
+    circuit = QuantumCircuit()
+    circuit.request_qubits(3)
+    circuit.add_x(0)
+    for _ in range(12):
+        circuit.add_cnot(1, 2)
+    circuit.add_x(0)
+    circuit.add_toffoli(0, 1, 2)
+    circuit.add_x(0)
+    circuit.add_toffoli(0, 1, 2)
+
+    assert circuit.cleanup().gates == [{"name": "CNOT", "ctrl": 1, "target": 2}] * 13 + [
+        {"name": "X", "target": 0},
+    ]
+
+
+def test_08_lazy_qubit_map():
+    circuit = _toy_circuit()
+    branch = circuit.snapshot()
+    circuit.swap_qubits(0, 2)
+    circuit.add_t(0)
+    circuit.map_qubit(1, 0)
+
+    assert circuit._qubit_map.is_pending
+    assert circuit.t_depth_of(0) == 3 and circuit.t_depth_of(1) == 0
+    assert circuit.gates[1] == {"name": "Tof", "ctrl1": 2, "ctrl2": 0, "target": 0}
+    assert circuit.gates[-1] == {"name": "T", "target": 0}
+    assert not circuit._qubit_map.is_pending
+    assert branch.gates == _toy_circuit().gates
+
+    circuit = QuantumCircuit()
+    circuit.request_qubits(3)
+    circuit.redirect_qubit(0, 2)
+    circuit.add_cnot(0, 1)
+    circuit.redirect_qubit(0, 0)
+    circuit.add_x(0)
+    assert circuit.gates == [{"name": "CNOT", "ctrl": 2, "target": 1}, {"name": "X", "target": 0}]
+
+
+def test_09_circuit_view():
+    circuit = _toy_circuit(compact=True)
+    view = circuit.view(1, 7)
+    assert view.num_gates == 6 and view.gates[0]["name"] == "Tof"
+    assert (view.num_t, view.num_h, view.first_t, view.last_t) == (2, 1, 2, 5)
+    assert view.to_qc() == view.to_circuit().to_qc()
+
+    restricted = circuit.view(qubits=[1, 2])
+    assert [gate["name"] for gate in restricted] == ["HAD", "T", "Tdg", "CZ", "HAD"]
+    assert restricted.num_2q == 1 and restricted.depth == 4
+
+
+def test_10_fingerprint():
+    circuit = QuantumCircuit()
+    circuit.request_qubits(3)
+    circuit.add_t(0)
+    circuit.add_cnot(1, 2)
+    circuit.add_cz(2, 0)
+
+    reordered = QuantumCircuit()
+    reordered.request_qubits(3)
+    reordered.add_cnot(1, 2)
+    reordered.add_t(0)
+    reordered.add_cz(0, 2)
+
+    relabelled = QuantumCircuit()
+    relabelled.request_qubits(3)
+    relabelled.add_t(2)
+    relabelled.add_cnot(0, 1)
+    relabelled.add_cz(1, 2)
+
+    assert circuit.fingerprint() == circuit.to_compact().fingerprint()
+    assert circuit.fingerprint() != reordered.fingerprint()
+    assert circuit.fingerprint(commute=True) == reordered.fingerprint(commute=True)
+    assert circuit.fingerprint() != relabelled.fingerprint()
+    assert circuit.fingerprint(relabel=True) == relabelled.fingerprint(relabel=True)
+
+    # qubits first seen in one layer are ranked by their later use, not their input order
+    def cnots_then_t(pairs, t):
+        c = QuantumCircuit()
+        c.request_qubits(4)
+        for ctrl, target in pairs:
+            c.add_cnot(ctrl, target)
+        c.add_t(t)
+        return c
+
+    first = cnots_then_t([(0, 1), (2, 3)], 3)
+    assert first.fingerprint(relabel=True, commute=True) == cnots_then_t([(0, 1), (2, 3)], 1).fingerprint(
+        relabel=True, commute=True
+    ) == cnots_then_t([(2, 3), (0, 1)], 1).fingerprint(relabel=True, commute=True)
+    assert first.fingerprint(relabel=True, commute=True) != cnots_then_t([(0, 1), (2, 3)], 2).fingerprint(
+        relabel=True, commute=True
+    )
+
+    doubled = circuit.copy()
+    doubled.append(circuit)
+    hashes = doubled.gate_hashes()
+    assert hashes.range_hash(0, 3) == hashes.range_hash(3, 6) == circuit.gate_hashes().range_hash()
+    assert hashes.range_hash(0, 2) != hashes.range_hash(1, 3)